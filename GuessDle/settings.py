@@ -20,6 +20,20 @@ ROOT_URLCONF = 'GuessDle.urls'
 # Configuración del modelo ScoringRule
 SCORING_FALLBACK = {"decrement": 10, "floor": 0}
 
+# Reparto de dificultad de los DailyTarget (generate_daily_targets --mode difficulty).
+# Proporción de días fáciles / medios / difíciles por pista; se puede
+# sobreescribir por slug de juego: {"pokemon": {"team": {"hard": 0.6}}}
+DAILY_TARGET_DIFFICULTY = {
+    "default": {
+        "normal": {"easy": 0.4, "medium": 0.4, "hard": 0.2},
+        "team":   {"easy": 0.2, "medium": 0.4, "hard": 0.4},
+    },
+}
+
+# Vistas async de intento/estado (apps/games/async_views.py). Tiene sentido
+# al servir con ASGI (uvicorn, ver entrypoint.sh); con WSGI se quedan en False.
+GUESSDLE_ASYNC_VIEWS = os.getenv("GUESSDLE_ASYNC_VIEWS", "False") == "True"
+
 
 # Redirecciones
 LOGIN_REDIRECT_URL = 'dashboard'
@@ -57,6 +71,27 @@ DATABASES = {
     }
 }
 
+# Caché (fragmentos del dashboard, ver apps/accounts/services/dashboard_cache.py).
+# Por defecto en memoria de cada proceso: los cambios hechos desde otros
+# procesos (comandos, cron, otros workers de uvicorn) se ven al caducar el
+# fragmento.  Con REDIS_URL (requiere el paquete ``redis``) la comparten todos.
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'guessdle',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv("DASHBOARD_CACHE_TIMEOUT", "300"))
+
 # Aplicaciones instaladas
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -82,6 +117,41 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Presupuesto de consultas por vista (apps/common/query_budget.py), opt-in.
+# Clave: nombre de URL; "default" para el resto.  Las peticiones que lo
+# superan se registran con sus sitios/servicios y el SQL repetido.
+QUERY_BUDGET_ENABLED = os.getenv("QUERY_BUDGET_ENABLED", "False") == "True"
+QUERY_BUDGETS = {
+    "default": 30,
+    "dashboard": 15,
+    "play": 25,
+    "play_challenge": 25,
+    "play_extra_daily": 25,
+    "ajax_guess": 12,
+    "ajax_guess_challenge": 12,
+    "ajax_guess_extra": 12,
+}
+if QUERY_BUDGET_ENABLED:
+    MIDDLEWARE.insert(0, 'apps.common.query_budget.QueryBudgetMiddleware')
+
+# Métricas Prometheus en /metrics (apps/common/metrics.py).  Con varios
+# workers, PROMETHEUS_MULTIPROC_DIR (ver entrypoint.sh).  METRICS_TOKEN
+# protege el endpoint con "Authorization: Bearer <token>"; sin él, fuera de
+# DEBUG solo lo ven usuarios staff.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False") == "True"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'apps.common.metrics.MetricsMiddleware')
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "apps.common.query_budget": {"handlers": ["console"], "level": "WARNING", "propagate": False},
+    },
+}
+
 # Templates
 TEMPLATES = [
     {
@@ -99,6 +169,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'GuessDle.wsgi.application'
+ASGI_APPLICATION = 'GuessDle.asgi.application'
 
 # Validadores de contraseñas
 AUTH_PASSWORD_VALIDATORS = [
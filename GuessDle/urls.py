@@ -15,3 +15,8 @@ urlpatterns = [
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.METRICS_ENABLED:
+    from apps.common.metrics import metrics_view
+
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
@@ -1,7 +1,8 @@
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django.contrib import admin
-from apps.accounts.models import UserProfile, GameElo, Challenge
+from apps.accounts.models import UserProfile, GameElo, Challenge, LeaderboardEntry, PlayerGameStats
+from apps.accounts.services.leaderboard import LeaderboardService
 from django.db.models import F
 
 
@@ -35,11 +36,41 @@ class GameEloAdmin(admin.ModelAdmin):
 
     actions = ['sumar_elo']
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        LeaderboardService.sync_points([obj])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        LeaderboardService.remove_points([obj])
+
+    def delete_queryset(self, request, queryset):
+        rows = list(queryset)
+        super().delete_queryset(request, queryset)
+        LeaderboardService.remove_points(rows)
+
     @admin.action(description="Sumar 50 puntos de elo a los seleccionados")
     def sumar_elo(self, request, queryset):
         updated = queryset.update(elo=F('elo') + 50)
+        LeaderboardService.sync_points(queryset.select_related('user', 'game'))
         self.message_user(request, f"Sumados 50 puntos de elo a {updated} usuarios.")
 
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'game', 'points', 'games_finished', 'total_attempts', 'ranked', 'updated_at')
+    list_filter = ('game', 'ranked')
+    search_fields = ('user__username',)
+    readonly_fields = [f.name for f in LeaderboardEntry._meta.fields]
+
+
+@admin.register(PlayerGameStats)
+class PlayerGameStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'game', 'best_attempts', 'worst_attempts', 'current_streak', 'best_streak', 'updated_at')
+    list_filter = ('game',)
+    search_fields = ('user__username',)
+    readonly_fields = [f.name for f in PlayerGameStats._meta.fields]
+
 @admin.register(Challenge)
 class ChallengeAdmin(admin.ModelAdmin):
     list_display = ('challenger', 'opponent', 'game', 'target', 'created_at', 'accepted', 'completed', 'winner', 'elo_exchanged')
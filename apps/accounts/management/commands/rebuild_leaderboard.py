@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.services.leaderboard import LeaderboardService
+from apps.games.models import Game
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye la clasificación materializada (LeaderboardEntry):\n"
+        "  • Recalcula las filas por juego desde GameElo y el resumen de\n"
+        "    cada PlaySession (ver backfill_play_sessions).\n"
+        "  • Rehace las filas globales (suma de los juegos activos).\n"
+        "  • Útil tras editar puntos o intentos a mano en la base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--game", action="append", dest="slugs", default=[],
+                            help="Slug del juego (se puede repetir). Por defecto, todos.")
+
+    def handle(self, *args, **options):
+        game_ids = None
+        if options["slugs"]:
+            games = Game.objects.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - set(games.values_list("slug", flat=True))
+            if missing:
+                raise CommandError(f"Juegos no encontrados: {', '.join(sorted(missing))}")
+            game_ids = list(games.values_list("pk", flat=True))
+
+        rows = LeaderboardService.rebuild(game_ids)
+        self.stdout.write(f"🏆 Filas por juego recalculadas: {rows}")
+        self.stdout.write(self.style.SUCCESS("✅ Clasificación global reconstruida."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.services.player_stats import PlayerStatsService
+from apps.games.models import Game
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye las estadísticas por jugador y juego (PlayerGameStats):\n"
+        "  • Las recalcula desde el resumen de cada PlaySession\n"
+        "    (ver backfill_play_sessions).\n"
+        "  • Un juego por tarea; con --workers N, N juegos en paralelo.\n"
+        "  • Cada juego en una transacción con sus sesiones bloqueadas: sus intentos esperan, no se pierden.\n"
+        "  • Útil tras editar intentos a mano o tras un desvío del camino async."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--game", action="append", dest="slugs", default=[],
+                            help="Slug del juego (se puede repetir). Por defecto, todos.")
+        parser.add_argument("--workers", type=int, default=4,
+                            help="Juegos calculados en paralelo (por defecto 4).")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers debe ser mayor que 0")
+
+        game_ids = None
+        if options["slugs"]:
+            games = Game.objects.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - set(games.values_list("slug", flat=True))
+            if missing:
+                raise CommandError(f"Juegos no encontrados: {', '.join(sorted(missing))}")
+            game_ids = list(games.values_list("pk", flat=True))
+
+        rows = PlayerStatsService.rebuild(game_ids, workers=options["workers"])
+        self.stdout.write(self.style.SUCCESS(f"📊 Estadísticas recalculadas: {rows} filas"))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_challenge_points_assigned'),
+        ('games', '0037_gameattempt_games_gamea_session_9c6855_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.FloatField(default=0)),
+                ('games_finished', models.PositiveIntegerField(default=0, help_text='Sesiones con un intento acertado')),
+                ('sessions_played', models.PositiveIntegerField(default=0, help_text='Sesiones con al menos un intento')),
+                ('total_attempts', models.PositiveIntegerField(default=0)),
+                ('ranked', models.BooleanField(default=False, help_text='Tiene registro de puntos (GameElo)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('game', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='games.game')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['game', 'ranked', '-points'], name='leaderboard_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'game'), name='unique_leaderboard_user_game'), models.UniqueConstraint(condition=models.Q(('game__isnull', True)), fields=('user',), name='unique_leaderboard_user_global')],
+            },
+        ),
+    ]
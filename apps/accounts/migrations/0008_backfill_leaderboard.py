@@ -0,0 +1,73 @@
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+
+def forwards(apps, schema_editor):
+    """Primer llenado de la clasificación (lo mismo que ``rebuild_leaderboard``)."""
+    GameElo          = apps.get_model('accounts', 'GameElo')
+    LeaderboardEntry = apps.get_model('accounts', 'LeaderboardEntry')
+    GameAttempt      = apps.get_model('games', 'GameAttempt')
+
+    entries = {
+        (user_id, game_id): LeaderboardEntry(user_id=user_id, game_id=game_id, points=elo, ranked=True)
+        for user_id, game_id, elo in GameElo.objects.values_list('user_id', 'game_id', 'elo')
+    }
+    per_session = (
+        GameAttempt.objects
+        .filter(session__isnull=False)
+        .values('session__user_id', 'session__game_id')
+        .annotate(
+            total=Count('id'),
+            played=Count('session', distinct=True),
+            finished=Count('session', distinct=True, filter=Q(is_correct=True)),
+        )
+    )
+    for row in per_session:
+        key = (row['session__user_id'], row['session__game_id'])
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = LeaderboardEntry(user_id=key[0], game_id=key[1])
+        entry.total_attempts = row['total']
+        entry.sessions_played = row['played']
+        entry.games_finished = row['finished']
+    LeaderboardEntry.objects.bulk_create(entries.values(), batch_size=1000)
+
+    global_rows = (
+        LeaderboardEntry.objects
+        .filter(game__active=True)
+        .values('user_id')
+        .annotate(
+            total_points=Sum('points'),
+            finished=Sum('games_finished'),
+            played=Sum('sessions_played'),
+            attempts=Sum('total_attempts'),
+            ranked_games=Count('id', filter=Q(ranked=True)),
+        )
+    )
+    LeaderboardEntry.objects.bulk_create([
+        LeaderboardEntry(
+            user_id=row['user_id'], game=None,
+            points=row['total_points'] or 0,
+            games_finished=row['finished'] or 0,
+            sessions_played=row['played'] or 0,
+            total_attempts=row['attempts'] or 0,
+            ranked=row['ranked_games'] > 0,
+        )
+        for row in global_rows
+    ], batch_size=1000)
+
+
+def reverse(apps, schema_editor):
+    apps.get_model('accounts', 'LeaderboardEntry').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_leaderboardentry'),
+        ('games', '0037_gameattempt_games_gamea_session_9c6855_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, reverse),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_backfill_leaderboard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='search_username',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='username sin acentos ni mayúsculas (fold) para buscar rivales por prefijo', max_length=150),
+        ),
+    ]
@@ -0,0 +1,39 @@
+import unicodedata
+
+from django.db import migrations
+
+
+def fold(text):
+    # Copia de apps.games.services.catalog.name_index.fold en el momento de la migración
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def forwards(apps, schema_editor):
+    """Rellena ``search_username`` y crea el perfil de usuarios antiguos que no lo tengan."""
+    User        = apps.get_model('auth', 'User')
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+
+    profiles = []
+    for profile in UserProfile.objects.select_related('user').iterator(chunk_size=1000):
+        profile.search_username = fold(profile.user.username)
+        profiles.append(profile)
+    UserProfile.objects.bulk_update(profiles, ['search_username'], batch_size=1000)
+
+    missing = User.objects.filter(profile__isnull=True).values_list('id', 'username')
+    UserProfile.objects.bulk_create(
+        [UserProfile(user_id=user_id, search_username=fold(username)) for user_id, username in missing],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_userprofile_search_username'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_backfill_search_username'),
+        ('games', '0039_backfill_playsession_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerGameStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sessions_played', models.PositiveIntegerField(default=0, help_text='Sesiones con al menos un intento')),
+                ('sessions_finished', models.PositiveIntegerField(default=0, help_text='Sesiones con un intento acertado')),
+                ('total_attempts', models.PositiveIntegerField(default=0)),
+                ('best_attempts', models.PositiveIntegerField(blank=True, null=True)),
+                ('worst_attempts', models.PositiveIntegerField(blank=True, null=True)),
+                ('current_streak', models.PositiveIntegerField(default=0)),
+                ('best_streak', models.PositiveIntegerField(default=0)),
+                ('last_streak_date', models.DateField(blank=True, null=True)),
+                ('histogram', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='games.game')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'game'), name='unique_player_stats_user_game')],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+
+def forwards(apps, schema_editor):
+    """Primer llenado de PlayerGameStats (lo mismo que ``rebuild_player_stats``)."""
+    PlayerGameStats = apps.get_model('accounts', 'PlayerGameStats')
+    PlaySession     = apps.get_model('games', 'PlaySession')
+    DailyTarget     = apps.get_model('games', 'DailyTarget')
+
+    daily_dates = dict(DailyTarget.objects.values_list('id', 'date'))
+    sessions = (
+        PlaySession.objects
+        .filter(attempt_count__gt=0)
+        .order_by('solved_at', 'pk')
+        .values_list('user_id', 'game_id', 'session_type', 'reference_id', 'attempt_count', 'solved')
+    )
+
+    stats = {}
+    for user_id, game_id, session_type, reference_id, attempts, solved in sessions.iterator(chunk_size=2000):
+        row = stats.get((user_id, game_id))
+        if row is None:
+            row = stats[(user_id, game_id)] = PlayerGameStats(user_id=user_id, game_id=game_id, histogram={})
+        row.sessions_played += 1
+        row.total_attempts += attempts
+        if not solved:
+            continue
+
+        # PlayerGameStats.add_solve
+        row.sessions_finished += 1
+        row.histogram[str(attempts)] = row.histogram.get(str(attempts), 0) + 1
+        row.best_attempts = min(attempts, row.best_attempts or attempts)
+        row.worst_attempts = max(attempts, row.worst_attempts or attempts)
+        daily_date = daily_dates.get(reference_id) if session_type == 'DAILY' else None
+        if daily_date is None or daily_date == row.last_streak_date:
+            continue
+        if row.last_streak_date is not None and (daily_date - row.last_streak_date).days == 1:
+            row.current_streak += 1
+        else:
+            row.current_streak = 1
+        row.last_streak_date = daily_date
+        row.best_streak = max(row.best_streak, row.current_streak)
+
+    PlayerGameStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_playergamestats'),
+        ('games', '0039_backfill_playsession_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_backfill_player_stats'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='playergamestats',
+            name='sessions_finished',
+        ),
+        migrations.RemoveField(
+            model_name='playergamestats',
+            name='sessions_played',
+        ),
+        migrations.RemoveField(
+            model_name='playergamestats',
+            name='total_attempts',
+        ),
+    ]
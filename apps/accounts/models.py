@@ -38,6 +38,95 @@ class Challenge(models.Model):
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
     is_team_account = models.BooleanField(default=False)
+    search_username = models.CharField(
+        max_length=150, blank=True, default="", db_index=True,
+        help_text="username sin acentos ni mayúsculas (fold) para buscar rivales por prefijo",
+    )
 
     def __str__(self):
         return f"Perfil de {self.user.username}"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Clasificación materializada: una fila por usuario y juego y una global
+    (``game`` NULL, suma de los juegos activos).  La mantienen al día
+    ``LeaderboardService`` (intentos) y ``ScoreService`` (puntos), en la
+    misma transacción que el cambio; ``rebuild_leaderboard`` la recalcula.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    game = models.ForeignKey('games.Game', null=True, blank=True, on_delete=models.CASCADE,
+                             related_name='leaderboard_entries')
+    points = models.FloatField(default=0)
+    games_finished = models.PositiveIntegerField(default=0, help_text="Sesiones con un intento acertado")
+    sessions_played = models.PositiveIntegerField(default=0, help_text="Sesiones con al menos un intento")
+    total_attempts = models.PositiveIntegerField(default=0)
+    ranked = models.BooleanField(default=False, help_text="Tiene registro de puntos (GameElo)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'game'], name='unique_leaderboard_user_game'),
+            models.UniqueConstraint(fields=['user'], condition=models.Q(game__isnull=True),
+                                    name='unique_leaderboard_user_global'),
+        ]
+        indexes = [
+            models.Index(fields=['game', 'ranked', '-points'], name='leaderboard_rank_idx'),
+        ]
+
+    def __str__(self):
+        scope = self.game.slug if self.game_id else "GLOBAL"
+        return f"{self.user.username} - {scope}: {int(self.points)}"
+
+    @property
+    def average_attempts(self):
+        """Intentos totales por partida terminada (None si no ha terminado ninguna)."""
+        return self.total_attempts / self.games_finished if self.games_finished else None
+
+
+class PlayerGameStats(models.Model):
+    """
+    Estadísticas de un usuario en un juego, acumuladas acierto a acierto por
+    ``PlayerStatsService`` (desde ``GuessPipeline``); ``rebuild_player_stats``
+    las recalcula desde el resumen de las PlaySession.  Los contadores de
+    sesiones e intentos están en ``LeaderboardEntry``.
+
+    - ``histogram``: partidas terminadas por nº de intentos (``{"3": 5}``).
+    - ``best_attempts`` / ``worst_attempts``: la partida terminada con menos
+      y con más intentos.
+    - ``current_streak`` / ``best_streak``: días seguidos con el daily
+      resuelto (``last_streak_date``: último día de la racha).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='game_stats')
+    game = models.ForeignKey('games.Game', on_delete=models.CASCADE, related_name='player_stats')
+    best_attempts = models.PositiveIntegerField(null=True, blank=True)
+    worst_attempts = models.PositiveIntegerField(null=True, blank=True)
+    current_streak = models.PositiveIntegerField(default=0)
+    best_streak = models.PositiveIntegerField(default=0)
+    last_streak_date = models.DateField(null=True, blank=True)
+    histogram = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'game'], name='unique_player_stats_user_game'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.game.slug}: mejor racha {self.best_streak}"
+
+    def add_solve(self, attempts, daily_date=None):
+        """Cuenta una partida terminada en ``attempts`` intentos (sin guardar)."""
+        key = str(attempts)
+        self.histogram[key] = self.histogram.get(key, 0) + 1
+        self.best_attempts = min(attempts, self.best_attempts or attempts)
+        self.worst_attempts = max(attempts, self.worst_attempts or attempts)
+
+        if daily_date is None or daily_date == self.last_streak_date:
+            return
+        if self.last_streak_date is not None and (daily_date - self.last_streak_date).days == 1:
+            self.current_streak += 1
+        else:
+            self.current_streak = 1
+        self.last_streak_date = daily_date
+        self.best_streak = max(self.best_streak, self.current_streak)
@@ -0,0 +1,81 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+class DashboardCache:
+    """
+    Versiones de los fragmentos cacheados del dashboard (``{% cache %}`` en
+    ``accounts/dashboard.html`` y sus paneles) y de la primera página de la
+    API de clasificación.  Cada fragmento lleva en su clave las
+    versiones de lo que pinta; cambiar los datos sube la versión y el
+    fragmento viejo deja de leerse (caduca solo, sin borrarlo).
+
+    - ``global``: juegos activados/desactivados o clasificación reconstruida
+      (entra en todas las claves).
+    - ``rankings``: cualquier cambio de la clasificación (intentos, puntos).
+      Primeras páginas compartidas por todos los usuarios.
+    - ``stats:<user>``: intentos y puntos del usuario.
+    - ``challenges:<user>``: retos en los que participa el usuario.
+
+    Las subidas se hacen al confirmar la transacción: antes, otra petición
+    podría guardar datos viejos con la versión nueva.
+    """
+    PREFIX = "dashboard:v:"
+
+    # ---------- Lectura ----------
+    @classmethod
+    def versions(cls, user):
+        """Las cuatro versiones del dashboard de ``user`` en una lectura de caché."""
+        found = cls._read(["global", "rankings", f"stats:{user.pk}", f"challenges:{user.pk}"])
+        return dict(zip(["global", "rankings", "stats", "challenges"], found))
+
+    @classmethod
+    def shared_versions(cls):
+        """(global, rankings): lo que invalida datos compartidos entre usuarios."""
+        return tuple(cls._read(["global", "rankings"]))
+
+    @classmethod
+    def challenges_version(cls, user_id):
+        return cls._read([f"challenges:{user_id}"])[0]
+
+    @classmethod
+    def _read(cls, names):
+        keys = [cls.PREFIX + name for name in names]
+        found = cache.get_many(keys)
+        for key in keys:
+            if key not in found:
+                # Inicio distinto en cada creación: si la clave se pierde, las
+                # versiones nuevas no coinciden con fragmentos aún guardados
+                cache.add(key, time.time_ns(), timeout=None)
+                found[key] = cache.get(key)
+        return [found[key] for key in keys]
+
+    # ---------- Invalidación ----------
+    @classmethod
+    def bump_user(cls, user_id, *, on_commit=True):
+        """Intentos o puntos de un usuario: sus estadísticas y la clasificación."""
+        cls._bump(["rankings", f"stats:{user_id}"], on_commit)
+
+    @classmethod
+    def bump_challenges(cls, *user_ids):
+        cls._bump([f"challenges:{user_id}" for user_id in user_ids], True)
+
+    @classmethod
+    def bump_global(cls):
+        cls._bump(["global"], True)
+
+    @classmethod
+    def _bump(cls, names, on_commit):
+        def bump():
+            for name in names:
+                try:
+                    cache.incr(cls.PREFIX + name)
+                except ValueError:   # aún no existe: la crea la próxima lectura
+                    pass
+
+        if on_commit:
+            transaction.on_commit(bump)
+        else:
+            bump()
@@ -0,0 +1,315 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import Rank, RowNumber
+
+from apps.accounts.models import GameElo, LeaderboardEntry
+from apps.accounts.services.dashboard_cache import DashboardCache
+from apps.games.models import Game, PlaySession
+
+
+class LeaderboardService:
+    """
+    Mantiene ``LeaderboardEntry`` de un usuario en un juego y, si el juego
+    está activo, su fila global.  Cada cambio es un único UPDATE con ``F()``
+    sobre las dos filas; solo la primera vez que el usuario juega (o puntúa)
+    se crean, dentro de un savepoint.
+
+    Se llama desde dentro de la transacción del cambio que refleja
+    (``GuessPipeline`` para intentos, ``ScoreService`` para puntos).
+    """
+    def __init__(self, user, game):
+        self.user = user
+        self.game = game
+
+    # ---------- API pública ----------
+    def record_attempt(self, *, first_in_session: bool, solved: bool):
+        self._apply(self._attempt_deltas(first_in_session, solved))
+
+    def add_points(self, delta: float):
+        self._apply({"points": delta})
+
+    def mark_ranked(self):
+        """El usuario ya tiene GameElo en el juego: aparece en las clasificaciones."""
+        self._apply({}, ranked=True)
+
+    # ---------- Lectura ----------
+    PAGE_SIZE = 25
+    MAX_PAGE_SIZE = 100
+
+    @staticmethod
+    def ranking(game=None, team=None):
+        """
+        Filas clasificadas de un juego (o globales), de más a menos puntos
+        (desempate por nombre).  ``team`` filtra cuentas de equipo (True) o
+        individuales (False).  Orden que usan las páginas y la posición.
+        """
+        qs = LeaderboardEntry.objects.filter(ranked=True).select_related("user")
+        qs = qs.filter(game=game) if game is not None else qs.filter(game__isnull=True)
+        if team is not None:
+            qs = qs.filter(user__profile__is_team_account=team)
+        return qs.order_by("-points", "user__username")
+
+    @classmethod
+    def page(cls, game=None, team=None, after=None, limit=PAGE_SIZE):
+        """
+        Página por keyset: filas estrictamente detrás de ``after`` =
+        ``(puntos, username)`` de la última fila vista; ni OFFSET ni
+        recorrer las anteriores.  Devuelve (filas, cursor de la siguiente
+        o None).  Fuera de la primera página, una consulta agregada más
+        da la posición de la primera fila.
+        """
+        qs = cls.ranking(game, team)
+        if after is not None:
+            points, username = after
+            qs = qs.filter(Q(points__lt=points) | Q(points=points, user__username__gt=username))
+        entries = list(qs[:limit + 1])
+        more, entries = len(entries) > limit, entries[:limit]
+        if not entries:
+            return [], None
+
+        first = entries[0]
+        if after is None:
+            rank = position = 1
+        else:
+            rank, position = cls._position(game, team, first.points, first.user.username)
+
+        rows, previous = [], None
+        for offset, entry in enumerate(entries):
+            if previous is not None and entry.points != previous:
+                rank = position + offset   # empates: misma posición (1, 2, 2, 4...)
+            rows.append(cls.row(entry, rank))
+            previous = entry.points
+
+        last = entries[-1]
+        return rows, ((last.points, last.user.username) if more else None)
+
+    @classmethod
+    def first_page(cls, game=None, team=None, limit=PAGE_SIZE):
+        """
+        ``page`` sin cursor, cacheada y compartida por todos los usuarios
+        hasta que cambie la clasificación (ver DashboardCache).
+        """
+        scope = game.pk if game is not None else "global"
+        key = "leaderboard:page:{}:{}:{}:{}:{}".format(scope, team, limit, *DashboardCache.shared_versions())
+        return cache.get_or_set(
+            key, lambda: cls.page(game, team, limit=limit), settings.DASHBOARD_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def around(cls, user, game=None, team=None, span=5):
+        """
+        Fila del usuario con ``span`` vecinos por cada lado, con su puesto
+        calculado por funciones de ventana (``RANK`` para el puesto con
+        empates, ``ROW_NUMBER`` para recortar la ventana).  Lista vacía si
+        el usuario no está clasificado.  Tres consultas.
+        """
+        me = cls.ranking(game, team).filter(user=user).values_list("points", "user__username").first()
+        if me is None:
+            return []
+        _, position = cls._position(game, team, *me)
+
+        window = cls.ranking(game, team).annotate(
+            position_rank=Window(Rank(), order_by=F("points").desc()),
+            position=Window(RowNumber(), order_by=(F("points").desc(), F("user__username").asc())),
+        )
+        entries = window.filter(position__gte=position - span, position__lte=position + span)
+        return [cls.row(entry, entry.position_rank, me=entry.user_id == user.pk) for entry in entries]
+
+    @staticmethod
+    def average_attempts(user, game):
+        """Intentos totales por partida terminada en el juego (None si no ha terminado ninguna)."""
+        entry = LeaderboardEntry.objects.filter(user=user, game=game).first()
+        return entry.average_attempts if entry else None
+
+    @staticmethod
+    def average_of_averages(game, exclude_user=None):
+        """Media de ``average_attempts`` de los jugadores con alguna partida terminada."""
+        rows = LeaderboardEntry.objects.filter(game=game, games_finished__gt=0)
+        if exclude_user is not None:
+            rows = rows.exclude(user=exclude_user)
+        averages = [total / finished for total, finished in rows.values_list("total_attempts", "games_finished")]
+        return sum(averages) / len(averages) if averages else None
+
+    @staticmethod
+    def encode_cursor(cursor):
+        """Cursor de ``page`` como texto opaco para la URL (None → None)."""
+        if cursor is None:
+            return None
+        return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(raw):
+        """Inverso de ``encode_cursor``; ValueError si no es un cursor válido."""
+        try:
+            points, username = json.loads(base64.urlsafe_b64decode(raw.encode()))
+            return float(points), str(username)
+        except TypeError as exc:
+            raise ValueError(raw) from exc
+
+    @staticmethod
+    def row(entry, rank, me=False):
+        return {
+            "rank": rank,
+            "username": entry.user.username,
+            "points": entry.points,
+            "games_finished": entry.games_finished,
+            "average_attempts": entry.average_attempts,
+            "me": me,
+        }
+
+    @classmethod
+    def _position(cls, game, team, points, username):
+        """(puesto con empates, nº de fila) de quien tiene esos puntos y nombre."""
+        counts = cls.ranking(game, team).aggregate(
+            above=Count("id", filter=Q(points__gt=points)),
+            tied_before=Count("id", filter=Q(points=points, user__username__lt=username)),
+        )
+        return counts["above"] + 1, counts["above"] + counts["tied_before"] + 1
+
+    # ---------- Reconstrucción ----------
+    @classmethod
+    def rebuild(cls, game_ids=None) -> int:
+        """
+        Recalcula las filas por juego desde GameElo y el resumen de las
+        PlaySession (dos consultas agregadas) y después las globales.
+        Devuelve nº de filas.
+        """
+        games = Game.objects.all() if game_ids is None else Game.objects.filter(pk__in=game_ids)
+
+        with transaction.atomic():
+            LeaderboardEntry.objects.filter(game__in=games).delete()
+
+            entries = {}
+            for user_id, game_id, elo in GameElo.objects.filter(game__in=games).values_list("user_id", "game_id", "elo"):
+                entries[(user_id, game_id)] = LeaderboardEntry(
+                    user_id=user_id, game_id=game_id, points=elo, ranked=True,
+                )
+
+            per_session = (
+                PlaySession.objects
+                .filter(game__in=games, attempt_count__gt=0)
+                .values("user_id", "game_id")
+                .annotate(
+                    total=Sum("attempt_count"),
+                    played=Count("id"),
+                    finished=Count("id", filter=Q(solved=True)),
+                )
+            )
+            for row in per_session:
+                key = (row["user_id"], row["game_id"])
+                entry = entries.get(key)
+                if entry is None:
+                    entry = entries[key] = LeaderboardEntry(user_id=key[0], game_id=key[1])
+                entry.total_attempts = row["total"]
+                entry.sessions_played = row["played"]
+                entry.games_finished = row["finished"]
+
+            LeaderboardEntry.objects.bulk_create(entries.values(), batch_size=1000)
+            cls.rebuild_global()
+        return len(entries)
+
+    @staticmethod
+    def rebuild_global(user_ids=None) -> int:
+        """Filas globales = suma de las filas de los juegos activos."""
+        with transaction.atomic():
+            stale = LeaderboardEntry.objects.filter(game__isnull=True)
+            per_game = LeaderboardEntry.objects.filter(game__active=True)
+            if user_ids is not None:
+                stale = stale.filter(user_id__in=user_ids)
+                per_game = per_game.filter(user_id__in=user_ids)
+            stale.delete()
+            DashboardCache.bump_global()
+
+            rows = per_game.values("user_id").annotate(
+                total_points=Sum("points"),
+                finished=Sum("games_finished"),
+                played=Sum("sessions_played"),
+                attempts=Sum("total_attempts"),
+                ranked_games=Count("id", filter=Q(ranked=True)),
+            )
+            return len(LeaderboardEntry.objects.bulk_create([
+                LeaderboardEntry(
+                    user_id=row["user_id"],
+                    game=None,
+                    points=row["total_points"] or 0,
+                    games_finished=row["finished"] or 0,
+                    sessions_played=row["played"] or 0,
+                    total_attempts=row["attempts"] or 0,
+                    ranked=row["ranked_games"] > 0,
+                )
+                for row in rows
+            ], batch_size=1000))
+
+    @classmethod
+    def sync_points(cls, elo_rows):
+        """Copia ``GameElo.elo`` tal cual (ediciones del admin) y rehace las globales."""
+        user_ids = set()
+        with transaction.atomic():
+            for elo in elo_rows:
+                cls(elo.user, elo.game)._set_points(elo.elo)
+                user_ids.add(elo.user_id)
+            cls.rebuild_global(user_ids)
+
+    @classmethod
+    def remove_points(cls, elo_rows):
+        """GameElo borrados (admin): sus filas dejan de clasificar y se rehacen las globales."""
+        user_ids = set()
+        with transaction.atomic():
+            for elo in elo_rows:
+                LeaderboardEntry.objects.filter(user_id=elo.user_id, game_id=elo.game_id).update(points=0, ranked=False)
+                DashboardCache.bump_user(elo.user_id)
+                user_ids.add(elo.user_id)
+            cls.rebuild_global(user_ids)
+
+    # ---------- Internals ----------
+    @staticmethod
+    def _attempt_deltas(first_in_session: bool, solved: bool):
+        return {
+            "total_attempts": 1,
+            "sessions_played": int(first_in_session),
+            "games_finished": int(solved),
+        }
+
+    @staticmethod
+    def _expressions(deltas):
+        return {field: F(field) + value for field, value in deltas.items() if value}
+
+    def _scopes(self):
+        return [self.game.pk, None] if self.game.active else [self.game.pk]
+
+    def _rows(self):
+        qs = LeaderboardEntry.objects.filter(user=self.user)
+        if self.game.active:
+            return qs.filter(Q(game=self.game) | Q(game__isnull=True))
+        return qs.filter(game=self.game)
+
+    def _apply(self, deltas, **values):
+        changes = {**self._expressions(deltas), **values}
+        rows = self._rows().update(**changes) if changes else 0
+        if rows < len(self._scopes()):
+            self._create_missing(deltas, values)
+        DashboardCache.bump_user(self.user.pk)
+
+    def _create_missing(self, deltas, values):
+        existing = set(self._rows().values_list("game_id", flat=True))
+        for game_id in self._scopes():
+            if game_id in existing:
+                continue
+            try:
+                with transaction.atomic():
+                    LeaderboardEntry.objects.create(user=self.user, game_id=game_id, **deltas, **values)
+            except IntegrityError:  # otra petición la acaba de crear
+                changes = {**self._expressions(deltas), **values}
+                if changes:
+                    LeaderboardEntry.objects.filter(user=self.user, game_id=game_id).update(**changes)
+
+    def _set_points(self, points: float):
+        rows = LeaderboardEntry.objects.filter(user=self.user, game=self.game).update(points=points, ranked=True)
+        if not rows:
+            LeaderboardEntry.objects.create(user=self.user, game=self.game, points=points, ranked=True)
+        DashboardCache.bump_user(self.user.pk)
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.contrib.auth.models import User
+
+from apps.accounts.models import Challenge
+from apps.accounts.services.dashboard_cache import DashboardCache
+from apps.games.services.catalog.name_index import fold
+
+
+class OpponentSearch:
+    """
+    Rivales para el formulario de retos, sin cargar todos los usuarios:
+    - ``search``: por prefijo del nombre (sin acentos ni mayúsculas) sobre
+      ``UserProfile.search_username``, con límite.
+    - ``recent``: últimos rivales retados, cacheados por usuario hasta que
+      cambien sus retos (versión ``challenges`` de DashboardCache).
+    """
+    LIMIT = 10
+    RECENT = 8
+
+    def __init__(self, user):
+        self.user = user
+
+    def search(self, query, limit=LIMIT):
+        prefix = fold(query)
+        if not prefix:
+            return self.recent()
+        # Rango en lugar de LIKE 'x%': usa el índice en cualquier motor
+        # (el LIKE de SQLite no distingue mayúsculas y se salta los índices)
+        users = (
+            User.objects
+            .filter(profile__search_username__gte=prefix,
+                    profile__search_username__lt=prefix + "\U0010ffff")
+            .exclude(pk=self.user.pk)
+            .order_by("profile__search_username")
+            .values("id", "username")[:limit]
+        )
+        return list(users)
+
+    def recent(self):
+        key = f"opponents:recent:{self.user.pk}:{DashboardCache.challenges_version(self.user.pk)}"
+        return cache.get_or_set(key, self._recent)
+
+    def _recent(self):
+        seen, out = set(), []
+        opponents = (
+            Challenge.objects
+            .filter(challenger=self.user)
+            .order_by("-created_at")
+            .values_list("opponent_id", "opponent__username")[:self.RECENT * 5]
+        )
+        for opponent_id, username in opponents:
+            if opponent_id not in seen:
+                seen.add(opponent_id)
+                out.append({"id": opponent_id, "username": username})
+            if len(out) == self.RECENT:
+                break
+        return out
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import IntegrityError, connection, transaction
+
+from apps.accounts.models import PlayerGameStats
+from apps.accounts.services.dashboard_cache import DashboardCache
+from apps.games.models import DailyTarget, Game, PlaySession, PlaySessionType
+
+
+class PlayerStatsService:
+    """
+    Mantiene ``PlayerGameStats`` de un usuario en un juego.  Solo cambia con
+    un acierto: bloquea la fila y la reescribe (histograma, mejor y peor
+    partida y racha salen de ``PlayerGameStats.add_solve``, lo mismo que usa
+    la reconstrucción).  Sesiones, partidas terminadas e intentos totales
+    son de ``LeaderboardEntry``.
+
+    Se llama desde dentro de la transacción de ``GuessPipeline``.
+    """
+    REBUILD_RETRIES = 3
+
+    def __init__(self, user, game):
+        self.user = user
+        self.game = game
+
+    # ---------- API pública ----------
+    @transaction.atomic
+    def record_solve(self, attempt_count: int, daily_date=None):
+        """``attempt_count``: intentos de la sesión; ``daily_date``: día del daily (si lo es)."""
+        stats, _ = PlayerGameStats.objects.select_for_update().get_or_create(user=self.user, game=self.game)
+        stats.add_solve(attempt_count, daily_date)
+        stats.save()
+
+    # ---------- Lectura ----------
+    @staticmethod
+    def for_user(user):
+        """{game_id: PlayerGameStats} del usuario: una consulta."""
+        return {stats.game_id: stats for stats in PlayerGameStats.objects.filter(user=user)}
+
+    # ---------- Reconstrucción ----------
+    @classmethod
+    def rebuild(cls, game_ids=None, workers=1) -> int:
+        """
+        Recalcula las estadísticas desde el resumen de las PlaySession, un
+        juego por tarea y cada juego en una sola transacción (ver
+        ``_rebuild_game``).  Con ``workers > 1`` los juegos van en paralelo,
+        un hilo y una conexión por juego en curso.  Devuelve nº de filas.
+        """
+        games = Game.objects.all() if game_ids is None else Game.objects.filter(pk__in=game_ids)
+        game_ids = list(games.values_list("pk", flat=True))
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                total = sum(pool.map(cls._rebuild_in_thread, game_ids))
+        else:
+            total = sum(cls._rebuild_game(game_id) for game_id in game_ids)
+
+        DashboardCache.bump_global()
+        return total
+
+    @classmethod
+    def _rebuild_game(cls, game_id) -> int:
+        """
+        Bloquea las sesiones del juego y después sus filas de estadísticas,
+        en el mismo orden que ``GuessPipeline``, calcula y reemplaza sin
+        soltar los bloqueos: un intento concurrente espera y se aplica
+        sobre las filas nuevas.  Si un primer acierto crea una fila mientras
+        tanto, la transacción se deshace y el juego se vuelve a calcular.
+        """
+        for retry in range(cls.REBUILD_RETRIES):
+            try:
+                with transaction.atomic():
+                    list(PlaySession.objects.select_for_update().filter(game_id=game_id).values_list("pk", flat=True))
+                    stats = PlayerGameStats.objects.select_for_update().filter(game_id=game_id)
+                    list(stats.values_list("pk", flat=True))
+
+                    rows = cls._compute(game_id)
+                    stats.delete()
+                    return len(PlayerGameStats.objects.bulk_create(rows, batch_size=1000))
+            except IntegrityError:
+                if retry == cls.REBUILD_RETRIES - 1:
+                    raise
+
+    @staticmethod
+    def _compute(game_id):
+        """Filas de un juego, partida terminada a partida terminada en orden (para las rachas)."""
+        daily_dates = dict(DailyTarget.objects.filter(game_id=game_id).values_list("id", "date"))
+        sessions = (
+            PlaySession.objects
+            .filter(game_id=game_id, solved=True)
+            .order_by("solved_at", "pk")
+            .values_list("user_id", "session_type", "reference_id", "attempt_count")
+        )
+
+        stats = {}
+        for user_id, session_type, reference_id, attempt_count in sessions.iterator(chunk_size=2000):
+            row = stats.get(user_id)
+            if row is None:
+                row = stats[user_id] = PlayerGameStats(user_id=user_id, game_id=game_id)
+            daily_date = daily_dates.get(reference_id) if session_type == PlaySessionType.DAILY else None
+            row.add_solve(attempt_count, daily_date)
+        return list(stats.values())
+
+    @classmethod
+    def _rebuild_in_thread(cls, game_id):
+        try:
+            return cls._rebuild_game(game_id)
+        finally:
+            connection.close()   # cada hilo abre la suya
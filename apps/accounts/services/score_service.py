@@ -1,85 +1,65 @@
 from django.conf import settings
-from django.contrib.auth.models import User
-from django.db.models import Count, Avg, Q, Sum
-from apps.games.models import ScoringRule, GameAttempt, PlaySessionType
+from django.db import transaction
+from apps.games.models import ScoringRule, PlaySessionType
 from apps.accounts.models import GameElo
+from apps.accounts.services.leaderboard import LeaderboardService
 
 class ScoreService:
     """
     Actualiza y consulta los puntos de un usuario en un juego.
     Usa la tabla GameElo para no crear otra (puedes renombrarla luego).
+    Todo cambio de puntos se refleja en la clasificación materializada
+    (LeaderboardEntry) dentro de la misma transacción.
     """
     def __init__(self, user, game):
         self.user  = user
         self.game  = game
-        self.score_obj, _ = GameElo.objects.get_or_create(user=user, game=game)
+        self.leaderboard = LeaderboardService(user, game)
+        with transaction.atomic():
+            self.score_obj, created = GameElo.objects.get_or_create(user=user, game=game)
+            if created:
+                self.leaderboard.mark_ranked()
 
     # ---------- API pública ----------
+    @transaction.atomic
     def add_points_for_attempts(self, attempts_count: int) -> int:
         """Devuelve los puntos sumados y actualiza la tabla."""
         pts = self._points_for_attempts(attempts_count)
         self.score_obj.elo += pts
         self.score_obj.partidas += 1
         self.score_obj.save(update_fields=("elo", "partidas"))
+        self.leaderboard.add_points(pts)
         return pts
 
+    @transaction.atomic
+    def add_bonus(self, points: float) -> float:
+        """Bonus sin partida (apuesta ganada, victoria en reto)."""
+        self.score_obj.elo += points
+        self.score_obj.save(update_fields=("elo",))
+        self.leaderboard.add_points(points)
+        return points
+
+    @transaction.atomic
+    def deduct(self, points: float) -> float:
+        """Resta puntos (apuesta de una partida extra)."""
+        return -self.add_bonus(-points)
+
     def get_user_average_attempts(self) -> float | None:
         """
-        Promedio de intentos hechos por el usuario en sesiones EXTRA del juego.
+        Promedio de intentos hechos por el usuario en sesiones del juego.
         Incluye sesiones no completadas. La media es (intentos totales) / (partidas completadas).
         Si no hay partidas completadas, devuelve None.
+        Lee la clasificación materializada (LeaderboardEntry): una consulta.
         """
-        # Todas las sesiones del usuario en este juego
-        sessions = (
-            self.user.play_sessions
-            .filter(game=self.game)
-        )
-
-        # Intentos totales (todas las sessions)
-        total_tries = (
-            GameAttempt.objects
-            .filter(session__in=sessions)
-            .count()
-        )
-
-        # Partidas completadas: sessions donde hay al menos 1 intento correcto
-        completed = (
-            sessions
-            .annotate(correctos=Count('attempts', filter=Q(attempts__is_correct=True)))
-            .filter(correctos__gt=0)
-            .count()
-        )
-
-        if completed == 0:
-            return None
-
-        return total_tries / completed
+        return LeaderboardService.average_attempts(self.user, self.game)
 
     def get_global_average_of_averages(self, exclude_user=True) -> float | None:
         """
         Calcula la media de los promedios individuales de intentos/partidas completas por usuario.
         Solo cuenta a los users que tengan al menos una partida completa.
+        Lee la clasificación materializada (LeaderboardEntry): una consulta.
         """
-        # Buscamos todos los user_id que hayan jugado este juego (EXTRA)
-        user_ids = (
-            GameAttempt.objects
-            .filter(session__game=self.game)
-            .exclude(user=self.user if exclude_user else None)
-            .values_list('user', flat=True)
-            .distinct()
-        )
-
-        average = []
-        for user_id in user_ids:
-            # Seteamos el user actual
-            user = User.objects.get(pk=user_id)
-            # OJO: si ScoreService necesita user instance, no id
-            avg = ScoreService(user, self.game).get_user_average_attempts()
-            if avg is not None:
-                average.append(avg)
-        if not average:
-            return None
-        return sum(average) / len(average)
+        return LeaderboardService.average_of_averages(self.game, self.user if exclude_user else None)
 
     # ---------- Internals ----------
     def _points_for_attempts(self, n: int) -> int:
@@ -1,9 +1,59 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from apps.games.models import Game
+from apps.games.services.catalog.name_index import fold
+from .models import Challenge, UserProfile
+from .services.dashboard_cache import DashboardCache
+from .services.leaderboard import LeaderboardService
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
+    search_username = fold(instance.username)
     if created:
-        UserProfile.objects.create(user=instance)
+        UserProfile.objects.create(user=instance, search_username=search_username)
+        return
+
+    # Renombrado: mantiene la búsqueda de rivales al día (el login solo guarda last_login)
+    update_fields = kwargs.get("update_fields")
+    if update_fields is None or "username" in update_fields:
+        UserProfile.objects.filter(user=instance).exclude(
+            search_username=search_username
+        ).update(search_username=search_username)
+
+
+@receiver(pre_save, sender=Game)
+def remember_game_active(sender, instance, **kwargs):
+    # Un juego nuevo no tiene filas en la clasificación: solo importa el cambio de uno guardado
+    update_fields = kwargs.get("update_fields")
+    instance._active_changed = False
+    if instance.pk is None or (update_fields is not None and "active" not in update_fields):
+        return
+    previous = Game.objects.filter(pk=instance.pk).values_list("active", flat=True).first()
+    instance._active_changed = previous is not None and previous != instance.active
+
+
+@receiver(post_save, sender=Game)
+def refresh_global_leaderboard(sender, instance, **kwargs):
+    # La fila global suma solo juegos activos: solo activar/desactivar la cambia
+    if instance._active_changed:
+        LeaderboardService.rebuild_global()
+
+
+@receiver(post_delete, sender=Game)
+def refresh_global_leaderboard_on_delete(sender, instance, **kwargs):
+    if instance.active:
+        LeaderboardService.rebuild_global()
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def invalidate_dashboard_games(sender, instance, **kwargs):
+    # Nombre, icono o estado de un juego: aparece en todos los fragmentos
+    DashboardCache.bump_global()
+
+
+@receiver(post_save, sender=Challenge)
+@receiver(post_delete, sender=Challenge)
+def invalidate_dashboard_challenges(sender, instance, **kwargs):
+    DashboardCache.bump_challenges(instance.challenger_id, instance.opponent_id)
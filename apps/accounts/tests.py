@@ -1,3 +1,265 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.admin import GameEloAdmin
+from apps.accounts.models import Challenge, GameElo, LeaderboardEntry, PlayerGameStats, UserProfile
+from apps.accounts.services.leaderboard import LeaderboardService
+from apps.accounts.services.player_stats import PlayerStatsService
+from apps.accounts.services.score_service import ScoreService
+from apps.games.models import DailyTarget, Game, GameItem
+from apps.games.services.catalog import names
+from apps.games.services.gameplay.guess_pipeline import GuessPipeline
+
+BUDGET_MIDDLEWARE = ["apps.common.query_budget.QueryBudgetMiddleware", *settings.MIDDLEWARE]
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()   # fragmentos del dashboard de tests anteriores (mismos pks)
+        game = Game.objects.create(
+            name="Poke", slug="poke", attributes=["tipo"], data_source_url="http://example.com",
+        )
+        GameItem.objects.create(game=game, name="Pikachu", data={"tipo": "x"})
+        self.user = User.objects.create_user("ana", password="pw")
+        self.client.login(username="ana", password="pw")
+
+    @override_settings(MIDDLEWARE=BUDGET_MIDDLEWARE, QUERY_BUDGETS={"default": 1000, "dashboard": 1})
+    def test_dashboard_over_budget_is_reported_by_service(self):
+        with self.assertLogs("apps.common.query_budget", "WARNING") as logs:
+            response = self.client.get(reverse("dashboard"))
+
+        report = response.wsgi_request.query_report
+        self.assertGreater(report.count, 1)
+        self.assertIn("DashboardStats", report.services)
+        self.assertIn("dashboard", logs.output[0])
+
+    @override_settings(MIDDLEWARE=BUDGET_MIDDLEWARE, QUERY_BUDGETS={"default": 1000})
+    def test_within_budget_is_silent(self):
+        with self.assertNoLogs("apps.common.query_budget", "WARNING"):
+            self.client.get(reverse("dashboard"))
+
+
+class LeaderboardTests(TestCase):
+    FIELDS = ("user_id", "game_id", "points", "games_finished", "sessions_played", "total_attempts", "ranked")
+
+    def setUp(self):
+        cache.clear()
+        self.games = []
+        for slug in ("poke", "lol"):
+            game = Game.objects.create(
+                name=slug, slug=slug, attributes=["tipo"], data_source_url="http://example.com",
+            )
+            items = [GameItem.objects.create(game=game, name=n, data={"tipo": n}) for n in ("A", "B", "C")]
+            DailyTarget.objects.create(game=game, target=items[1], date=timezone.localdate())
+            self.games.append(game)
+        self.users = [User.objects.create_user(name, password="pw") for name in ("ana", "bea")]
+        names._CATALOGS.clear()   # los pks se reutilizan entre tests
+
+    def snapshot(self):
+        return sorted(LeaderboardEntry.objects.values_list(*self.FIELDS), key=lambda row: (row[0], row[1] or 0))
+
+    def play(self, user, game, guesses):
+        pipeline = GuessPipeline(game, user, daily_target=DailyTarget.objects.get(game=game))
+        for guess in guesses:
+            pipeline.run(guess)
+
+    def test_incremental_updates_match_rebuild(self):
+        self.play(self.users[0], self.games[0], ["a", "b"])
+        self.play(self.users[0], self.games[1], ["c"])
+        self.play(self.users[1], self.games[0], ["b"])
+        ScoreService(self.users[1], self.games[0]).add_bonus(100)
+
+        incremental = self.snapshot()
+        LeaderboardService.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+        ana = LeaderboardEntry.objects.get(user=self.users[0], game=None)
+        self.assertEqual((ana.sessions_played, ana.games_finished, ana.total_attempts), (2, 1, 3))
+
+    def test_player_stats_incremental_match_rebuild(self):
+        ana, game = self.users[0], self.games[0]
+        items = {item.name: item for item in game.items.all()}
+        today = DailyTarget.objects.get(game=game)
+        yesterday = DailyTarget.objects.create(game=game, target=items["C"], date=today.date - timedelta(days=1))
+        for daily, guesses in ((yesterday, ["a", "c"]), (today, ["b"])):
+            pipeline = GuessPipeline(game, ana, daily_target=daily)
+            for guess in guesses:
+                pipeline.run(guess)
+        self.play(ana, self.games[1], ["a"])   # sin terminar
+
+        fields = ("user_id", "game_id", "best_attempts", "worst_attempts", "current_streak", "best_streak",
+                  "last_streak_date", "histogram")
+        incremental = sorted(PlayerGameStats.objects.values_list(*fields))
+        PlayerStatsService.rebuild()
+        self.assertEqual(incremental, sorted(PlayerGameStats.objects.values_list(*fields)))
+
+        stats = PlayerGameStats.objects.get(user=ana, game=game)
+        self.assertFalse(PlayerGameStats.objects.filter(game=self.games[1]).exists())   # sin aciertos, sin fila
+        self.assertEqual((stats.best_attempts, stats.worst_attempts, stats.best_streak), (1, 2, 2))
+        self.assertEqual(stats.histogram, {"1": 1, "2": 1})
+        self.assertEqual(ScoreService(ana, game).get_user_average_attempts(), 1.5)
+
+    def test_dashboard_shell_does_not_grow_with_games_or_players(self):
+        self.client.force_login(self.users[0])
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(reverse("dashboard"))
+
+        for i in range(5):
+            Game.objects.create(
+                name=f"g{i}", slug=f"g{i}", attributes=["tipo"], data_source_url="http://example.com",
+            )
+            user = User.objects.create_user(f"extra{i}")
+            for played in self.games:
+                self.play(user, played, ["a", "b"])
+        cache.clear()   # sin fragmentos cacheados: se renderiza todo otra vez
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(reverse("dashboard"))
+        self.assertEqual(len(few), len(many))
+
+    def test_api_pages_by_keyset_and_ranks_around_me(self):
+        points = {"ana": 50, "bea": 40, "carla": 40, "dani": 30, "eva": 20}
+        for name in points:
+            user = self.users[0] if name == "ana" else self.users[1] if name == "bea" else User.objects.create_user(name)
+            LeaderboardEntry.objects.create(user=user, game=None, points=points[name], ranked=True)
+        self.client.force_login(self.users[1])
+        url = reverse("leaderboard_api")
+
+        first = self.client.get(url, {"limit": 2}).json()
+        with self.assertNumQueries(4):   # sesión + usuario + página + posición de su primera fila
+            second = self.client.get(url, {"limit": 2, "after": first["next"]}).json()
+        rows = first["rows"] + second["rows"]
+        rows += self.client.get(url, {"limit": 2, "after": second["next"]}).json()["rows"]
+        self.assertEqual([(r["rank"], r["username"]) for r in rows],
+                         [(1, "ana"), (2, "bea"), (2, "carla"), (4, "dani"), (5, "eva")])
+
+        around = self.client.get(url, {"around": "me", "span": 1}).json()["rows"]
+        self.assertEqual([(r["rank"], r["username"], r["me"]) for r in around],
+                         [(1, "ana", False), (2, "bea", True), (2, "carla", False)])
+
+        UserProfile.objects.filter(user__username="dani").update(is_team_account=True)
+        team = self.client.get(url, {"team": "1"}).json()["rows"]
+        self.assertEqual([(r["rank"], r["username"]) for r in team], [(1, "dani")])
+
+    def test_reset_stats_clears_leaderboard_and_player_stats(self):
+        self.play(self.users[0], self.games[0], ["a", "b"])
+        ScoreService(self.users[1], self.games[1]).add_bonus(100)
+
+        self.assertTrue(PlayerGameStats.objects.exists())
+
+        call_command("reset_stats", stdout=StringIO())
+        self.assertFalse(PlayerGameStats.objects.exists())
+        self.assertEqual(self.snapshot(), [
+            (user.pk, game_id, 0, 0, 0, 0, True)
+            for user, game_ids in ((self.users[0], (None, self.games[0].pk)), (self.users[1], (None, self.games[1].pk)))
+            for game_id in game_ids
+        ])
+
+    def test_admin_elo_delete_unranks_entries(self):
+        ScoreService(self.users[0], self.games[0]).add_bonus(100)
+        ScoreService(self.users[0], self.games[1]).add_bonus(30)
+        request = RequestFactory().post("/")
+        request.user = self.users[0]
+
+        GameEloAdmin(GameElo, admin.site).delete_queryset(request, GameElo.objects.filter(game=self.games[0]))
+        entries = {e.game_id: (e.points, e.ranked) for e in LeaderboardEntry.objects.filter(user=self.users[0])}
+        self.assertEqual(entries, {self.games[0].pk: (0, False), self.games[1].pk: (30, True), None: (30, True)})
+
+    def test_global_rows_rebuild_only_when_active_changes(self):
+        ScoreService(self.users[0], self.games[0]).add_bonus(100)
+        ScoreService(self.users[0], self.games[1]).add_bonus(30)
+        game = self.games[0]
+
+        with mock.patch.object(LeaderboardService, "rebuild_global") as rebuild:
+            game.name = "Pokémon"
+            game.save()
+            rebuild.assert_not_called()
+
+        game.active = False
+        game.save()
+        self.assertEqual(LeaderboardEntry.objects.get(user=self.users[0], game=None).points, 30)
+
+        self.games[1].delete()
+        self.assertFalse(LeaderboardEntry.objects.filter(user=self.users[0], game=None).exists())
+
+
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.game = Game.objects.create(
+            name="Poke", slug="poke", attributes=["tipo"], data_source_url="http://example.com",
+        )
+        items = [GameItem.objects.create(game=self.game, name=n, data={"tipo": n}) for n in ("A", "B")]
+        self.daily = DailyTarget.objects.create(game=self.game, target=items[1], date=timezone.localdate())
+        self.user = User.objects.create_user("ana")
+        self.rival = User.objects.create_user("bea")
+        self.client.force_login(self.user)
+
+    def panel(self, name):
+        with CaptureQueriesContext(connection) as queries:
+            html = self.client.get(reverse("dashboard_panel", args=[name])).json()["html"]
+        return html, len(queries)
+
+    def test_repeat_panel_reads_fragment_from_cache(self):
+        _, cold = self.panel("stats")
+        _, warm = self.panel("stats")
+        self.assertLess(warm, cold)
+        self.assertEqual(self.client.get(reverse("leaderboard_api")).json()["rows"], [])
+
+        # Un intento cambia las estadísticas del usuario y la clasificación
+        with self.captureOnCommitCallbacks(execute=True):
+            GuessPipeline(self.game, self.user, daily_target=self.daily).run("b")
+        html, _ = self.panel("stats")
+        self.assertIn("100", html)
+        rows = self.client.get(reverse("leaderboard_api")).json()["rows"]
+        self.assertEqual([row["username"] for row in rows], ["ana"])
+
+    def test_challenge_transitions_invalidate_both_players(self):
+        self.panel("challenges-pending")
+        with self.captureOnCommitCallbacks(execute=True):
+            Challenge.objects.create(challenger=self.rival, opponent=self.user, game=self.game)
+        html, _ = self.panel("challenges-pending")
+        self.assertIn(reverse("reject_challenge", args=[Challenge.objects.get().pk]), html)
+
+    def test_unknown_panel(self):
+        self.assertEqual(self.client.get(reverse("dashboard_panel", args=["nope"])).status_code, 404)
+
+
+class OpponentSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.game = Game.objects.create(
+            name="Poke", slug="poke", attributes=["tipo"], data_source_url="http://example.com",
+        )
+        GameItem.objects.create(game=self.game, name="A", data={"tipo": "A"})
+        self.user = User.objects.create_user("Álvaro")
+        for name in ("alba", "Alicia", "ÁNGEL", "bea"):
+            User.objects.create_user(name)
+        self.client.force_login(self.user)
+
+    def search(self, q):
+        return self.client.get(reverse("opponent_search"), {"q": q}).json()["results"]
+
+    def test_prefix_search_ignores_accents_and_case_and_excludes_self(self):
+        self.assertEqual([r["username"] for r in self.search("AL")], ["alba", "Alicia"])
+        self.assertEqual([r["username"] for r in self.search("an")], ["ÁNGEL"])
+        self.assertEqual(self.search("zz"), [])
+
+    def test_recent_opponents_refresh_after_new_challenge(self):
+        self.assertEqual(self.search(""), [])
+        bea = User.objects.get(username="bea")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("create_challenge"), {"opponent": bea.pk, "game": self.game.pk})
+        self.assertIn("card", response.json())
+        self.assertEqual(self.search(""), [{"id": bea.pk, "username": "bea"}])
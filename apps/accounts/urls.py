@@ -2,17 +2,24 @@ from django.urls import path
 from .views import (
     LoginView,
     cancel_challenge,
+    dashboard_panel,
     dashboard_view,
+    leaderboard_api,
+    opponent_search,
     reject_challenge,
     register_view,
     complete_challenge,
     create_challenge,
 )
 from django.contrib.auth import views as auth_views
-from ..games.views import play_challenge, ajax_guess_challenge
+from ..games.urls import guess_views
+from ..games.views import play_challenge
 
 urlpatterns = [
     path('', dashboard_view, name='dashboard'),
+    path('dashboard/<slug:panel>/', dashboard_panel, name='dashboard_panel'),
+    path('leaderboard/', leaderboard_api, name='leaderboard_api'),
+    path('opponents/', opponent_search, name='opponent_search'),
     path('login/', LoginView.as_view(template_name='registration/login.html'), name='login'),
     path('logout/', auth_views.LogoutView.as_view(), name='logout'),
     path('register/', register_view, name='register'),
@@ -31,7 +38,7 @@ urlpatterns = [
     path("challenges/create/", create_challenge, name="create_challenge"),
     path("challenges/<int:challenge_id>/play/", play_challenge, name="play_challenge"),
     path("challenges/<int:challenge_id>/complete/", complete_challenge, name="complete_challenge"),
-    path("challenges/<int:challenge_id>/guess/", ajax_guess_challenge, name="ajax_guess_challenge"),
+    path("challenges/<int:challenge_id>/guess/", guess_views.ajax_guess_challenge, name="ajax_guess_challenge"),
     path('challenge/<int:challenge_id>/reject/', reject_challenge, name='reject_challenge'),
     path("challenge/<int:challenge_id>/cancel/", cancel_challenge, name="cancel_challenge"),
 ]
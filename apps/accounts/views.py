@@ -1,9 +1,9 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.utils.timezone import now
 from django.views.decorators.cache import never_cache
 from django.contrib import messages
 from django.contrib.auth.models import User
@@ -14,13 +14,16 @@ from django.urls import reverse
 from django.template.loader import render_to_string
 
 from apps.accounts.models import UserProfile, Challenge
+from apps.accounts.services.dashboard_cache import DashboardCache
 from apps.accounts.services.dashboard_stats import DashboardStats
+from apps.accounts.services.leaderboard import LeaderboardService
+from apps.accounts.services.opponent_search import OpponentSearch
 from apps.accounts.services.score_service import ScoreService
 from apps.games.services.gameplay.challenge_view_helper import ChallengeViewHelper
 from apps.games.services.gameplay.challenge_resolution_service import ChallengeResolutionService
 from apps.common.utils import json_success, json_error
-from apps.games.models import Game, ExtraDailyPlay, GameAttempt
-from apps.games.services.gameplay.target_service import TargetService
+from apps.games.models import Game, GameAttempt
+from apps.games.services.gameplay.daily_status_service import DailyStatusService
 from apps.games.services.gameplay.play_session_service import PlaySessionService
 
 # ---------- CREATE CHALLENGE ----------
@@ -62,68 +65,131 @@ def reject_challenge(request, challenge_id):
 @never_cache
 @login_required
 def dashboard_view(request):
+    """
+    Esqueleto del dashboard: cabecera, formulario de retos y pestañas.  Los
+    paneles (estadísticas, juegos, retos, rankings) se piden después a
+    ``dashboard_panel`` y a la API de clasificación, así que el coste de
+    esta vista no crece con el número de juegos.
+    """
     stats = DashboardStats(request.user)
-    users = User.objects.exclude(id=request.user.id)
+    context = {
+        "available_games": stats.available_games(),
+        "stats": stats,
+        "dashboard_versions": DashboardCache.versions(request.user),
+        "dashboard_cache_timeout": settings.DASHBOARD_CACHE_TIMEOUT,
+    }
+    return render(request, "accounts/dashboard.html", context)
 
-    pending_challenges = Challenge.objects.filter(opponent=request.user, accepted=False)
-    active_challenges = Challenge.objects.filter(
-        accepted=True,
-        completed=False
-    ).filter(models.Q(challenger=request.user) | models.Q(opponent=request.user))
-    active_challenges_to_play = Challenge.objects.filter(
-        accepted=True,
-        completed=False,
-        challenger=request.user
-    )
-    sent_pending_challenges = Challenge.objects.filter(
-        challenger=request.user,
+
+# ---------- DASHBOARD PANELS ----------
+def _playable_games(user):
+    """Juegos activos con la URL a la que lleva su botón (daily, extra o daily resuelto)."""
+    games = []
+    for status in DailyStatusService(user).for_games():
+        game = status.game
+        if status.solved and status.extra_id:
+            game.redirect_url = reverse("play_extra_daily", args=[status.extra_id])
+        else:
+            game.redirect_url = reverse("play", args=[game.slug])
+        games.append(game)
+    return games
+
+
+def _challenges(user, kind):
+    challenges = Challenge.objects.select_related("challenger", "opponent", "game")
+    if kind == "active":
+        return challenges.filter(
+            accepted=True,
+            completed=False
+        ).filter(models.Q(challenger=user) | models.Q(opponent=user))
+    if kind == "pending":
+        return challenges.filter(opponent=user, accepted=False)
+    return challenges.filter(
+        challenger=user,
         accepted=False,
         completed=False
     )
 
-    today = now().date()
 
-    # 1. Map slug → extra_id (only for today)
-    active_extras = ExtraDailyPlay.objects.filter(
-        user=request.user,
-        completed=False,
-        created_at__date=today
-    ).select_related('game')
+@never_cache
+@login_required
+def dashboard_panel(request, panel):
+    """
+    HTML de un panel del dashboard como ``{"html": ...}``.  Estadísticas y
+    retos van en fragmentos cacheados (ver DashboardCache): los datos solo
+    se consultan si el fragmento no está en caché.
+    """
+    user = request.user
+    context = {
+        "dashboard_versions": DashboardCache.versions(user),
+        "dashboard_cache_timeout": settings.DASHBOARD_CACHE_TIMEOUT,
+    }
+    if panel == "stats":
+        template = "partials/dashboard_stats.html"
+        context["stats"] = DashboardStats(user)
+    elif panel == "games":
+        template = "partials/dashboard_games.html"
+        context["available_games"] = _playable_games(user)
+    elif panel in ("challenges-active", "challenges-pending", "challenges-sent"):
+        template = "partials/dashboard_challenges.html"
+        kind = panel.removeprefix("challenges-")
+        context.update(kind=kind, challenges=_challenges(user, kind))
+    else:
+        return json_error("Panel desconocido", status=404)
+
+    return json_success({"html": render_to_string(template, context, request=request)})
+
+
+# ---------- LEADERBOARD API ----------
+@never_cache
+@login_required
+def leaderboard_api(request):
+    """
+    Clasificación en JSON, por páginas.
+      ?game=<slug>      juego (sin él, la global)
+      ?team=1|0         solo cuentas de equipo / individuales
+      ?limit=N          filas por página (máx. LeaderboardService.MAX_PAGE_SIZE)
+      ?after=<cursor>   siguiente página (el ``next`` de la anterior)
+      ?around=me&span=N la fila del usuario con N vecinos por lado
+    """
+    game = None
+    if request.GET.get("game"):
+        game = get_object_or_404(Game, slug=request.GET["game"], active=True)
+    team = {"1": True, "0": False}.get(request.GET.get("team"))
+
+    if request.GET.get("around") == "me":
+        span = min(max(_int_param(request, "span", 5), 0), 25)
+        rows = LeaderboardService.around(request.user, game, team, span=span)
+        return json_success({"rows": rows, "next": None})
+
+    limit = min(max(_int_param(request, "limit", LeaderboardService.PAGE_SIZE), 1),
+                LeaderboardService.MAX_PAGE_SIZE)
+    try:
+        after = LeaderboardService.decode_cursor(request.GET["after"]) if request.GET.get("after") else None
+    except ValueError:
+        return json_error("Cursor no válido")
 
-    extras_by_slug = {extra.game.slug: extra.id for extra in active_extras}
+    if after is None:
+        rows, next_cursor = LeaderboardService.first_page(game, team, limit=limit)
+    else:
+        rows, next_cursor = LeaderboardService.page(game, team, after=after, limit=limit)
+    return json_success({"rows": rows, "next": LeaderboardService.encode_cursor(next_cursor)})
 
-    # 2. Map slug → has_daily_target
-    available_games = stats.available_games()
-    daily_targets_by_slug = {
-        game.slug: bool(not TargetService(game, request.user).is_daily_resolved())
-        for game in available_games
-    }
 
-    # 3. Annotate each game with logical redirection
-    for game in available_games:
-        if daily_targets_by_slug.get(game.slug):
-            game.redirect_url = reverse("play", args=[game.slug])
-        elif game.slug in extras_by_slug:
-            game.redirect_url = reverse("play_extra_daily", args=[extras_by_slug[game.slug]])
-        else:
-            game.redirect_url = reverse("play", args=[game.slug])
+# ---------- OPPONENT SEARCH ----------
+@never_cache
+@login_required
+def opponent_search(request):
+    """Rivales por prefijo del nombre (?q=) o, sin texto, los últimos retados."""
+    results = OpponentSearch(request.user).search(request.GET.get("q", ""))
+    return json_success({"results": results})
 
-    context = {
-        "available_games": available_games,
-        "user_stats": {
-            "games": stats.user_stats(),
-            "global_elo": stats.global_elo(),
-        },
-        "global_ranking": stats.ranking_global(),
-        "per_game_ranking": stats.ranking_per_game(),
-        "pending_challenges": pending_challenges,
-        "active_challenges": active_challenges,
-        "active_challenges_to_play": active_challenges_to_play,
-        "sent_pending_challenges": sent_pending_challenges,
-        "users": users,
-    }
 
-    return render(request, "accounts/dashboard.html", context)
+def _int_param(request, name, default):
+    try:
+        return int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
 
 
 def register_view(request):
@@ -0,0 +1,175 @@
+"""
+Métricas Prometheus de los caminos calientes, servidas en ``/metrics``.
+
+Se agregan en el propio proceso con ``prometheus_client`` (un ``inc`` o un
+``observe`` cuestan ~1 µs).  Con varios workers (uvicorn
+``--workers N``) cada proceso escribe sus valores en ficheros mmap del
+directorio ``PROMETHEUS_MULTIPROC_DIR`` y la vista los suma al exportar
+(ver ``entrypoint.sh``); sin esa variable se usa el registro del proceso.
+
+- ``MetricsMiddleware``: latencia y nº de consultas a BD por vista.
+- ``observe_guess``: intentos por juego, tipo de sesión y resultado.
+- ``observe_cache``: aciertos/fallos de las cachés en memoria por capa.
+"""
+from __future__ import annotations
+
+import hmac
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+__all__ = ["MetricsMiddleware", "observe_guess", "observe_cache", "metrics_view"]
+
+# ──────────────────────────── Métricas ───────────────────────────
+REQUEST_LATENCY = Histogram(
+    "guessdle_request_latency_seconds", "Latencia de las peticiones por vista",
+    ["view"],
+    buckets=(.005, .01, .025, .05, .075, .1, .25, .5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "guessdle_requests_total", "Peticiones por vista y código de estado", ["view", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "guessdle_request_db_queries", "Consultas a BD por petición", ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+GUESSES = Counter(
+    "guessdle_guesses_total", "Intentos procesados por juego, tipo de sesión y resultado",
+    ["game", "session_type", "outcome"],   # outcome: ok | invalid | duplicate | finished
+)
+WINS = Counter(
+    "guessdle_wins_total", "Intentos acertados por juego y tipo de sesión", ["game", "session_type"],
+)
+CACHE = Counter(
+    "guessdle_cache_requests_total", "Consultas a las cachés en memoria por capa",
+    ["layer", "result"],   # result: hit | miss
+)
+
+
+# ──────────────────────────── Registro ───────────────────────────
+def observe_guess(game, session_type: str, outcome) -> None:
+    GUESSES.labels(game.slug, session_type, outcome.status).inc()
+    if outcome.correct and outcome.valid:
+        WINS.labels(game.slug, session_type).inc()
+
+
+_CACHE_CHILDREN = {}
+
+
+def observe_cache(layer: str, hit: bool) -> None:
+    key = (layer, hit)
+    child = _CACHE_CHILDREN.get(key)
+    if child is None:
+        child = _CACHE_CHILDREN[key] = CACHE.labels(layer, "hit" if hit else "miss")
+    child.inc()
+
+
+class _QueryCounter:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+# Contador de la petición en curso.  Un ContextVar (y no un execute_wrapper
+# por petición) porque bajo ASGI las consultas corren en el hilo de
+# ``sync_to_async``, con otra conexión, pero heredan el contexto.
+_CURRENT_QUERIES: ContextVar[Optional[_QueryCounter]] = ContextVar("guessdle_request_queries", default=None)
+
+
+def _count_query(execute, sql, params, many, context):
+    counter = _CURRENT_QUERIES.get()
+    if counter is not None:
+        counter.count += 1
+    return execute(sql, params, many, context)
+
+
+def _install_counter(sender=None, connection=None, **kwargs):
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _count_query)
+
+
+class MetricsMiddleware:
+    """Latencia, estado y consultas a BD de cada petición, por nombre de vista."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+        connection_created.connect(_install_counter, dispatch_uid="guessdle_metrics_queries")
+        for connection in connections.all(initialized_only=True):
+            _install_counter(connection=connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        counter, start = _QueryCounter(), time.perf_counter()
+        token = _CURRENT_QUERIES.set(counter)
+        try:
+            response = self.get_response(request)
+        finally:
+            _CURRENT_QUERIES.reset(token)
+        return self._finish(request, response, counter, start)
+
+    async def __acall__(self, request):
+        counter, start = _QueryCounter(), time.perf_counter()
+        token = _CURRENT_QUERIES.set(counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _CURRENT_QUERIES.reset(token)
+        return self._finish(request, response, counter, start)
+
+    @staticmethod
+    def _finish(request, response, counter, start):
+        elapsed = time.perf_counter() - start
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "<sin vista>"
+        if view != "metrics":
+            REQUEST_LATENCY.labels(view).observe(elapsed)
+            REQUEST_QUERIES.labels(view).observe(counter.count)
+            REQUESTS.labels(view, str(response.status_code)).inc()
+        return response
+
+
+# ──────────────────────────── Endpoint ───────────────────────────
+@require_GET
+def metrics_view(request):
+    """
+    Formato de texto de Prometheus.  Exige ``Authorization: Bearer <token>``
+    con ``METRICS_TOKEN``; sin token configurado solo responde con DEBUG o
+    a un usuario staff (nunca queda público por olvidar la variable).
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        given = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(given, token):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        user = getattr(request, "user", None)
+        if not (user and user.is_staff):
+            return HttpResponseForbidden()
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
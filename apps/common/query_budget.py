@@ -0,0 +1,168 @@
+"""
+Presupuesto de consultas por petición (opt-in: ``QUERY_BUDGET_ENABLED``).
+
+``QueryBudgetMiddleware`` instala un ``execute_wrapper`` en cada conexión y,
+por cada consulta, anota su duración, su SQL y quién la lanzó:
+- el *sitio*: primer frame del proyecto (``apps/``) en la pila, con la
+  plantilla si la consulta salió de evaluar un queryset al renderizar,
+- el *servicio*: la clase de ``apps`` más cercana en la pila
+  (``ContextBuilder``, ``DashboardStats``, ``ScoreService``...) o, si no
+  hay, la función (p. ej. ``dashboard_view``).
+
+Si la petición supera el presupuesto de su vista (``QUERY_BUDGETS``, por
+nombre de URL, con ``"default"`` como respaldo) se registra un WARNING con
+el total, el tiempo en BD, los sitios y servicios con más consultas y el
+SQL repetido (mismo texto con distintos parámetros: el típico N+1).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["QueryReport", "QueryBudgetMiddleware", "budget_for"]
+
+_APPS_DIR = os.path.join(str(settings.BASE_DIR), "apps") + os.sep
+_THIS_FILE = os.path.abspath(__file__)
+_TEMPLATE_DIR = os.sep + os.path.join("django", "template") + os.sep
+
+
+def budget_for(view_name: Optional[str]) -> Optional[int]:
+    budgets = getattr(settings, "QUERY_BUDGETS", {})
+    if view_name in budgets:
+        return budgets[view_name]
+    return budgets.get("default")
+
+
+class QueryReport:
+    """Consultas de una petición, agrupadas por sitio, servicio y SQL."""
+
+    TOP = 5
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.sites: Counter = Counter()
+        self.services: Counter = Counter()
+        self.sql: Counter = Counter()
+        self.statements: Counter = Counter()   # (sql, params): duplicados exactos
+
+    # ---------- execute_wrapper ----------
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, params, time.perf_counter() - start, sys._getframe(1))
+
+    def record(self, sql, params, duration: float, frame):
+        site, service = self._caller(frame)
+        self.count += 1
+        self.duration += duration
+        self.sites[site] += 1
+        self.services[service] += 1
+        self.sql[sql] += 1
+        try:
+            self.statements[(sql, repr(params))] += 1
+        except Exception:  # parámetros sin repr razonable
+            pass
+
+    @staticmethod
+    def _caller(frame) -> Tuple[str, str]:
+        """(sitio, servicio) del primer frame del proyecto que lanzó la consulta."""
+        template = None
+        site = service = None
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if template is None and _TEMPLATE_DIR in filename:
+                context = frame.f_locals.get("context")
+                template = getattr(getattr(context, "template", None), "name", None)
+            elif filename.startswith(_APPS_DIR) and filename != _THIS_FILE:
+                if site is None:
+                    site = f"{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno} {frame.f_code.co_name}"
+                    if template:
+                        site += f" [{template}]"
+                owner = frame.f_locals.get("self")
+                cls = owner if isinstance(owner, type) else type(owner)
+                if owner is not None and cls.__module__.startswith("apps."):
+                    service = cls.__name__
+                    break
+                if service is None:
+                    service = frame.f_code.co_name
+            elif site is not None:
+                break   # fuera del código del proyecto (handler de Django)
+            frame = frame.f_back
+        return site or "<fuera de apps>", service or "<django>"
+
+    # ---------- Resumen ----------
+    @property
+    def duplicates(self) -> List[Tuple[str, int]]:
+        """SQL lanzado más de una vez (mismo texto), de más a menos veces."""
+        return [(sql, n) for sql, n in self.sql.most_common() if n > 1]
+
+    @property
+    def exact_duplicates(self) -> int:
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.duration * 1000, 1),
+            "exact_duplicates": self.exact_duplicates,
+            "sites": self.sites.most_common(self.TOP),
+            "services": self.services.most_common(self.TOP),
+            "duplicated_sql": [(sql[:200], n) for sql, n in self.duplicates[:self.TOP]],
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"{self.count} consultas, {self.duration * 1000:.1f} ms en BD, "
+            f"{self.exact_duplicates} duplicadas exactas",
+            "  servicios: " + ", ".join(f"{name}={n}" for name, n in self.services.most_common(self.TOP)),
+            "  sitios:",
+        ]
+        lines += [f"    {n:>4}  {site}" for site, n in self.sites.most_common(self.TOP)]
+        if self.duplicates:
+            lines.append("  SQL repetido:")
+            lines += [f"    {n:>4}× {sql[:160]}" for sql, n in self.duplicates[:self.TOP]]
+        return "\n".join(lines)
+
+
+class QueryBudgetMiddleware:
+    """
+    Mide las consultas de cada petición y avisa si superan el presupuesto.
+    Solo síncrono: las vistas async (GUESSDLE_ASYNC_VIEWS) las adapta Django.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        report = QueryReport()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(report))
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else None
+        budget = budget_for(view_name)
+        request.query_report = report
+
+        if budget is not None and report.count > budget:
+            logger.warning(
+                "Presupuesto de consultas superado en %s (%s %s): %d > %d\n%s",
+                view_name or "<sin vista>", request.method, request.path,
+                report.count, budget, report.format(),
+                extra={"view": view_name, "budget": budget, **report.summary()},
+            )
+        return response
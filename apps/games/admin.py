@@ -1,9 +1,12 @@
 from django.contrib import admin
-from .models import Game, GameItem, ScoringRule
+from .models import Game, GameItem, ItemDifficulty, ScoringRule
 from .models import GameAttempt, DailyTarget, ExtraDailyPlay, PlaySession
+from .attempts import forget_feedback
+from .comparison import plan_fingerprint
+from .services.catalog.images import merge_manifest, save_image
+from .services.catalog.projections import normalize_items
 from apps.accounts.models import Challenge
 from django import forms
-from django.conf import settings
 from django.contrib import messages
 import zipfile
 import os
@@ -66,7 +69,9 @@ class GameAdmin(admin.ModelAdmin):
     def _process_items(self, request, game, raw_items_list):
         created_count = 0
         updated_count = 0
+        data_changed = False
         errors_processing = []
+        previous = dict(GameItem.objects.filter(game=game).values_list('name', 'data'))
 
         for raw in raw_items_list:
             parsed = {}
@@ -100,17 +105,24 @@ class GameAdmin(admin.ModelAdmin):
                 item, created = GameItem.objects.update_or_create(
                     game=game,
                     name=name,
-                    defaults={'data': parsed}
+                    defaults={'data': parsed}   # GameItem.save recalcula 'normalized'
                 )
                 if created:
                     created_count += 1
                 else:
                     updated_count += 1
+                    data_changed = data_changed or previous.get(name) != parsed
             except Exception as e:
                 errors_processing.append(f"Error updating/creating item '{name}': {e}")
 
+        if data_changed:
+            # El feedback guardado se calculó con los datos viejos
+            forget_feedback([game.pk])
         if created_count > 0 or updated_count > 0:
+            game.bump_catalog_version()
             messages.success(request, f"Juego '{game.name}': {created_count} ítems creados, {updated_count} ítems actualizados.")
+            # La versión nueva del catálogo deja la dificultad desfasada; se recalcula fuera de la petición
+            messages.info(request, f"Juego '{game.name}': dificultad de los ítems pendiente de recalcular. Ejecuta 'python manage.py score_item_difficulty --game {game.slug}'.")
         if not errors_processing and created_count == 0 and updated_count == 0:
              messages.info(request, f"Juego '{game.name}': No se crearon ni actualizaron ítems. Los datos podrían estar ya sincronizados o no se encontraron ítems válidos.")
         for error_msg in errors_processing:
@@ -209,19 +221,25 @@ class GameAdmin(admin.ModelAdmin):
     actions = [sync_game_items_action]
 
     def save_model(self, request, obj, form, change):
+        previous = Game.objects.filter(pk=obj.pk).first() if change else None
         super().save_model(request, obj, form, change)
 
+        if previous and plan_fingerprint(previous) != obj.comparison_fingerprint:
+            # Las proyecciones viejas dejan de valer: se regeneran ya (y el
+            # catálogo versionado con ellas)
+            normalized = normalize_items(obj)
+            obj.bump_catalog_version()
+            messages.info(
+                request,
+                f"La configuración de comparación de '{obj.name}' ha cambiado: "
+                f"proyección normalizada regenerada en {normalized} ítems."
+            )
+
         zip_file = form.cleaned_data.get('item_images_zip')
         if zip_file:
-            game_slug = obj.slug
-            base_item_image_dir = os.path.join(settings.MEDIA_ROOT, 'game_item_images')
-            game_specific_image_dir = os.path.join(base_item_image_dir, game_slug)
-            
-            os.makedirs(game_specific_image_dir, exist_ok=True)
-
             try:
                 with zipfile.ZipFile(zip_file, 'r') as zf:
-                    processed_files = 0
+                    processed_hashes = {}
                     errors = []
                     
                     for member_name in zf.namelist():
@@ -241,13 +259,12 @@ class GameAdmin(admin.ModelAdmin):
                             errors.append(f"El ID '{item_id_str}' (del archivo '{original_filename}') no es un entero válido y la imagen fue omitida. Solo se procesarán archivos con nombres de ID numéricos (ej: '1.png').")
                             continue
                         
-                        target_path = os.path.join(game_specific_image_dir, original_filename)
-                        
-                        with open(target_path, 'wb') as f_out:
-                            f_out.write(zf.read(member_name))
-                        processed_files += 1
+                        # Se escribe a través del storage para que lo vean todos los nodos
+                        processed_hashes[item_id_str] = save_image(obj, original_filename, zf.read(member_name))
                     
+                    processed_files = len(processed_hashes)
                     if processed_files > 0:
+                        merge_manifest(obj, processed_hashes.items())
                         messages.success(request, f"{processed_files} imágenes de ítems procesadas correctamente para '{obj.name}'.")
                     if errors:
                         for error_msg in errors:
@@ -267,17 +284,38 @@ class GameItemAdmin(admin.ModelAdmin):
     list_display = ('name', 'game', 'deleted', 'deleted_at')
     list_filter = ('game', 'deleted')
     search_fields = ('name',)
+    readonly_fields = ('normalized',)   # la recalcula GameItem.save desde 'data'
     actions = ['soft_delete_items', 'restore_items']
 
+    # Editar o borrar un ítem a mano también invalida el catálogo versionado
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        Game.bump_catalog_versions([obj.game_id])
+        if change and 'data' in form.changed_data:
+            forget_feedback([obj.game_id])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        Game.bump_catalog_versions([obj.game_id])
+
+    def delete_queryset(self, request, queryset):
+        game_ids = set(queryset.values_list("game_id", flat=True))
+        super().delete_queryset(request, queryset)
+        Game.bump_catalog_versions(game_ids)
+
     @admin.action(description="Marcar como eliminado (soft delete)")
     def soft_delete_items(self, request, queryset):
         from django.utils import timezone
+        game_ids = set(queryset.values_list("game_id", flat=True))
         updated = queryset.update(deleted=True, deleted_at=timezone.now())
+        Game.bump_catalog_versions(game_ids)
         self.message_user(request, f"{updated} ítems marcados como eliminados (soft delete).")
 
     @admin.action(description="Restaurar ítems eliminados")
     def restore_items(self, request, queryset):
+        game_ids = set(queryset.values_list("game_id", flat=True))
         updated = queryset.update(deleted=False, deleted_at=None)
+        Game.bump_catalog_versions(game_ids)
         self.message_user(request, f"{updated} ítems restaurados.")
 
 
@@ -314,5 +352,10 @@ class PlaySessionAdmin(admin.ModelAdmin):
     search_fields = ('user__username',)
 
 
-
-
+@admin.register(ItemDifficulty)
+class ItemDifficultyAdmin(admin.ModelAdmin):
+    list_display = ('item', 'expected_guesses', 'worst_guesses', 'openers', 'computed_at')
+    list_filter = ('item__game',)
+    search_fields = ('item__name',)
+    ordering = ('-expected_guesses',)
+    readonly_fields = ('item', 'expected_guesses', 'worst_guesses', 'openers', 'catalog_version', 'computed_at')
@@ -0,0 +1,99 @@
+"""
+Versiones async de los endpoints de intento y de estado de partida.
+
+Mismas respuestas que ``views.py``, pero con el ORM async: bajo ASGI el
+estado y los intentos rechazados no ocupan un hilo del servidor.  La
+escritura de un intento aceptado es la del camino síncrono, con su
+transacción y su bloqueo, por ``sync_to_async`` (ver ``GuessPipeline.arun``).
+
+Se enrutan en lugar de las síncronas con ``GUESSDLE_ASYNC_VIEWS = True``.
+"""
+from __future__ import annotations
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.http import require_POST
+
+from apps.accounts.models import Challenge, UserProfile
+from apps.games.models import ExtraDailyPlay, Game
+from apps.games.services.gameplay.guess_pipeline import GuessPipeline
+from apps.games.services.gameplay.target_service import TargetService
+from apps.games.views import _guess_response, _state_response
+
+
+async def _daily_pipeline(request, slug: str):
+    """(pipeline, None) para el daily de hoy, o (None, respuesta de error)."""
+    game = await aget_object_or_404(Game, slug=slug)
+    user = await request.auser()
+
+    is_team = await (
+        UserProfile.objects.filter(user=user).values_list("is_team_account", flat=True).afirst()
+    )
+    daily_target = await TargetService(game, user, is_team=bool(is_team)).aget_target_for_today()
+    if not daily_target:
+        return None, JsonResponse({"error": "No hay objetivo diario."}, status=400)
+    return GuessPipeline(game, user, daily_target=daily_target), None
+
+
+# ------------------------------------------------------------------ #
+# 1) AJAX – partida diaria
+# ------------------------------------------------------------------ #
+@require_POST
+@login_required
+@never_cache
+@csrf_protect
+async def ajax_guess(request, slug: str):
+    pipeline, error = await _daily_pipeline(request, slug)
+    if error:
+        return error
+    return _guess_response(request, await pipeline.arun(request.POST.get("guess", "")))
+
+
+@login_required
+@never_cache
+async def ajax_state(request, slug: str):
+    pipeline, error = await _daily_pipeline(request, slug)
+    if error:
+        return error
+    return _state_response(await pipeline.astate())
+
+
+# ------------------------------------------------------------------ #
+# 4) AJAX – reto 1 v 1
+# ------------------------------------------------------------------ #
+@require_POST
+@login_required
+@never_cache
+@csrf_protect
+async def ajax_guess_challenge(request, challenge_id: int):
+    challenge = await aget_object_or_404(
+        Challenge.objects.select_related("game", "target"), pk=challenge_id
+    )
+    user = await request.auser()
+    if user.id not in (challenge.challenger_id, challenge.opponent_id):
+        return JsonResponse({"error": "No autorizado."}, status=403)
+    if not challenge.target:
+        return JsonResponse({"error": "El reto aún no tiene objetivo."}, status=400)
+
+    pipeline = GuessPipeline(challenge.game, user, challenge=challenge)
+    return _guess_response(request, await pipeline.arun(request.POST.get("guess", "")))
+
+
+# ------------------------------------------------------------------ #
+# 7) AJAX – partida extra diaria
+# ------------------------------------------------------------------ #
+@require_POST
+@login_required
+@never_cache
+@csrf_protect
+async def ajax_guess_extra(request, extra_id: int):
+    user = await request.auser()
+    extra = await aget_object_or_404(
+        ExtraDailyPlay.objects.select_related("game", "target"), pk=extra_id, user=user
+    )
+
+    pipeline = GuessPipeline(extra.game, user, extra_play=extra)
+    return _guess_response(request, await pipeline.arun(request.POST.get("guess", "")))
@@ -2,105 +2,91 @@
 """
 Construcción de intentos y feedback para la plantilla.
 """
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Tuple
 
-from .models import Game, GameItem
-from .utils import parse_to_float, numeric_feedback, to_list
+from .comparison import AttemptRow, FeedbackCell, get_plan
+from .models import Game, GameAttempt, GameItem
+from .services.catalog.images import image_url
 
-__all__ = ["build_attempts"]
+__all__ = ["build_attempts", "build_attempt", "attempt_history", "forget_feedback"]
 
 
-def _to_lower_set(value) -> Set[str]:
-    """Convierte un valor (str | lista | None) en un set en minúsculas."""
-    return {str(v).lower() for v in to_list(value)}
+def _row(game: Game, item: GameItem, target: GameItem, feedback: Tuple[FeedbackCell, ...]) -> Dict[str, Any]:
+    data = item.data if isinstance(item.data, dict) else {}
+    return AttemptRow(
+        name=item.name,
+        is_correct=item.name == target.name,
+        feedback=feedback,
+        icon=getattr(item, "icon", None),
+        guess_image_url=image_url(game, data.get("id")),
+    ).as_dict()
 
 
-def _cross_group_partial(
-    attr: str,
-    grouped_attrs: Set[str],
-    guess_set: Set[str],
-    target_data: dict,
-    defaults: dict,
-) -> bool:
+# ──────────────────────────── Main ───────────────────────────────
+def build_attempts(
+    game: Game,
+    guesses: List[GameItem],
+    target: GameItem,
+) -> List[Dict[str, Any]]:
+    plan = get_plan(game)
+    target_side = plan.side(target)   # se normaliza una vez por llamada
+
+    return [
+        _row(game, item, target, plan.compare(plan.side(item), target_side))
+        for item in guesses
+    ]
+
+
+def build_attempt(game: Game, guess: GameItem, target: GameItem) -> Tuple[Dict[str, Any], str]:
     """
-    Devuelve True si el valor del atributo `attr` aparece
-    en cualquier otro atributo del mismo grupo.
+    Feedback de un único intento nuevo.
+    Devuelve la fila para la plantilla y su forma compacta para persistir.
     """
-    if attr not in grouped_attrs:
-        return False
+    plan = get_plan(game)
+    cells = plan.compare(plan.side(guess), plan.side(target))
+    return _row(game, guess, target, cells), plan.encode(cells)
 
-    target_group_values = {
-        v.lower()
-        for g_attr in grouped_attrs
-        for v in to_list(target_data.get(g_attr) or defaults.get(g_attr))
-    }
-    return bool(guess_set & target_group_values)
 
-
-# ──────────────────────────── Main ───────────────────────────────
-def build_attempts(
+def attempt_history(
     game: Game,
-    guesses: List[GameItem],
+    attempts: List[GameAttempt],
     target: GameItem,
 ) -> List[Dict[str, Any]]:
-    attempts: List[Dict[str, Any]] = []
-
-    numeric_fields   = set(game.numeric_fields or [])
-    grouped_attrs    = set(game.grouped_attributes or [])   # p.e. {"tipo1", "tipo2"}
-    target_data      = target.data
-
-    for item in guesses:
-        attempt: Dict[str, Any] = {
-            "name":  item.name,
-            "is_correct": item.name == target.name,
-            "feedback": [],
-            "icon": getattr(item, "icon", None),
-            "guess_image_url": item.get_image_url(),
-        }
-
-        for attr in game.attributes:
-            guess_val   = item.data.get(attr)   or game.defaults.get(attr)
-            target_val  = target_data.get(attr) or game.defaults.get(attr)
-
-            is_match = partial = False
-            fb = {"arrow": "", "hint": ""}
-
-            # ───────────── Campos numéricos ─────────────
-            if attr in numeric_fields:
-                g_num = parse_to_float(guess_val)
-                t_num = parse_to_float(target_val)
-                is_match = g_num == t_num
-                if not is_match:
-                    fb = numeric_feedback(g_num, t_num)
-
-            # ───────────── Campos texto / lista ─────────
-            else:
-                guess_set  = _to_lower_set(guess_val)
-                target_set = _to_lower_set(target_val)
-
-                if guess_set and target_set:
-                    is_match = guess_set == target_set
-                    partial  = not is_match and bool(guess_set & target_set)
-                else:
-                    is_match = guess_val == target_val
-
-                # Coincidencia cruzada dentro del grupo (tipo1/tipo2)
-                if not is_match and not partial:
-                    partial = _cross_group_partial(
-                        attr, grouped_attrs, guess_set, target_data, game.defaults
-                    )
-
-            attempt["feedback"].append(
-                {
-                    "attribute": attr,
-                    "value": guess_val,
-                    "correct": is_match,
-                    "partial": partial,
-                    "hint": fb["hint"],
-                    "arrow": fb["arrow"],
-                }
-            )
-
-        attempts.append(attempt)
-
-    return attempts
\ No newline at end of file
+    """
+    Filas de un historial ya guardado (``attempts`` con ``guess`` cargado).
+    Se lee el feedback persistido; solo los intentos antiguos o codificados
+    con otra configuración del juego se recalculan, y se guardan de nuevo.
+
+    La huella guardada es la del plan, no la de los datos de los ítems: quien
+    edite ``GameItem.data`` debe llamar a ``forget_feedback`` (lo hacen la
+    sincronización y el admin de ítems) para que no se muestren los valores
+    nuevos junto a los aciertos calculados con los viejos.
+    """
+    plan = get_plan(game)
+    target_side = None
+    stale: List[GameAttempt] = []
+    rows: List[Dict[str, Any]] = []
+
+    for att in attempts:
+        guess_side = plan.side(att.guess)
+        cells = plan.decode(att.feedback, guess_side)
+        if cells is None:
+            if target_side is None:
+                target_side = plan.side(target)
+            cells = plan.compare(guess_side, target_side)
+            att.feedback = plan.encode(cells)
+            stale.append(att)
+        rows.append(_row(game, att.guess, target, cells))
+
+    if stale:
+        GameAttempt.objects.bulk_update(stale, ["feedback"])
+    return rows
+
+
+def forget_feedback(game_ids) -> int:
+    """
+    Vacía el feedback guardado de los intentos de esos juegos tras editar
+    datos de ítems.  Cada historial se recalcula (y se guarda) la próxima vez
+    que se lee; las pistas lo recalculan desde el catálogo mientras tanto.
+    """
+    return GameAttempt.objects.filter(game_id__in=game_ids).exclude(feedback="").update(feedback="")
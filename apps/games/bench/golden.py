@@ -0,0 +1,101 @@
+# apps/games/bench/golden.py
+"""
+Corpus dorado del motor de feedback.
+
+Cada caso es un juego (configuración de comparación + ítems) con varias
+partidas: un objetivo, su historial de intentos y las filas que debe
+devolver ``build_attempts``.  Cualquier optimización de ``apps/games/attempts.py``
+o ``apps/games/comparison.py`` tiene que reproducirlo exactamente.
+
+El corpus se generó con la implementación original de ``build_attempts``
+y se guarda en ``golden_corpus.json``; regenerarlo solo tiene sentido
+cuando un cambio de reglas es intencionado.
+"""
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+from apps.games.attempts import build_attempts
+from apps.games.models import Game, GameItem
+
+__all__ = ["CORPUS_PATH", "generate_corpus", "load_corpus", "save_corpus", "check_corpus"]
+
+CORPUS_PATH = Path(__file__).with_name("golden_corpus.json")
+
+# Valores elegidos para cubrir los casos límite de las reglas: mayúsculas,
+# listas, separadores de miles europeos/americanos, vacíos y no numéricos.
+_VALUES = [
+    "Fuego", "agua", "Planta", "hielo", "Roca", "FUEGO", "fuego, agua", "Agua,Roca",
+    ["Agua", "roca"], ["planta"], [], "", None, 5, 0,
+    "1.200,5", "1,200.5", "3,5", "12 m", "12", "1.000.000", "-7", "x", " , ",
+]
+
+
+def _row_for_compare(row: Dict[str, Any]) -> Dict[str, Any]:
+    # La URL de imagen depende del storage, no de las reglas de feedback
+    return {k: v for k, v in row.items() if k != "guess_image_url"}
+
+
+def _build(case: Dict[str, Any]):
+    game = Game(pk=None, name="golden", slug="golden", **case["game"])
+    items = [GameItem(game=game, name=it["name"], data=it["data"]) for it in case["items"]]
+    return game, items
+
+
+def _run(game, items, run: Dict[str, Any]) -> List[Dict[str, Any]]:
+    guesses = [items[i] for i in run["guesses"]]
+    return [_row_for_compare(r) for r in build_attempts(game, guesses, items[run["target"]])]
+
+
+def generate_corpus(games: int = 32, items: int = 6, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    cases: List[Dict[str, Any]] = []
+    for _ in range(games):
+        attrs = [f"a{i}" for i in range(rng.randint(1, 8))]
+        numeric = [a for a in attrs if rng.random() < .3]
+        grouped = [a for a in attrs if rng.random() < .4] + (["hidden"] if rng.random() < .3 else [])
+        defaults = {a: rng.choice(_VALUES) for a in attrs + ["hidden"] if rng.random() < .3}
+        config = {
+            "attributes": attrs,
+            "numeric_fields": numeric,
+            "grouped_attributes": grouped,
+            "defaults": defaults,
+        }
+        raw_items = [
+            {"name": f"item-{i}", "data": {a: rng.choice(_VALUES) for a in attrs + ["hidden"] if rng.random() < .85}}
+            for i in range(items)
+        ]
+        case = {"game": config, "items": raw_items, "runs": []}
+        game, built = _build(case)
+        for target in rng.sample(range(items), min(3, items)):
+            run = {"target": target, "guesses": rng.sample(range(items), rng.randint(1, items))}
+            run["expected"] = _run(game, built, run)
+            case["runs"].append(run)
+        cases.append(case)
+    return {"version": 1, "seed": seed, "cases": cases}
+
+
+def save_corpus(corpus: Dict[str, Any], path: Path = CORPUS_PATH) -> None:
+    # Un caso por línea: los diffs del corpus se pueden revisar
+    lines = ",\n".join(json.dumps(c, ensure_ascii=False, sort_keys=True) for c in corpus["cases"])
+    header = json.dumps({k: v for k, v in corpus.items() if k != "cases"}, sort_keys=True)[:-1]
+    path.write_text(f'{header}, "cases": [\n{lines}\n]}}\n', encoding="utf-8")
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def check_corpus(corpus: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Devuelve las diferencias (vacío si la implementación actual coincide)."""
+    mismatches = []
+    for n, case in enumerate(corpus["cases"]):
+        game, items = _build(case)
+        for run in case["runs"]:
+            actual = _run(game, items, run)
+            if actual != run["expected"]:
+                mismatches.append({"case": n, "expected": run["expected"], "actual": actual})
+    return mismatches
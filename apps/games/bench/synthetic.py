@@ -0,0 +1,107 @@
+# apps/games/bench/synthetic.py
+"""
+Juegos sintéticos para medir el motor de feedback sin base de datos.
+
+Los ``Game`` / ``GameItem`` se crean en memoria (nunca se guardan) con un
+pk negativo, de modo que la caché de planes funciona igual que con un
+juego real y no choca con ninguno.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any, List
+
+from apps.games.comparison import ComparisonPlan
+from apps.games.models import Game, GameItem
+
+__all__ = ["SyntheticSpec", "SyntheticGame", "make_game"]
+
+_WORDS = [
+    "fuego", "agua", "planta", "hielo", "roca", "acero", "hada", "dragón",
+    "Rojo", "Azul", "Verde", "Amarillo", "Negro", "Blanco", "Gris", "Rosa",
+    "Norte", "Sur", "Este", "Oeste", "Marina", "Ejército", "Pirata", "Revolución",
+]
+_EMPTY = [None, "", []]
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    items: int = 1000
+    attributes: int = 8
+    numeric_ratio: float = 0.25
+    grouped_ratio: float = 0.25
+    list_ratio: float = 0.5
+    vocabulary: int = 16
+    normalized: bool = True     # proyección precalculada, como tras un sync del admin
+    seed: int = 0
+
+
+@dataclass
+class SyntheticGame:
+    spec: SyntheticSpec
+    game: Game
+    items: List[GameItem]
+    numeric_values: List[Any]
+    multi_values: List[Any]
+
+
+def _numeric(rng: random.Random) -> Any:
+    n = rng.uniform(0, 5000)
+    return rng.choice([
+        f"{n:.1f}",
+        f"{n:,.2f}",                                          # 1,234.56
+        f"{n:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."),  # 1.234,56
+        f"{n:.0f} kg",
+        round(n, 2),
+        None,
+        "desconocido",
+    ])
+
+
+def _multi(rng: random.Random, vocabulary: List[str], as_list: bool) -> Any:
+    if rng.random() < 0.05:
+        return rng.choice(_EMPTY)
+    values = rng.sample(vocabulary, rng.randint(1, min(3, len(vocabulary))))
+    return values if as_list else ", ".join(values)
+
+
+def make_game(spec: SyntheticSpec) -> SyntheticGame:
+    rng = random.Random(spec.seed)
+    attributes = [f"attr_{i}" for i in range(spec.attributes)]
+
+    n_numeric = round(spec.attributes * spec.numeric_ratio)
+    numeric = attributes[:n_numeric]
+    multi = attributes[n_numeric:]
+    n_grouped = round(len(multi) * spec.grouped_ratio)
+    grouped = multi[:n_grouped]
+    list_valued = set(rng.sample(multi, round(len(multi) * spec.list_ratio)))
+    vocabulary = _WORDS[:max(2, min(spec.vocabulary, len(_WORDS)))]
+
+    game = Game(
+        pk=-(spec.seed + 1),
+        name=f"bench-{spec.seed}",
+        slug=f"bench-{spec.seed}",
+        attributes=attributes,
+        numeric_fields=numeric,
+        grouped_attributes=[grouped] if len(grouped) > 1 else [],
+        defaults={multi[-1]: "Gris"} if multi else {},
+    )
+
+    plan = ComparisonPlan(game)
+    items, numeric_values, multi_values = [], [], []
+    for i in range(spec.items):
+        data = {"id": i}
+        for attr in attributes:
+            if attr in numeric:
+                data[attr] = _numeric(rng)
+                numeric_values.append(data[attr])
+            elif rng.random() < 0.97:               # algún atributo ausente → default
+                data[attr] = _multi(rng, vocabulary, attr in list_valued)
+                multi_values.append(data[attr])
+        item = GameItem(pk=i + 1, game=game, name=f"item-{i}", data=data)
+        if spec.normalized:
+            item.normalized = plan.project(data)
+        items.append(item)
+
+    return SyntheticGame(spec, game, items, numeric_values, multi_values)
@@ -0,0 +1,343 @@
+# apps/games/comparison.py
+"""
+Plan de comparación compilado por juego.
+
+Cada ``Game`` se compila una sola vez en un ``ComparisonPlan`` inmutable:
+tipo de comparador por atributo, valores por defecto, tabla de grupos y
+normalización de cada ítem (lado objetivo / lado intento).  El plan se
+cachea por proceso y se invalida solo cuando cambian ``attributes``,
+``numeric_fields``, ``grouped_attributes`` o ``defaults`` (su huella se
+guarda en ``Game.comparison_fingerprint`` al guardar el juego).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from apps.common.metrics import observe_cache
+
+from .utils import parse_to_float, numeric_feedback, to_list
+
+__all__ = [
+    "NUMERIC",
+    "MULTI",
+    "AttributeRule",
+    "ItemSide",
+    "FeedbackCell",
+    "AttemptRow",
+    "ComparisonPlan",
+    "plan_fingerprint",
+    "get_plan",
+    "FLAG_CORRECT",
+    "FLAG_PARTIAL",
+    "FLAG_HIGHER",
+    "FLAG_LOWER",
+    "FLAG_UNKNOWN",
+]
+
+NUMERIC = "numeric"
+MULTI = "multi"
+
+# Códigos de feedback por celda (forma compacta persistida en GameAttempt)
+FLAG_CORRECT = 1
+FLAG_PARTIAL = 2
+FLAG_HIGHER = 4     # el objetivo es mayor → "Más" ▲
+FLAG_LOWER = 8      # el objetivo es menor → "Menos" ▼
+FLAG_UNKNOWN = 16   # alguno de los dos no es numérico → "Incorrecto"
+
+_CODE_CHARS = "0123456789abcdefghijklmnopqrstuv"
+_HINTS = {
+    FLAG_HIGHER: ("Más", "▲"),
+    FLAG_LOWER: ("Menos", "▼"),
+    FLAG_UNKNOWN: ("Incorrecto", ""),
+}
+
+
+# ──────────────────────────── Registros ──────────────────────────
+@dataclass(frozen=True, slots=True)
+class AttributeRule:
+    """Comparador compilado de un atributo visible."""
+    name: str
+    kind: str                 # NUMERIC | MULTI
+    default: Any
+    group: Optional[int]      # índice en ComparisonPlan.groups (o None)
+
+
+@dataclass(frozen=True, slots=True)
+class ItemSide:
+    """
+    Proyección normalizada de un ítem según el plan:
+    - values: valor crudo por atributo (con default aplicado)
+    - keys:   float|None (numérico) o frozenset en minúsculas (multi)
+    - groups: unión de valores en minúsculas por grupo
+    """
+    values: Tuple[Any, ...]
+    keys: Tuple[Any, ...]
+    groups: Tuple[FrozenSet[str], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class FeedbackCell:
+    attribute: str
+    value: Any
+    correct: bool
+    partial: bool
+    hint: str
+    arrow: str
+
+    @property
+    def flags(self) -> int:
+        flags = FLAG_CORRECT if self.correct else 0
+        if self.partial:
+            flags |= FLAG_PARTIAL
+        if self.hint == "Más":
+            flags |= FLAG_HIGHER
+        elif self.hint == "Menos":
+            flags |= FLAG_LOWER
+        elif self.hint:
+            flags |= FLAG_UNKNOWN
+        return flags
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "attribute": self.attribute,
+            "value": self.value,
+            "correct": self.correct,
+            "partial": self.partial,
+            "hint": self.hint,
+            "arrow": self.arrow,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class AttemptRow:
+    name: str
+    is_correct: bool
+    feedback: Tuple[FeedbackCell, ...]
+    icon: Any = None
+    guess_image_url: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "is_correct": self.is_correct,
+            "feedback": [cell.as_dict() for cell in self.feedback],
+            "icon": self.icon,
+            "guess_image_url": self.guess_image_url,
+        }
+
+
+# ──────────────────────────── Helpers ────────────────────────────
+def _lower_set(value) -> FrozenSet[str]:
+    return frozenset(str(v).lower() for v in to_list(value))
+
+
+def _compile_groups(grouped_attributes) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Admite la forma plana (``["tipo_1", "tipo_2"]`` → un único grupo) y la
+    anidada (``[["tipo_1", "tipo_2"], ["rol_1", "rol_2"]]``).
+    """
+    flat: List[str] = []
+    groups: List[Tuple[str, ...]] = []
+    for entry in grouped_attributes or []:
+        if isinstance(entry, (list, tuple)):
+            groups.append(tuple(str(a) for a in entry))
+        else:
+            flat.append(str(entry))
+    if flat:
+        groups.insert(0, tuple(flat))
+    return tuple(groups)
+
+
+def plan_fingerprint(game) -> str:
+    """Huella estable de la configuración de comparación de un juego."""
+    payload = json.dumps(
+        [
+            game.attributes or [],
+            game.numeric_fields or [],
+            game.grouped_attributes or [],
+            game.defaults or {},
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# ──────────────────────────── Plan ───────────────────────────────
+class ComparisonPlan:
+    """Reglas de comparación inmutables de un juego."""
+
+    __slots__ = ("fingerprint", "rules", "groups", "defaults")
+
+    def __init__(self, game):
+        numeric_fields = set(game.numeric_fields or [])
+        groups = _compile_groups(game.grouped_attributes)
+        group_of = {attr: idx for idx, members in enumerate(groups) for attr in members}
+        defaults = dict(game.defaults or {})
+
+        self.fingerprint: str = plan_fingerprint(game)
+        self.groups: Tuple[Tuple[str, ...], ...] = groups
+        self.defaults: Dict[str, Any] = defaults
+        self.rules: Tuple[AttributeRule, ...] = tuple(
+            AttributeRule(
+                name=attr,
+                kind=NUMERIC if attr in numeric_fields else MULTI,
+                default=defaults.get(attr),
+                group=group_of.get(attr),
+            )
+            for attr in game.attributes or []
+        )
+
+    # ---------- Normalización ----------
+    def side(self, item) -> ItemSide:
+        """
+        Normaliza un ``GameItem`` (o cualquier objeto con ``.data``).
+        Usa la proyección guardada en ``item.normalized`` si se generó con
+        este mismo plan; si no (o si el campo está diferido) se calcula.
+        """
+        projection = item.__dict__.get("normalized")
+        if projection and projection.get("fp") == self.fingerprint:
+            return ItemSide(
+                values=tuple(projection["values"]),
+                keys=tuple(
+                    key if rule.kind == NUMERIC else frozenset(key)
+                    for rule, key in zip(self.rules, projection["keys"])
+                ),
+                groups=tuple(frozenset(g) for g in projection["groups"]),
+            )
+        return self.side_from_data(item.data or {})
+
+    def project(self, data: dict) -> Dict[str, Any]:
+        """Proyección serializable (JSON) para ``GameItem.normalized``."""
+        side = self.side_from_data(data or {})
+        return {
+            "fp": self.fingerprint,
+            "values": list(side.values),
+            "keys": [
+                key if rule.kind == NUMERIC else sorted(key)
+                for rule, key in zip(self.rules, side.keys)
+            ],
+            "groups": [sorted(g) for g in side.groups],
+        }
+
+    def side_from_data(self, data: dict) -> ItemSide:
+        values = tuple(data.get(rule.name) or rule.default for rule in self.rules)
+        keys = tuple(
+            parse_to_float(value) if rule.kind == NUMERIC else _lower_set(value)
+            for rule, value in zip(self.rules, values)
+        )
+        groups = tuple(
+            frozenset(
+                v
+                for attr in members
+                for v in _lower_set(data.get(attr) or self.defaults.get(attr))
+            )
+            for members in self.groups
+        )
+        return ItemSide(values=values, keys=keys, groups=groups)
+
+    # ---------- Comparación ----------
+    def compare(self, guess: ItemSide, target: ItemSide) -> Tuple[FeedbackCell, ...]:
+        cells = []
+        for i, rule in enumerate(self.rules):
+            g_key = guess.keys[i]
+            t_key = target.keys[i]
+            partial = False
+            hint = arrow = ""
+
+            if rule.kind == NUMERIC:
+                is_match = g_key == t_key
+                if not is_match:
+                    fb = numeric_feedback(g_key, t_key)
+                    hint, arrow = fb["hint"], fb["arrow"]
+            else:
+                if g_key and t_key:
+                    is_match = g_key == t_key
+                    partial = not is_match and not g_key.isdisjoint(t_key)
+                else:
+                    is_match = guess.values[i] == target.values[i]
+
+                # Coincidencia cruzada dentro del grupo (tipo1/tipo2)
+                if not is_match and not partial and rule.group is not None:
+                    partial = not g_key.isdisjoint(target.groups[rule.group])
+
+            cells.append(FeedbackCell(
+                attribute=rule.name,
+                value=guess.values[i],
+                correct=is_match,
+                partial=partial,
+                hint=hint,
+                arrow=arrow,
+            ))
+        return tuple(cells)
+
+    # ---------- Forma compacta ----------
+    def encode(self, cells: Tuple[FeedbackCell, ...]) -> str:
+        """``"<huella>:<un carácter por atributo>"`` para guardar en BD."""
+        return self.encode_flags(c.flags for c in cells)
+
+    def encode_flags(self, flags) -> str:
+        return self.fingerprint + ":" + "".join(_CODE_CHARS[int(f)] for f in flags)
+
+    def decode_flags(self, encoded: str) -> Optional[List[int]]:
+        """Códigos ``FLAG_*`` por atributo, o None si son de otro plan."""
+        fingerprint, _, codes = (encoded or "").partition(":")
+        if fingerprint != self.fingerprint or len(codes) != len(self.rules):
+            return None
+        return [_CODE_CHARS.index(c) for c in codes]
+
+    def decode(self, encoded: str, guess: ItemSide) -> Optional[Tuple[FeedbackCell, ...]]:
+        """
+        Reconstruye las celdas a partir de la forma compacta.  Devuelve None
+        si se codificó con otro plan (configuración del juego modificada).
+        """
+        codes = self.decode_flags(encoded)
+        if codes is None:
+            return None
+
+        cells = []
+        for i, rule in enumerate(self.rules):
+            flags = codes[i]
+            hint, arrow = _HINTS.get(flags & ~(FLAG_CORRECT | FLAG_PARTIAL), ("", ""))
+            cells.append(FeedbackCell(
+                attribute=rule.name,
+                value=guess.values[i],
+                correct=bool(flags & FLAG_CORRECT),
+                partial=bool(flags & FLAG_PARTIAL),
+                hint=hint,
+                arrow=arrow,
+            ))
+        return tuple(cells)
+
+
+# ──────────────────────────── Caché ──────────────────────────────
+_PLANS: Dict[int, ComparisonPlan] = {}
+_PLANS_LOCK = threading.Lock()
+
+
+def get_plan(game) -> ComparisonPlan:
+    """
+    Devuelve el plan cacheado del juego, recompilándolo si su configuración
+    de comparación ha cambiado desde la última vez.  Compara la huella
+    guardada en el juego: el camino caliente no serializa ni hashea nada
+    (solo los juegos sin huella guardada la calculan).
+    """
+    if game.pk is None:
+        return ComparisonPlan(game)
+
+    fingerprint = game.comparison_fingerprint or plan_fingerprint(game)
+    plan = _PLANS.get(game.pk)
+    if plan is not None and plan.fingerprint == fingerprint:
+        observe_cache("comparison_plan", True)
+        return plan
+
+    observe_cache("comparison_plan", False)
+
+    plan = ComparisonPlan(game)
+    with _PLANS_LOCK:
+        _PLANS[game.pk] = plan
+    return plan
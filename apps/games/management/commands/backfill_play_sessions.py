@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games.models import Game
+from apps.games.services.gameplay.play_session_service import PlaySessionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula el resumen de cada PlaySession desde sus GameAttempt:\n"
+        "  • attempt_count, solved, solved_at y first_guess.\n"
+        "  • Por tramos de sesiones (--chunk-size), una transacción por tramo.\n"
+        "  • Útil tras borrar o editar intentos a mano; después conviene\n"
+        "    ejecutar rebuild_leaderboard."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--game", action="append", dest="slugs", default=[],
+                            help="Slug del juego (se puede repetir). Por defecto, todos.")
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Sesiones por tramo (por defecto 1000).")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor que 0")
+
+        game_ids = None
+        if options["slugs"]:
+            games = Game.objects.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - set(games.values_list("slug", flat=True))
+            if missing:
+                raise CommandError(f"Juegos no encontrados: {', '.join(sorted(missing))}")
+            game_ids = list(games.values_list("pk", flat=True))
+
+        total = PlaySessionService.backfill_summaries(game_ids, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Sesiones recalculadas: {total}"))
@@ -0,0 +1,120 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games.attempts import build_attempts
+from apps.games.bench.golden import check_corpus, generate_corpus, load_corpus, save_corpus
+from apps.games.bench.synthetic import SyntheticSpec, make_game
+from apps.games.utils import numeric_feedback, parse_to_float, to_list
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark del motor de feedback sobre juegos sintéticos (sin base de datos ni red):\n"
+        "  • Mide build_attempts, parse_to_float, numeric_feedback y to_list (ops/s y memoria).\n"
+        "  • Comprueba el corpus dorado (apps/games/bench/golden_corpus.json) antes de medir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=1000, help="Ítems del juego sintético.")
+        parser.add_argument("--attributes", type=int, default=8, help="Atributos por ítem.")
+        parser.add_argument("--numeric-ratio", type=float, default=0.25, help="Proporción de atributos numéricos.")
+        parser.add_argument("--grouped-ratio", type=float, default=0.25, help="Proporción de atributos multi-valor agrupados.")
+        parser.add_argument("--list-ratio", type=float, default=0.5, help="Proporción de atributos multi-valor guardados como lista JSON.")
+        parser.add_argument("--raw", action="store_true",
+                            help="Ítems sin proyección normalizada (como antes de normalize_game_items).")
+        parser.add_argument("--history", type=int, default=10, help="Intentos por llamada a build_attempts.")
+        parser.add_argument("--seconds", type=float, default=1.0, help="Tiempo mínimo de medición por función.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--golden-only", action="store_true", help="Solo comprueba el corpus dorado.")
+        parser.add_argument("--skip-golden", action="store_true", help="No comprueba el corpus dorado.")
+        parser.add_argument("--regenerate-golden", action="store_true",
+                            help="Reescribe el corpus con la implementación actual (solo si el cambio de reglas es intencionado).")
+
+    def handle(self, *args, **options):
+        if options["regenerate_golden"]:
+            corpus = generate_corpus(seed=options["seed"])
+            save_corpus(corpus)
+            self.stdout.write(self.style.WARNING(f"📝 Corpus dorado regenerado: {len(corpus['cases'])} casos."))
+            return
+
+        if not options["skip_golden"]:
+            self.check_golden()
+        if options["golden_only"]:
+            return
+
+        for name in ("items", "attributes", "history"):
+            if options[name] <= 0:
+                raise CommandError(f"--{name} debe ser mayor que cero.")
+
+        spec = SyntheticSpec(
+            items=options["items"],
+            attributes=options["attributes"],
+            numeric_ratio=options["numeric_ratio"],
+            grouped_ratio=options["grouped_ratio"],
+            list_ratio=options["list_ratio"],
+            normalized=not options["raw"],
+            seed=options["seed"],
+        )
+        synthetic = make_game(spec)
+        self.stdout.write(f"🎲 Juego sintético: {spec}")
+
+        game, items = synthetic.game, synthetic.items
+        history = items[:options["history"]]
+        targets = items[-min(len(items), 64):]
+        numbers = [parse_to_float(v) for v in synthetic.numeric_values] or [None]
+        pairs = list(zip(numbers, reversed(numbers)))
+
+        cases = [
+            ("build_attempts", len(targets), lambda: [build_attempts(game, history, t) for t in targets]),
+            ("parse_to_float", len(synthetic.numeric_values), lambda: [parse_to_float(v) for v in synthetic.numeric_values]),
+            ("numeric_feedback", len(pairs), lambda: [numeric_feedback(g, t) for g, t in pairs]),
+            ("to_list", len(synthetic.multi_values), lambda: [to_list(v) for v in synthetic.multi_values]),
+        ]
+
+        self.stdout.write(f"{'función':<18}{'ops/s':>14}{'µs/op':>10}{'KiB pico':>11}{'bloques/op':>12}")
+        for name, ops_per_round, fn in cases:
+            if not ops_per_round:
+                continue
+            ops_per_sec, peak, blocks = self.measure(fn, ops_per_round, options["seconds"])
+            self.stdout.write(
+                f"{name:<18}{ops_per_sec:>14,.0f}{1e6 / ops_per_sec:>10.2f}{peak / 1024:>11.1f}{blocks:>12.1f}"
+            )
+
+    def check_golden(self):
+        corpus = load_corpus()
+        mismatches = check_corpus(corpus)
+        if mismatches:
+            first = mismatches[0]
+            raise CommandError(
+                f"❌ El corpus dorado no coincide en {len(mismatches)} partidas. "
+                f"Primer caso ({first['case']}):\n  esperado: {first['expected']}\n  obtenido: {first['actual']}"
+            )
+        runs = sum(len(case["runs"]) for case in corpus["cases"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Corpus dorado: {runs} partidas de {len(corpus['cases'])} juegos idénticas."))
+
+    @staticmethod
+    def measure(fn, ops_per_round, seconds):
+        fn()  # calentamiento (planes compilados, cachés)
+
+        rounds, started = 0, time.perf_counter()
+        while True:
+            fn()
+            rounds += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= seconds:
+                break
+        ops_per_sec = rounds * ops_per_round / elapsed
+
+        # Memoria en una pasada aparte: tracemalloc ralentiza mucho la medición de tiempo
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        result = fn()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+
+        blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+        return ops_per_sec, peak, blocks / ops_per_round
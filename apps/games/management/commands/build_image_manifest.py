@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games.models import Game
+from apps.games.services.catalog.images import image_dir, refresh_manifest
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el manifiesto de imágenes de ítems (game_item_images/<slug>/manifest.json):\n"
+        "  • Lee las imágenes desde el storage configurado y calcula el hash de su contenido.\n"
+        "  • Útil si las imágenes se han subido sin pasar por el ZIP del admin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--game", action="append", dest="slugs", default=[],
+                            help="Slug del juego (se puede repetir). Por defecto, todos.")
+
+    def handle(self, *args, **options):
+        games = Game.objects.all().order_by("name")
+        if options["slugs"]:
+            games = games.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - set(games.values_list("slug", flat=True))
+            if missing:
+                raise CommandError(f"Juegos no encontrados: {', '.join(sorted(missing))}")
+
+        total = 0
+        for game in games:
+            manifest_hash, count = refresh_manifest(game)
+            total += count
+            self.stdout.write(f"🖼️ {game.name}: {count} imágenes en {image_dir(game)}/ (manifiesto {manifest_hash}).")
+
+        self.stdout.write(self.style.SUCCESS(f"Total de imágenes en manifiestos: {total}"))
@@ -2,25 +2,32 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta, date
 from apps.games.models import Game, DailyTarget, GameItem
+from apps.games.services.difficulty.sampler import DifficultySampler
 import secrets
 
 class Command(BaseCommand):
-    help = "Genera los DailyTarget para todos los días del año (normal + equipo) para todos los juegos activos."
+    help = (
+        "Genera los DailyTarget para todos los días del año (normal + equipo) para todos los juegos activos.\n"
+        "  • --mode random: sorteo uniforme entre los ítems (por defecto).\n"
+        "  • --mode difficulty: sorteo ponderado por ItemDifficulty según settings.DAILY_TARGET_DIFFICULTY."
+    )
 
-    def create_target_for_date(self, game, date, is_team):
-        exists = DailyTarget.objects.filter(game=game, date=date, is_team=is_team).exists()
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=["random", "difficulty"], default="random",
+                            help="Cómo se elige el objetivo de cada día.")
+
+    def create_target_for_date(self, game, date, is_team, pick, existing):
         tipo = "Equipo" if is_team else "Normal"
 
-        if exists:
+        if date in existing:
             self.stdout.write(f"✔️ Ya existe target ({tipo}) para {game.name} ({date})")
             return False
 
-        items = list(GameItem.objects.filter(game=game, deleted=False))
-        if not items:
+        item = pick()
+        if item is None:
             self.stdout.write(f"⚠️ {game.name} no tiene ítems para generar target ({tipo}) ({date})")
             return False
 
-        item = secrets.choice(items)
         DailyTarget.objects.create(
             game=game,
             date=date,
@@ -30,16 +37,33 @@ class Command(BaseCommand):
         self.stdout.write(f"🆕 Target creado ({tipo}) para {game.name} ({date}) → {item.name}")
         return True
 
+    def build_picker(self, game, is_team, mode, items):
+        """Devuelve una función sin argumentos que sortea el objetivo de un día."""
+        if mode == "difficulty":
+            sampler = DifficultySampler(game, is_team)
+            return (lambda: sampler.draw()) if sampler else (lambda: None)
+        return lambda: secrets.choice(items) if items else None
+
     def handle(self, *args, **options):
         today = timezone.localtime().date()
         end_of_year = date(today.year, 12, 31)
         total_created = 0
 
         for game in Game.objects.filter(active=True):
+            # Los ítems y los días ya generados se cargan una vez por juego, no por día
+            items = list(GameItem.objects.filter(game=game, deleted=False)) if options["mode"] == "random" else None
+
             for is_team in [False, True]:
+                pick = self.build_picker(game, is_team, options["mode"], items)
+                existing = set(
+                    DailyTarget.objects
+                    .filter(game=game, is_team=is_team, date__gte=today, date__lte=end_of_year)
+                    .values_list("date", flat=True)
+                )
+
                 current_day = today
                 while current_day <= end_of_year:
-                    if self.create_target_for_date(game, current_day, is_team):
+                    if self.create_target_for_date(game, current_day, is_team, pick, existing):
                         total_created += 1
                     current_day += timedelta(days=1)
 
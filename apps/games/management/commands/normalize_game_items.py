@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games.models import Game
+from apps.games.services.catalog.projections import normalize_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenera por lotes la proyección normalizada (GameItem.normalized) de los ítems:\n"
+        "  • defaults aplicados, números ya parseados y valores multi-valor en minúsculas.\n"
+        "  • Solo reescribe los ítems cuya proyección no corresponde a la configuración actual del juego."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--game", action="append", dest="slugs", default=[],
+                            help="Slug del juego (se puede repetir). Por defecto, todos.")
+        parser.add_argument("--chunk-size", type=int, default=500,
+                            help="Ítems leídos y guardados por lote (500 por defecto).")
+        parser.add_argument("--force", action="store_true",
+                            help="Reescribe todas las proyecciones aunque estén al día.")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size debe ser mayor que cero.")
+
+        games = Game.objects.all().order_by("name")
+        if options["slugs"]:
+            games = games.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - set(games.values_list("slug", flat=True))
+            if missing:
+                raise CommandError(f"Juegos no encontrados: {', '.join(sorted(missing))}")
+
+        total = 0
+        for game in games:
+            updated = normalize_items(game, chunk_size, options["force"])
+            total += updated
+            self.stdout.write(f"🧮 {game.name}: {updated} ítems normalizados.")
+
+        self.stdout.write(self.style.SUCCESS(f"Total de ítems normalizados: {total}"))
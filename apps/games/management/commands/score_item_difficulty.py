@@ -0,0 +1,61 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.games.models import Game
+from apps.games.services.difficulty.scorer import DifficultyScorer
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula la dificultad de cada ítem como objetivo simulando un solver de máxima información:\n"
+        "  • Para una muestra de aperturas recorre el árbol de decisión completo del solver.\n"
+        "  • Guarda por ítem los intentos esperados (media) y el peor caso (ItemDifficulty).\n"
+        "  • Las aperturas se reparten entre varios procesos (--workers).\n"
+        "  • Siempre puntúa el juego entero: un ítem nuevo cambia la dificultad de los demás."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--game", action="append", dest="slugs", default=[],
+                            help="Slug del juego (se puede repetir). Por defecto, todos.")
+        parser.add_argument("--openers", type=int, default=DifficultyScorer.DEFAULT_OPENERS,
+                            help=f"Aperturas simuladas por juego ({DifficultyScorer.DEFAULT_OPENERS} por defecto).")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Procesos en paralelo (por defecto, uno por CPU).")
+        parser.add_argument("--max-guesses", type=int, default=30,
+                            help="Tope de intentos por partida simulada (30 por defecto).")
+        parser.add_argument("--stale", action="store_true",
+                            help="Solo los juegos con la dificultad desfasada (ítems nuevos o catálogo cambiado).")
+
+    def handle(self, *args, **options):
+        if options["openers"] <= 0 or options["workers"] <= 0 or options["max_guesses"] <= 1:
+            raise CommandError("--openers y --workers deben ser mayores que cero y --max-guesses mayor que uno.")
+
+        games = Game.objects.all().order_by("name")
+        if options["slugs"]:
+            games = games.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - set(games.values_list("slug", flat=True))
+            if missing:
+                raise CommandError(f"Juegos no encontrados: {', '.join(sorted(missing))}")
+
+        total = 0
+        for game in games:
+            scorer = DifficultyScorer(
+                game,
+                openers=options["openers"],
+                workers=options["workers"],
+                max_guesses=options["max_guesses"],
+            )
+            if options["stale"] and not scorer.is_stale():
+                self.stdout.write(f"⏭️  {game.name}: la dificultad está al día.")
+                continue
+
+            started = time.perf_counter()
+            scored = scorer.score()
+            total += scored
+            self.stdout.write(
+                f"🧠 {game.name}: {scored} ítems puntuados en {time.perf_counter() - started:.1f}s."
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Total de ítems puntuados: {total}"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0030_game_grouped_attributes_delete_gameresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameattempt',
+            name='feedback',
+            field=models.TextField(blank=True, default='', help_text='Feedback codificado al guardar el intento (huella del plan + un código por atributo)'),
+        ),
+    ]
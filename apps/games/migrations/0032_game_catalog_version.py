@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0031_gameattempt_feedback'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='catalog_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Se incrementa cada vez que cambian los ítems del juego (sync, soft delete...)'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0032_game_catalog_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameitem',
+            name='normalized',
+            field=models.JSONField(blank=True, default=dict, help_text="Proyección normalizada de 'data' (defaults aplicados, números parseados, valores en minúsculas)"),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0033_gameitem_normalized'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemDifficulty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expected_guesses', models.FloatField(help_text='Intentos medios del solver para acertar este ítem')),
+                ('worst_guesses', models.PositiveIntegerField(help_text='Peor caso de intentos entre las aperturas simuladas')),
+                ('openers', models.PositiveIntegerField(default=0, help_text='Aperturas simuladas')),
+                ('catalog_version', models.PositiveIntegerField(default=0, help_text='Game.catalog_version usado en el cálculo')),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='difficulty', to='games.gameitem')),
+            ],
+            options={
+                'verbose_name_plural': 'item difficulties',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0034_itemdifficulty'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='image_manifest_hash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Hash del manifiesto de imágenes de ítems (game_item_images/<slug>/manifest.json)', max_length=40),
+        ),
+    ]
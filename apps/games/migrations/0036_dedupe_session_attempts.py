@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def forwards(apps, schema_editor):
+    """
+    Deja un solo intento por (sesión, ítem) — el primero — antes de crear
+    la restricción única.  Los duplicados vienen de dobles envíos.
+    """
+    GameAttempt = apps.get_model('games', 'GameAttempt')
+
+    duplicated = (
+        GameAttempt.objects
+        .filter(session__isnull=False)
+        .values('session_id', 'guess_id')
+        .annotate(first_id=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    for row in duplicated.iterator(chunk_size=1000):
+        (
+            GameAttempt.objects
+            .filter(session_id=row['session_id'], guess_id=row['guess_id'])
+            .exclude(id=row['first_id'])
+            .delete()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0035_game_image_manifest_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0036_dedupe_session_attempts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gameattempt',
+            index=models.Index(fields=['session', 'attempted_at'], name='games_gamea_session_9c6855_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='gameattempt',
+            constraint=models.UniqueConstraint(fields=('session', 'guess'), name='unique_attempt_per_session'),
+        ),
+    ]
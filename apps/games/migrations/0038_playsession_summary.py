@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0037_gameattempt_games_gamea_session_9c6855_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playsession',
+            name='attempt_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='playsession',
+            name='first_guess',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='games.gameitem'),
+        ),
+        migrations.AddField(
+            model_name='playsession',
+            name='solved',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='playsession',
+            name='solved_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+def forwards(apps, schema_editor):
+    """
+    Primer llenado del resumen de las sesiones desde sus intentos, por
+    tramos de sesiones (lo mismo que ``backfill_play_sessions``).
+    """
+    PlaySession = apps.get_model('games', 'PlaySession')
+    GameAttempt = apps.get_model('games', 'GameAttempt')
+    fields = ['attempt_count', 'solved', 'solved_at', 'first_guess']
+
+    last_pk = 0
+    while True:
+        chunk = list(PlaySession.objects.filter(pk__gt=last_pk).order_by('pk').only('pk')[:1000])
+        if not chunk:
+            break
+        # Se parte de cero sin leer los campos diferidos (si no, una consulta por campo y sesión)
+        by_pk = {}
+        for session in chunk:
+            session.attempt_count, session.solved = 0, False
+            session.solved_at = session.first_guess_id = None
+            by_pk[session.pk] = session
+        attempts = (
+            GameAttempt.objects
+            .filter(session_id__in=by_pk)
+            .order_by('session_id', 'attempted_at', 'id')
+            .values_list('session_id', 'guess_id', 'is_correct', 'attempted_at')
+        )
+        for session_id, guess_id, is_correct, attempted_at in attempts:
+            session = by_pk[session_id]
+            if not session.attempt_count:
+                session.first_guess_id = guess_id
+            session.attempt_count += 1
+            if is_correct and not session.solved:
+                session.solved, session.solved_at = True, attempted_at
+        PlaySession.objects.bulk_update(chunk, fields, batch_size=1000)
+        last_pk = chunk[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0038_playsession_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
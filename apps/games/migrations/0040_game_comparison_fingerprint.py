@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:41
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+
+def forwards(apps, schema_editor):
+    """Huella de los juegos existentes (lo mismo que ``comparison.plan_fingerprint``)."""
+    Game = apps.get_model('games', 'Game')
+    for game in Game.objects.all():
+        payload = json.dumps(
+            [game.attributes or [], game.numeric_fields or [], game.grouped_attributes or [], game.defaults or {}],
+            sort_keys=True,
+            default=str,
+        )
+        game.comparison_fingerprint = hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+        game.save(update_fields=['comparison_fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0039_backfill_playsession_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='comparison_fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Huella de attributes/numeric_fields/grouped_attributes/defaults (ver comparison.plan_fingerprint)', max_length=16),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0040_game_comparison_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gameitem',
+            name='normalized',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text="Proyección normalizada de 'data' (defaults aplicados, números parseados, valores en minúsculas)"),
+        ),
+    ]
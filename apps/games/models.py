@@ -2,12 +2,12 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import time, timedelta
 from django.db.models import JSONField
-from django.conf import settings
 from django.db import models
-import os
 from colorfield.fields import ColorField
 from django.core.exceptions import ValidationError
 
+from apps.games.comparison import get_plan, plan_fingerprint
+
 
 def game_json_file_path(instance, filename):
     # file will be uploaded to MEDIA_ROOT/json_files/<game_slug>/<filename>
@@ -32,12 +32,41 @@ class Game(models.Model):
     grouped_attributes = models.JSONField(default=list, help_text='Grupos de atributos a comparar conjuntamente (ej: [["tipo_1", "tipo_2"]])')
 
     active = models.BooleanField(default=True)
+    catalog_version = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Se incrementa cada vez que cambian los ítems del juego (sync, soft delete...)"
+    )
+    image_manifest_hash = models.CharField(
+        max_length=40, blank=True, default="", editable=False,
+        help_text="Hash del manifiesto de imágenes de ítems (game_item_images/<slug>/manifest.json)"
+    )
+    comparison_fingerprint = models.CharField(
+        max_length=16, blank=True, default="", editable=False,
+        help_text="Huella de attributes/numeric_fields/grouped_attributes/defaults (ver comparison.plan_fingerprint)"
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # La huella se calcula al guardar: get_plan la compara sin serializar nada
+        self.comparison_fingerprint = plan_fingerprint(self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "comparison_fingerprint"}
+        super().save(*args, **kwargs)
+
+    def bump_catalog_version(self):
+        """Invalida las cachés por proceso que dependen de los ítems del juego."""
+        Game.objects.filter(pk=self.pk).update(catalog_version=models.F("catalog_version") + 1)
+        self.refresh_from_db(fields=["catalog_version"])
+
+    @classmethod
+    def bump_catalog_versions(cls, game_ids):
+        return cls.objects.filter(pk__in=game_ids).update(catalog_version=models.F("catalog_version") + 1)
+
     def clean(self):
         super().clean()
         if self.data_source_url and self.json_file:
@@ -54,6 +83,10 @@ class GameItem(models.Model):
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='items')
     name = models.CharField(max_length=255)
     data = models.JSONField(default=dict, help_text="Diccionario de atributos del ítem")
+    normalized = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Proyección normalizada de 'data' (defaults aplicados, números parseados, valores en minúsculas)"
+    )
     deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -64,6 +97,15 @@ class GameItem(models.Model):
     def __str__(self):
         return f"{self.name} ({self.game.slug})"
 
+    def save(self, *args, **kwargs):
+        # La proyección sale siempre de 'data': editar un ítem no deja feedback viejo
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "data" in update_fields:
+            self.normalized = get_plan(self.game).project(self.data)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "normalized"}
+        super().save(*args, **kwargs)
+
     def get_image_filename(self):
         # Ahora que sync_game_data asegura que el 'id' original está en self.data['id'],
         # podemos buscarlo directamente.
@@ -78,22 +120,33 @@ class GameItem(models.Model):
         
         return f"{str(image_identifier)}.png"
 
-    def get_image_url(self):
-        filename = self.get_image_filename()
+    def get_image_url(self, game=None):
+        # El manifiesto de imágenes del juego evita tocar el storage en cada render.
+        # En bucles pasa ``game``: leer ``self.game`` es una consulta por ítem.
+        from apps.games.services.catalog.images import image_url
 
-        if not filename:
+        if not self.get_image_filename():
             return None
+        return image_url(game or self.game, self.data.get('id'))
 
-        path_parts = ['game_item_images', self.game.slug, filename]
-        disk_path = os.path.join(settings.MEDIA_ROOT, *path_parts)
 
-        if os.path.exists(disk_path):
-            base_url = settings.MEDIA_URL
-            if not base_url.endswith('/'):
-                base_url += '/'
-            return base_url + "/".join(path_parts)
-        
-        return None
+class ItemDifficulty(models.Model):
+    """
+    Dificultad de un ítem como objetivo, según un solver que maximiza la
+    información de cada intento (ver el comando score_item_difficulty).
+    """
+    item = models.OneToOneField(GameItem, on_delete=models.CASCADE, related_name='difficulty')
+    expected_guesses = models.FloatField(help_text="Intentos medios del solver para acertar este ítem")
+    worst_guesses = models.PositiveIntegerField(help_text="Peor caso de intentos entre las aperturas simuladas")
+    openers = models.PositiveIntegerField(default=0, help_text="Aperturas simuladas")
+    catalog_version = models.PositiveIntegerField(default=0, help_text="Game.catalog_version usado en el cálculo")
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "item difficulties"
+
+    def __str__(self):
+        return f"{self.item.name}: {self.expected_guesses:.2f} (peor {self.worst_guesses})"
 
 
 class DailyTarget(models.Model):
@@ -134,9 +187,21 @@ class GameAttempt(models.Model):
         null=True, blank=True,
         related_name='attempts'
     )
+    feedback = models.TextField(
+        blank=True, default="",
+        help_text="Feedback codificado al guardar el intento (huella del plan + un código por atributo)"
+    )
 
     class Meta:
         ordering = ['attempted_at']
+        constraints = [
+            # Un ítem solo se puede intentar una vez por sesión: el INSERT es
+            # la comprobación de duplicados (ver GuessPipeline)
+            models.UniqueConstraint(fields=['session', 'guess'], name='unique_attempt_per_session'),
+        ]
+        indexes = [
+            models.Index(fields=['session', 'attempted_at']),
+        ]
 
 
 class ExtraDailyPlay(models.Model):
@@ -166,6 +231,13 @@ class PlaySession(models.Model):
     reference_id = models.PositiveIntegerField(null=True, blank=True, help_text="PK de DailyTarget / ExtraDailyPlay / Challenge")
     completed_at = models.DateTimeField(auto_now_add=True)
 
+    # Resumen de sus intentos, mantenido por GuessPipeline (y
+    # ``backfill_play_sessions``): las estadísticas no cuentan GameAttempt
+    attempt_count = models.PositiveIntegerField(default=0)
+    solved        = models.BooleanField(default=False)
+    solved_at     = models.DateTimeField(null=True, blank=True)
+    first_guess   = models.ForeignKey('games.GameItem', null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+
     class Meta:
         unique_together = ('user', 'game', 'session_type', 'reference_id')
         indexes = [
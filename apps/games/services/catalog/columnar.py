@@ -0,0 +1,238 @@
+# apps/games/services/catalog/columnar.py
+"""
+Motor columnar del catálogo de ítems de un juego.
+
+Los ``GameItem`` no eliminados se cargan una vez en arrays NumPy:
+- índice denso ``0..n-1`` (orden por pk),
+- una columna ``float64`` por atributo numérico (NaN = no numérico),
+- una matriz de bitsets ``uint64`` por atributo multi-valor, sobre un
+  vocabulario interno en minúsculas (compartido por los atributos de un
+  mismo grupo para poder calcular la coincidencia cruzada).
+
+Con eso el feedback de un intento contra un objetivo, o contra todos los
+ítems a la vez, es un puñado de operaciones vectorizadas.  Los códigos que
+devuelve son los mismos ``FLAG_*`` que se guardan en ``GameAttempt``.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from apps.common.metrics import observe_cache
+from apps.games.comparison import (
+    FLAG_CORRECT,
+    FLAG_HIGHER,
+    FLAG_LOWER,
+    FLAG_PARTIAL,
+    FLAG_UNKNOWN,
+    MULTI,
+    NUMERIC,
+    ComparisonPlan,
+    ItemSide,
+    get_plan,
+)
+
+__all__ = ["NumericColumn", "MultiColumn", "ColumnarCatalog", "get_catalog"]
+
+
+# ──────────────────────────── Columnas ───────────────────────────
+class NumericColumn:
+    __slots__ = ("values",)
+    kind = NUMERIC
+
+    def __init__(self, values: np.ndarray):
+        self.values = values                      # float64[n]
+
+    def codes(self, g: int, t) -> np.ndarray:
+        gv = self.values[g]
+        tv = self.values[t]
+        t_nan = np.isnan(tv)
+        if np.isnan(gv):
+            return np.where(t_nan, FLAG_CORRECT, FLAG_UNKNOWN).astype(np.uint8)
+        with np.errstate(invalid="ignore"):
+            out = np.where(tv > gv, FLAG_HIGHER, FLAG_LOWER)
+            out = np.where(tv == gv, FLAG_CORRECT, out)
+        return np.where(t_nan, FLAG_UNKNOWN, out).astype(np.uint8)
+
+
+class MultiColumn:
+    """
+    ``bits[i]`` es el conjunto de valores del ítem i; ``empty[i]`` vale -1 si
+    el conjunto no está vacío o el código del valor crudo (None, "", []...)
+    cuando lo está, ya que entonces la regla es comparar el valor crudo.
+    ``group_bits`` (opcional) es la unión de valores del grupo del atributo.
+    """
+    __slots__ = ("bits", "empty", "group_bits", "vocabulary")
+    kind = MULTI
+
+    def __init__(self, bits, empty, group_bits, vocabulary):
+        self.bits = bits                          # uint64[n, words]
+        self.empty = empty                        # int32[n]
+        self.group_bits = group_bits              # uint64[n, words] | None
+        self.vocabulary = vocabulary              # Dict[str, int]
+
+    def codes(self, g: int, t) -> np.ndarray:
+        g_bits = self.bits[g]
+        g_empty = self.empty[g]
+        t_empty = self.empty[t]
+
+        if g_empty >= 0:
+            match = t_empty == g_empty
+        else:
+            match = (t_empty < 0) & np.all(self.bits[t] == g_bits, axis=-1)
+
+        # Un conjunto vacío no tiene bits: la intersección ya sale falsa
+        pool = self.group_bits if self.group_bits is not None else self.bits
+        overlap = np.any((pool[t] & g_bits) != 0, axis=-1)
+
+        out = np.where(match, FLAG_CORRECT, np.where(overlap, FLAG_PARTIAL, 0))
+        return out.astype(np.uint8)
+
+
+# ──────────────────────────── Construcción ───────────────────────
+def _bitset(rows: List[Sequence[int]], width: int) -> np.ndarray:
+    words = max(1, (width + 63) // 64)
+    bits = np.zeros((len(rows), words), dtype=np.uint64)
+    r_idx = [i for i, ids in enumerate(rows) for _ in ids]
+    v_idx = np.fromiter((v for ids in rows for v in ids), dtype=np.int64, count=len(r_idx))
+    if len(r_idx):
+        masks = np.left_shift(np.uint64(1), (v_idx & 63).astype(np.uint64))
+        np.bitwise_or.at(bits, (np.asarray(r_idx), v_idx >> 6), masks)
+    return bits
+
+
+def _intern(vocabulary: Dict[str, int], values) -> List[int]:
+    return [vocabulary.setdefault(v, len(vocabulary)) for v in values]
+
+
+class ColumnarCatalog:
+    """Catálogo columnar (inmutable) de los ítems activos de un juego."""
+
+    def __init__(self, plan: ComparisonPlan, item_ids: Sequence[int],
+                 names: Sequence[str], sides: Sequence[ItemSide], version: int = 0):
+        self.plan = plan
+        self.version = version
+        self.item_ids = np.asarray(item_ids, dtype=np.int64)
+        self.names: Tuple[str, ...] = tuple(names)
+        self.index: Dict[int, int] = {int(pk): i for i, pk in enumerate(self.item_ids)}
+        self.size = len(self.item_ids)
+
+        vocabularies: Dict[object, Dict[str, int]] = {}
+        empty_codes: Dict[str, int] = {}
+        columns = []
+        for j, rule in enumerate(plan.rules):
+            if rule.kind == NUMERIC:
+                values = np.array(
+                    [np.nan if s.keys[j] is None else s.keys[j] for s in sides],
+                    dtype=np.float64,
+                )
+                columns.append(NumericColumn(values))
+                continue
+
+            vocab_key = ("group", rule.group) if rule.group is not None else ("attr", rule.name)
+            vocabulary = vocabularies.setdefault(vocab_key, {})
+            rows = [_intern(vocabulary, sorted(s.keys[j])) for s in sides]
+            group_rows = (
+                [_intern(vocabulary, sorted(s.groups[rule.group])) for s in sides]
+                if rule.group is not None else None
+            )
+            empty = np.array(
+                [
+                    -1 if s.keys[j] else empty_codes.setdefault(
+                        json.dumps(s.values[j], sort_keys=True, default=str), len(empty_codes)
+                    )
+                    for s in sides
+                ],
+                dtype=np.int32,
+            )
+            columns.append((rows, group_rows, empty, vocabulary))
+
+        # Los bitsets se crean al final: el vocabulario de un grupo es
+        # compartido y debe estar completo antes de fijar su anchura.
+        self.columns = tuple(
+            col if isinstance(col, NumericColumn) else MultiColumn(
+                bits=_bitset(col[0], len(col[3])),
+                empty=col[2],
+                group_bits=_bitset(col[1], len(col[3])) if col[1] is not None else None,
+                vocabulary=col[3],
+            )
+            for col in columns
+        )
+
+    # ---------- Consultas ----------
+    def position(self, item_id: int) -> Optional[int]:
+        return self.index.get(int(item_id))
+
+    def feedback_codes(self, guess: int, targets=None) -> np.ndarray:
+        """
+        Códigos ``FLAG_*`` del intento ``guess`` (índice denso) contra
+        ``targets`` (índices densos; todos los ítems si es None).
+        Devuelve ``uint8[len(targets), n_atributos]``.
+        """
+        t = slice(None) if targets is None else np.asarray(targets, dtype=np.int64)
+        n = self.size if targets is None else len(t)
+        out = np.empty((n, len(self.columns)), dtype=np.uint8)
+        for j, column in enumerate(self.columns):
+            out[:, j] = column.codes(guess, t)
+        return out
+
+    def feedback_pair(self, guess: int, target: int) -> np.ndarray:
+        """Códigos de un intento contra un único objetivo."""
+        return self.feedback_codes(guess, [target])[0]
+
+    def encode_pair(self, guess: int, target: int) -> str:
+        """Forma compacta, idéntica a la guardada en ``GameAttempt.feedback``."""
+        return self.plan.encode_flags(self.feedback_pair(guess, target))
+
+
+# ──────────────────────────── Caché ──────────────────────────────
+_CATALOGS: Dict[int, ColumnarCatalog] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def _load(game, plan: ComparisonPlan) -> ColumnarCatalog:
+    items = list(
+        game.items
+        .filter(deleted=False)
+        .order_by("pk")
+        .only("id", "name", "data", "normalized")
+    )
+    return ColumnarCatalog(
+        plan,
+        item_ids=[item.pk for item in items],
+        names=[item.name for item in items],
+        sides=[plan.side(item) for item in items],
+        version=game.catalog_version,
+    )
+
+
+def get_catalog(game) -> ColumnarCatalog:
+    """
+    Catálogo columnar del juego, construido la primera vez que se pide y
+    reconstruido cuando cambia ``game.catalog_version`` (sync del admin,
+    soft delete) o la configuración de comparación.
+    """
+    plan = get_plan(game)
+    catalog = _CATALOGS.get(game.pk)
+    if (
+        catalog is not None
+        and catalog.version == game.catalog_version
+        and catalog.plan.fingerprint == plan.fingerprint
+    ):
+        observe_cache("columnar_catalog", True)
+        return catalog
+
+    observe_cache("columnar_catalog", False)
+    with _CATALOGS_LOCK:
+        catalog = _CATALOGS.get(game.pk)
+        if (
+            catalog is None
+            or catalog.version != game.catalog_version
+            or catalog.plan.fingerprint != plan.fingerprint
+        ):
+            catalog = _load(game, plan)
+            _CATALOGS[game.pk] = catalog
+    return catalog
@@ -0,0 +1,135 @@
+# apps/games/services/catalog/hints.py
+"""
+Índice de pistas: qué ítems siguen siendo compatibles con todas las pistas
+de una sesión.
+
+Sobre el ``ColumnarCatalog`` de un juego se mantienen bitmaps invertidos
+empaquetados (``np.packbits``, un bit por ítem del índice denso):
+- por atributo multi-valor y valor del vocabulario → ítems que lo contienen
+  (en su grupo, si el atributo está agrupado, para la coincidencia cruzada),
+- por atributo y firma de conjunto → ítems con exactamente ese conjunto.
+
+Cada pista (intento, atributo, código) se traduce en un bitmap y el
+resultado es el AND de todos ellos.  Los bitmaps se crean bajo demanda y
+se memorizan mientras el catálogo siga vigente.  Los atributos numéricos
+se resuelven con una comparación vectorizada sobre su columna.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from apps.common.metrics import observe_cache
+from apps.games.comparison import FLAG_CORRECT, FLAG_PARTIAL, NUMERIC
+from .columnar import ColumnarCatalog, get_catalog
+
+__all__ = ["HintIndex", "get_hint_index"]
+
+
+class HintIndex:
+    """Bitmaps invertidos sobre los ítems de un ``ColumnarCatalog``."""
+
+    def __init__(self, catalog: ColumnarCatalog):
+        self.catalog = catalog
+        self.all = np.packbits(np.ones(catalog.size, dtype=bool))
+        self._value_bitmaps: Dict[Tuple[int, int], np.ndarray] = {}
+        self._exact_bitmaps: Dict[Tuple[int, int], np.ndarray] = {}
+        self._signatures: Dict[int, np.ndarray] = {}
+
+    # ---------- Bitmaps base ----------
+    def _pack(self, mask: np.ndarray) -> np.ndarray:
+        return np.packbits(mask)
+
+    def _signature(self, j: int) -> np.ndarray:
+        """Id de «conjunto exacto» por ítem (incluye el valor crudo si está vacío)."""
+        sig = self._signatures.get(j)
+        if sig is None:
+            column = self.catalog.columns[j]
+            rows = np.ascontiguousarray(
+                np.column_stack([column.bits, column.empty.astype(np.int64).view(np.uint64)])
+            )
+            # Cada fila como un único escalar opaco: np.unique 1-D es mucho más rápido
+            packed = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+            _, sig = np.unique(packed, return_inverse=True)
+            sig = sig.reshape(-1)
+            self._signatures[j] = sig
+        return sig
+
+    def exact_bitmap(self, j: int, guess: int) -> np.ndarray:
+        sig = self._signature(j)
+        key = (j, int(sig[guess]))
+        bitmap = self._exact_bitmaps.get(key)
+        if bitmap is None:
+            bitmap = self._exact_bitmaps[key] = self._pack(sig == sig[guess])
+        return bitmap
+
+    def value_bitmap(self, j: int, value_id: int) -> np.ndarray:
+        key = (j, value_id)
+        bitmap = self._value_bitmaps.get(key)
+        if bitmap is None:
+            column = self.catalog.columns[j]
+            pool = column.group_bits if column.group_bits is not None else column.bits
+            word, bit = divmod(value_id, 64)
+            mask = (pool[:, word] >> np.uint64(bit)) & np.uint64(1)
+            bitmap = self._value_bitmaps[key] = self._pack(mask.astype(bool))
+        return bitmap
+
+    def _value_ids(self, j: int, guess: int) -> np.ndarray:
+        row = self.catalog.columns[j].bits[guess]
+        return np.flatnonzero(np.unpackbits(row.view(np.uint8), bitorder="little"))
+
+    # ---------- Pistas ----------
+    def clue_bitmap(self, guess: int, j: int, flags: int) -> np.ndarray:
+        """Ítems ``t`` tales que el feedback de ``guess`` contra ``t`` en el atributo j es ``flags``."""
+        column = self.catalog.columns[j]
+        if column.kind == NUMERIC:
+            return self._pack(column.codes(guess, slice(None)) == flags)
+
+        match = self.exact_bitmap(j, guess)
+        if flags & FLAG_CORRECT:
+            return match
+
+        overlap = np.zeros_like(self.all)
+        for value_id in self._value_ids(j, guess):
+            overlap |= self.value_bitmap(j, int(value_id))
+
+        if flags & FLAG_PARTIAL:
+            return overlap & ~match
+        return self.all & ~(overlap | match)
+
+    def candidates(self, clues: Iterable[Tuple[int, Sequence[int]]],
+                   exclude: Iterable[int] = ()) -> np.ndarray:
+        """
+        Índices densos compatibles con todas las pistas.
+        ``clues`` son pares (índice denso del intento, códigos por atributo).
+        """
+        bitmap = self.all.copy()
+        for guess, codes in clues:
+            for j, flags in enumerate(codes):
+                bitmap &= self.clue_bitmap(guess, j, int(flags))
+        positions = np.flatnonzero(np.unpackbits(bitmap, count=self.catalog.size))
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        if excluded.size:
+            positions = np.setdiff1d(positions, excluded, assume_unique=True)
+        return positions
+
+
+# ──────────────────────────── Caché ──────────────────────────────
+_INDEXES: Dict[int, HintIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_hint_index(game) -> HintIndex:
+    """Índice de pistas ligado al catálogo columnar vigente del juego."""
+    catalog = get_catalog(game)
+    index = _INDEXES.get(game.pk)
+    hit = index is not None and index.catalog is catalog
+    observe_cache("hint_index", hit)
+    if not hit:
+        with _INDEXES_LOCK:
+            index = _INDEXES.get(game.pk)
+            if index is None or index.catalog is not catalog:
+                index = _INDEXES[game.pk] = HintIndex(catalog)
+    return index
@@ -0,0 +1,174 @@
+# apps/games/services/catalog/images.py
+"""
+Manifiesto de imágenes de ítems por juego.
+
+En vez de comprobar con ``os.path.exists`` cada imagen en cada render, las
+imágenes de ``game_item_images/<slug>/`` se describen en un manifiesto
+(``manifest.json`` en la misma carpeta) que asocia el id del ítem con el
+hash de su contenido.  La URL lleva ese hash (``?v=``), así que se puede
+cachear sin caducidad en el navegador o un CDN.
+
+Todo pasa por ``default_storage``: funciona igual con disco local que con
+un almacenamiento remoto compartido entre varios nodos.  En memoria se
+guarda un manifiesto por juego, invalidado por ``Game.image_manifest_hash``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from apps.common.metrics import observe_cache
+
+__all__ = [
+    "IMAGE_ROOT",
+    "MANIFEST_NAME",
+    "image_dir",
+    "content_hash",
+    "save_image",
+    "build_manifest",
+    "write_manifest",
+    "get_manifest",
+    "image_url",
+    "refresh_manifest",
+    "merge_manifest",
+]
+
+IMAGE_ROOT = "game_item_images"
+MANIFEST_NAME = "manifest.json"
+IMAGE_EXTENSION = ".png"
+
+
+def image_dir(game) -> str:
+    return f"{IMAGE_ROOT}/{game.slug}"
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha1(content).hexdigest()[:12]
+
+
+# ──────────────────────────── Escritura ──────────────────────────
+def save_image(game, filename: str, content: bytes) -> str:
+    """Guarda (sobrescribiendo) una imagen del juego y devuelve su hash."""
+    path = f"{image_dir(game)}/{filename}"
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    default_storage.save(path, ContentFile(content))
+    return content_hash(content)
+
+
+def build_manifest(game) -> Dict[str, str]:
+    """Recorre las imágenes del juego en el storage y calcula sus hashes."""
+    directory = image_dir(game)
+    try:
+        _, files = default_storage.listdir(directory)
+    except (FileNotFoundError, NotImplementedError):
+        return {}
+
+    manifest = {}
+    for filename in files:
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() != IMAGE_EXTENSION:
+            continue
+        with default_storage.open(f"{directory}/{filename}", "rb") as fh:
+            manifest[stem] = content_hash(fh.read())
+    return manifest
+
+
+def write_manifest(game, files: Dict[str, str]) -> str:
+    """
+    Persiste el manifiesto en el storage y su hash en el juego (lo que
+    invalida la copia en memoria de todos los procesos).
+    """
+    payload = json.dumps({"files": files}, sort_keys=True).encode()
+    path = f"{image_dir(game)}/{MANIFEST_NAME}"
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    default_storage.save(path, ContentFile(payload))
+
+    manifest_hash = content_hash(payload)
+    type(game).objects.filter(pk=game.pk).update(image_manifest_hash=manifest_hash)
+    game.image_manifest_hash = manifest_hash
+    return manifest_hash
+
+
+# ──────────────────────────── Lectura ────────────────────────────
+_MANIFESTS: Dict[int, Tuple[str, Dict[str, str]]] = {}
+_MANIFESTS_LOCK = threading.Lock()
+
+
+def _load(game) -> Dict[str, str]:
+    """
+    Ítem → URL.  Sin manifiesto guardado (juegos anteriores a esta versión)
+    se usa un listado del storage, sin hash en la URL.
+    """
+    directory = image_dir(game)
+
+    if game.image_manifest_hash:
+        try:
+            with default_storage.open(f"{directory}/{MANIFEST_NAME}", "rb") as fh:
+                files = json.load(fh).get("files", {})
+            return {
+                stem: f"{default_storage.url(f'{directory}/{stem}{IMAGE_EXTENSION}')}?v={h}"
+                for stem, h in files.items()
+            }
+        except (FileNotFoundError, ValueError):
+            pass
+
+    try:
+        _, listing = default_storage.listdir(directory)
+    except (FileNotFoundError, NotImplementedError):
+        return {}
+    return {
+        stem: default_storage.url(f"{directory}/{filename}")
+        for stem, ext, filename in ((*os.path.splitext(f), f) for f in listing)
+        if ext.lower() == IMAGE_EXTENSION
+    }
+
+
+def get_manifest(game) -> Dict[str, str]:
+    key = game.image_manifest_hash
+    cached = _MANIFESTS.get(game.pk)
+    if cached is not None and cached[0] == key:
+        observe_cache("image_manifest", True)
+        return cached[1]
+
+    observe_cache("image_manifest", False)
+    with _MANIFESTS_LOCK:
+        cached = _MANIFESTS.get(game.pk)
+        if cached is None or cached[0] != key:
+            cached = _MANIFESTS[game.pk] = (key, _load(game))
+    return cached[1]
+
+
+def image_url(game, image_id) -> Optional[str]:
+    if image_id is None:
+        return None
+    return get_manifest(game).get(str(image_id))
+
+
+def refresh_manifest(game) -> Tuple[str, int]:
+    """Reconstruye y guarda el manifiesto. Devuelve (hash, nº de imágenes)."""
+    files = build_manifest(game)
+    return write_manifest(game, files), len(files)
+
+
+def merge_manifest(game, hashes: Iterable[Tuple[str, str]]) -> str:
+    """Añade/actualiza entradas (id, hash) sobre el manifiesto guardado."""
+    files = dict(_stored_files(game))
+    files.update(hashes)
+    return write_manifest(game, files)
+
+
+def _stored_files(game) -> Dict[str, str]:
+    path = f"{image_dir(game)}/{MANIFEST_NAME}"
+    try:
+        with default_storage.open(path, "rb") as fh:
+            return json.load(fh).get("files", {})
+    except (FileNotFoundError, ValueError):
+        return build_manifest(game)
@@ -0,0 +1,161 @@
+# apps/games/services/catalog/name_index.py
+"""
+Índice de nombres por juego para resolver intentos y autocompletar.
+
+Sobre el ``NameCatalog`` vigente (ítems activos, índice denso por pk) se
+construyen, una vez por versión del catálogo:
+- un diccionario clave normalizada → posiciones (minúsculas sin acentos
+  ni espacios repetidos), para resolver el nombre escrito sin consultas,
+- las claves ordenadas, para búsquedas por prefijo con ``bisect``,
+- un índice invertido de trigramas (``np.int32`` por trigrama) para las
+  sugerencias tolerantes a erratas.
+
+La similitud de trigramas es la de Jaccard (como ``pg_trgm``): trigramas
+compartidos / trigramas distintos de ambas cadenas.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from apps.common.metrics import observe_cache
+
+from .names import NameCatalog, aget_name_catalog, get_name_catalog
+
+__all__ = ["fold", "trigrams", "NameIndex", "get_name_index", "aget_name_index"]
+
+
+def fold(text: str) -> str:
+    """Clave de comparación: sin acentos, casefold y espacios normalizados."""
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Búsquedas exactas, por prefijo y aproximadas sobre un ``NameCatalog``."""
+
+    MIN_SIMILARITY = 0.3      # umbral de las sugerencias
+    MATCH_SIMILARITY = 0.5    # umbral para dar por buena una corrección
+
+    def __init__(self, catalog: NameCatalog):
+        self.catalog = catalog
+        self.keys: Tuple[str, ...] = tuple(fold(name) for name in catalog.names)
+
+        self.exact: Dict[str, List[int]] = {}
+        for pos, key in enumerate(self.keys):
+            self.exact.setdefault(key, []).append(pos)
+
+        self._sorted = sorted((key, pos) for pos, key in enumerate(self.keys))
+        self._sorted_keys = [key for key, _ in self._sorted]
+
+        postings: Dict[str, List[int]] = {}
+        sizes = np.zeros(len(self.keys), dtype=np.int32)
+        for pos, key in enumerate(self.keys):
+            grams = trigrams(key)
+            sizes[pos] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(pos)
+        self._postings = {gram: np.asarray(p, dtype=np.int32) for gram, p in postings.items()}
+        self._sizes = sizes
+
+    # ---------- Exacto ----------
+    def resolve(self, text: str) -> Optional[int]:
+        """Posición del nombre escrito (ignorando mayúsculas y acentos)."""
+        positions = self.exact.get(fold(text))
+        if not positions:
+            return None
+        if len(positions) > 1:
+            # Dos nombres que solo difieren en acentos: se prefiere el literal
+            lowered = str(text).strip().lower()
+            for pos in positions:
+                if self.catalog.names[pos].lower() == lowered:
+                    return pos
+        return positions[0]
+
+    # ---------- Prefijo ----------
+    def prefix(self, text: str, limit: int = 10) -> List[int]:
+        key = fold(text)
+        if not key:
+            return []
+        start = bisect.bisect_left(self._sorted_keys, key)
+        out = []
+        for k, pos in self._sorted[start:start + limit]:
+            if not k.startswith(key):
+                break
+            out.append(pos)
+        return out
+
+    # ---------- Trigramas ----------
+    def similar(self, text: str, limit: int = 10,
+                min_similarity: float = MIN_SIMILARITY) -> List[Tuple[int, float]]:
+        """(posición, similitud) de los nombres más parecidos, de mayor a menor."""
+        grams = trigrams(fold(text))
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists or not len(self.keys):
+            return []
+
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+        candidates = np.flatnonzero(shared)
+        score = shared[candidates] / (len(grams) + self._sizes[candidates] - shared[candidates])
+
+        keep = score >= min_similarity
+        candidates, score = candidates[keep], score[keep]
+        if candidates.size > limit:
+            top = np.argpartition(-score, limit - 1)[:limit]
+            candidates, score = candidates[top], score[top]
+        order = np.lexsort((candidates, -score))
+        return [(int(candidates[i]), float(score[i])) for i in order]
+
+    def best_match(self, text: str) -> Optional[int]:
+        """Corrección de erratas: el nombre más parecido si no hay empate."""
+        exact = self.resolve(text)
+        if exact is not None:
+            return exact
+        top = self.similar(text, limit=2, min_similarity=self.MATCH_SIMILARITY)
+        if not top or (len(top) > 1 and top[0][1] == top[1][1]):
+            return None
+        return top[0][0]
+
+    def suggest(self, text: str, limit: int = 10) -> List[int]:
+        """Autocompletado: primero los prefijos, después los parecidos."""
+        out = self.prefix(text, limit)
+        if len(out) < limit:
+            seen = set(out)
+            out.extend(pos for pos, _ in self.similar(text, limit) if pos not in seen)
+        return out[:limit]
+
+
+# ──────────────────────────── Caché ──────────────────────────────
+_INDEXES: Dict[int, NameIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_name_index(game) -> NameIndex:
+    """Índice ligado al catálogo de nombres vigente del juego."""
+    return _index_for(game.pk, get_name_catalog(game))
+
+
+async def aget_name_index(game) -> NameIndex:
+    return _index_for(game.pk, await aget_name_catalog(game))
+
+
+def _index_for(game_pk, catalog: NameCatalog) -> NameIndex:
+    index = _INDEXES.get(game_pk)
+    hit = index is not None and index.catalog is catalog
+    observe_cache("name_index", hit)
+    if not hit:
+        with _INDEXES_LOCK:
+            index = _INDEXES.get(game_pk)
+            if index is None or index.catalog is not catalog:
+                index = _INDEXES[game_pk] = NameIndex(catalog)
+    return index
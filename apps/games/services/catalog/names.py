@@ -0,0 +1,144 @@
+# apps/games/services/catalog/names.py
+"""
+Catálogo de nombres de un juego, versionado por ``Game.catalog_version``.
+
+Los ítems no eliminados, ordenados por pk, forman un índice denso
+``0..n-1`` (el mismo orden que ``ColumnarCatalog``).  El cliente guarda la
+lista completa de nombres una vez y el servidor solo le envía los índices
+densos que deja de poder usar (los ya intentados), mientras la versión
+del catálogo coincida.
+
+``get_catalog_payload`` sirve ese mismo catálogo (nombres + URLs de imagen)
+como JSON precomprimido para el endpoint cacheable ``games/<slug>/catalog/``.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from apps.common.metrics import observe_cache
+
+from .images import image_url
+
+__all__ = [
+    "NameCatalog", "CatalogPayload", "get_name_catalog", "aget_name_catalog",
+    "catalog_token", "get_catalog_payload",
+]
+
+
+class NameCatalog:
+    """Nombres e ids de los ítems activos de un juego (inmutable)."""
+
+    __slots__ = ("version", "item_ids", "names", "image_keys", "index")
+
+    def __init__(self, version: int, rows: Iterable[Tuple[int, str, Any]]):
+        rows = list(rows)
+        self.version = version
+        self.item_ids: Tuple[int, ...] = tuple(row[0] for row in rows)
+        self.names: Tuple[str, ...] = tuple(row[1] for row in rows)
+        self.image_keys: Tuple[Any, ...] = tuple(row[2] for row in rows)   # data["id"]
+        self.index: Dict[int, int] = {pk: i for i, pk in enumerate(self.item_ids)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def position(self, item_id: int) -> Optional[int]:
+        return self.index.get(item_id)
+
+    def positions(self, item_ids: Iterable[int]) -> List[int]:
+        """Índices densos de ``item_ids`` (los ítems eliminados se omiten)."""
+        return sorted(p for p in map(self.index.get, item_ids) if p is not None)
+
+    def remaining(self, item_ids: Iterable[int]) -> List[str]:
+        excluded = set(self.positions(item_ids))
+        return [name for i, name in enumerate(self.names) if i not in excluded]
+
+
+# ──────────────────────────── Caché ──────────────────────────────
+_CATALOGS: Dict[int, NameCatalog] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def get_name_catalog(game) -> NameCatalog:
+    """Una consulta la primera vez por versión del catálogo; después, memoria."""
+    catalog = _CATALOGS.get(game.pk)
+    if catalog is not None and catalog.version == game.catalog_version:
+        observe_cache("name_catalog", True)
+        return catalog
+
+    observe_cache("name_catalog", False)
+    with _CATALOGS_LOCK:
+        catalog = _CATALOGS.get(game.pk)
+        if catalog is None or catalog.version != game.catalog_version:
+            catalog = _CATALOGS[game.pk] = NameCatalog(game.catalog_version, _catalog_rows(game))
+    return catalog
+
+
+def _catalog_rows(game):
+    return game.items.filter(deleted=False).order_by("pk").values_list("id", "name", "data__id")
+
+
+async def aget_name_catalog(game) -> NameCatalog:
+    """Versión para vistas async: la carga usa el ORM async."""
+    catalog = _CATALOGS.get(game.pk)
+    if catalog is not None and catalog.version == game.catalog_version:
+        observe_cache("name_catalog", True)
+        return catalog
+
+    observe_cache("name_catalog", False)
+    rows = [row async for row in _catalog_rows(game)]
+    with _CATALOGS_LOCK:
+        catalog = _CATALOGS.get(game.pk)
+        if catalog is None or catalog.version != game.catalog_version:
+            catalog = _CATALOGS[game.pk] = NameCatalog(game.catalog_version, rows)
+    return catalog
+
+
+# ──────────────────────────── Payload HTTP ───────────────────────
+class CatalogPayload:
+    """
+    JSON del catálogo, en claro y en gzip, calculado una vez por versión.
+    ``token`` identifica la versión (ítems + manifiesto de imágenes) y es la
+    base del ETag fuerte y del ``?v=`` de la URL.
+    """
+
+    __slots__ = ("token", "body", "gzip_body")
+
+    def __init__(self, token: str, data: Dict[str, Any]):
+        self.token = token
+        self.body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+
+    def etag(self, gzipped: bool) -> str:
+        # ETag fuerte: cada codificación es una representación distinta
+        return f'"{self.token}-{"gz" if gzipped else "id"}"'
+
+
+_PAYLOADS: Dict[int, CatalogPayload] = {}
+_PAYLOADS_LOCK = threading.Lock()
+
+
+def catalog_token(game) -> str:
+    return f"{game.catalog_version}.{game.image_manifest_hash or 0}"
+
+
+def get_catalog_payload(game) -> CatalogPayload:
+    token = catalog_token(game)
+    payload = _PAYLOADS.get(game.pk)
+    if payload is not None and payload.token == token:
+        observe_cache("catalog_payload", True)
+        return payload
+
+    observe_cache("catalog_payload", False)
+    with _PAYLOADS_LOCK:
+        payload = _PAYLOADS.get(game.pk)
+        if payload is None or payload.token != token:
+            catalog = get_name_catalog(game)
+            payload = _PAYLOADS[game.pk] = CatalogPayload(token, {
+                "version": catalog.version,
+                "names": list(catalog.names),
+                "images": [image_url(game, key) for key in catalog.image_keys],
+            })
+    return payload
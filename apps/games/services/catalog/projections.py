@@ -0,0 +1,46 @@
+# apps/games/services/catalog/projections.py
+"""
+Regeneración por lotes de ``GameItem.normalized`` (la proyección de
+``data`` según el plan de comparación del juego).  La usan
+``normalize_game_items`` y el admin al cambiar la configuración de
+comparación de un juego; un ítem suelto la recalcula en ``GameItem.save``.
+"""
+from apps.games.comparison import ComparisonPlan
+from apps.games.models import GameItem
+
+__all__ = ["normalize_items"]
+
+
+def normalize_items(game, chunk_size: int = 500, force: bool = False) -> int:
+    """
+    Reescribe la proyección de los ítems del juego que no corresponde a su
+    configuración actual (todos con ``force``).  Devuelve nº de ítems.
+    """
+    plan = ComparisonPlan(game)
+    updated = 0
+    last_pk = 0
+
+    # Paginación por pk: cada lote es una consulta indexada y un bulk_update
+    while True:
+        chunk = list(
+            GameItem.objects
+            .filter(game=game, pk__gt=last_pk)
+            .order_by("pk")
+            .only("id", "data", "normalized")[:chunk_size]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+
+        stale = []
+        for item in chunk:
+            if not force and (item.normalized or {}).get("fp") == plan.fingerprint:
+                continue
+            item.normalized = plan.project(item.data)
+            stale.append(item)
+
+        if stale:
+            GameItem.objects.bulk_update(stale, ["normalized"])
+            updated += len(stale)
+
+    return updated
@@ -0,0 +1,127 @@
+# apps/games/services/difficulty/sampler.py
+"""
+Muestreo ponderado de objetivos diarios según su dificultad.
+
+Los ítems de un juego se reparten en tramos (fácil / medio / difícil) por
+terciles de ``ItemDifficulty.expected_guesses``.  Cada tramo recibe la
+proporción configurada en ``settings.DAILY_TARGET_DIFFICULTY`` para el
+juego y la pista (normal / equipo), y ese peso se reparte a partes iguales
+entre sus ítems.  Con los pesos se construye una tabla alias de Walker una
+sola vez, de modo que cada sorteo es O(1).
+"""
+from __future__ import annotations
+
+import secrets
+from typing import Dict, List, Sequence
+
+from django.conf import settings
+
+from apps.games.models import GameItem
+
+__all__ = ["BUCKETS", "AliasSampler", "DifficultySampler", "difficulty_distribution"]
+
+BUCKETS = ("easy", "medium", "hard")
+
+
+def difficulty_distribution(game, is_team: bool) -> Dict[str, float]:
+    """
+    Proporciones por tramo para un juego y pista: las de ``"default"`` en
+    ``settings.DAILY_TARGET_DIFFICULTY``, sobreescritas por las del slug.
+    Un tramo que no aparece en ninguna de las dos tiene peso 0.
+    """
+    track = "team" if is_team else "normal"
+    config = settings.DAILY_TARGET_DIFFICULTY
+    distribution = {}
+    for scope in ("default", game.slug):
+        distribution.update(config.get(scope, {}).get(track, {}))
+    return {bucket: max(0.0, float(distribution.get(bucket, 0.0))) for bucket in BUCKETS}
+
+
+class AliasSampler:
+    """Tabla alias de Walker: sorteos O(1) sobre una distribución discreta fija."""
+
+    def __init__(self, weights: Sequence[float], rng=None):
+        total = float(sum(weights))
+        if not weights or total <= 0:
+            raise ValueError("AliasSampler necesita al menos un peso positivo.")
+
+        n = len(weights)
+        self.rng = rng or secrets.SystemRandom()
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def draw(self) -> int:
+        i = self.rng.randrange(len(self.prob))
+        return i if self.rng.random() < self.prob[i] else self.alias[i]
+
+
+class DifficultySampler:
+    """
+    Sorteador de objetivos de un juego y pista.  Se construye con una sola
+    consulta; los ítems sin dificultad calculada cuentan como «medio».
+    """
+
+    def __init__(self, game, is_team: bool = False, rng=None):
+        self.game = game
+        self.is_team = is_team
+
+        items = list(
+            GameItem.objects
+            .filter(game=game, deleted=False)
+            .select_related("difficulty")
+            .order_by("pk")
+        )
+        self.buckets = self._split(items)
+        self.distribution = difficulty_distribution(game, is_team)
+
+        self.items: List[GameItem] = []
+        weights: List[float] = []
+        for bucket in BUCKETS:
+            members = self.buckets[bucket]
+            share = self.distribution[bucket]
+            if not members or share <= 0:
+                continue
+            self.items.extend(members)
+            weights.extend([share / len(members)] * len(members))
+
+        # Sin tramos con peso (p. ej. solo hay ítems fáciles y su peso es 0): uniforme
+        if not self.items and items:
+            self.items, weights = items, [1.0] * len(items)
+
+        self.sampler = AliasSampler(weights, rng) if self.items else None
+
+    @staticmethod
+    def _split(items) -> Dict[str, List[GameItem]]:
+        buckets = {bucket: [] for bucket in BUCKETS}
+        scored = []
+        for item in items:
+            difficulty = getattr(item, "difficulty", None)
+            if difficulty is None:
+                buckets["medium"].append(item)
+            else:
+                scored.append((difficulty.expected_guesses, item.pk, item))
+
+        # Terciles por intentos esperados (el pk desempata de forma estable)
+        scored.sort(key=lambda row: row[:2])
+        n = len(scored)
+        for rank, (_, _, item) in enumerate(scored):
+            buckets[BUCKETS[min(2, rank * 3 // n)]].append(item)
+        return buckets
+
+    def __bool__(self):
+        return self.sampler is not None
+
+    def draw(self) -> GameItem:
+        return self.items[self.sampler.draw()]
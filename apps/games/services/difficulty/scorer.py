@@ -0,0 +1,120 @@
+# apps/games/services/difficulty/scorer.py
+"""
+Puntuación de dificultad de los ítems de un juego.
+
+Para cada apertura de una muestra determinista se recorre el árbol del
+solver (``GreedySolver.depths``) y se obtiene el número de intentos de
+cada objetivo.  Por ítem se guarda la media (``expected_guesses``) y el
+máximo (``worst_guesses``) sobre las aperturas.
+
+El árbol depende del catálogo entero: un ítem nuevo cambia las decisiones
+del solver y con ellas los intentos de los demás ítems.  Por eso siempre
+se puntúa el juego completo, y ``ItemDifficulty.catalog_version`` indica si
+la puntuación sigue vigente (``is_stale``).  Es un cálculo largo: se lanza
+con el comando score_item_difficulty, nunca dentro de una petición.
+
+Las aperturas son independientes entre sí, así que se reparten en un
+``ProcessPoolExecutor``: cada proceso recibe el catálogo una sola vez (en
+el initializer) y su propio solver con memoria de decisiones.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from apps.games.models import GameItem, ItemDifficulty
+from apps.games.services.catalog.columnar import ColumnarCatalog, get_catalog
+from .solver import GreedySolver
+
+__all__ = ["DifficultyScorer"]
+
+
+# ───────────────────────── Worker (proceso) ───────────────────────
+_WORKER_SOLVER: Optional[GreedySolver] = None
+
+
+def _init_worker(catalog: ColumnarCatalog, max_guesses: int):
+    global _WORKER_SOLVER
+    _WORKER_SOLVER = GreedySolver(catalog, max_guesses=max_guesses)
+
+
+def _worker_depths(opener: int) -> np.ndarray:
+    return _WORKER_SOLVER.depths(opener)
+
+
+# ──────────────────────────── Servicio ────────────────────────────
+class DifficultyScorer:
+    """Calcula y guarda ``ItemDifficulty`` para los ítems activos de un juego."""
+
+    DEFAULT_OPENERS = 16
+
+    def __init__(self, game, openers=DEFAULT_OPENERS, workers=1, max_guesses=30):
+        self.game = game
+        self.openers = openers
+        self.workers = workers
+        self.max_guesses = max_guesses
+
+    def opener_sample(self, catalog: ColumnarCatalog) -> List[int]:
+        """Aperturas equiespaciadas en el índice denso (deterministas entre ejecuciones)."""
+        if catalog.size == 0:
+            return []
+        count = min(self.openers, catalog.size)
+        return sorted({int(i) for i in np.linspace(0, catalog.size - 1, count)})
+
+    def depth_matrix(self, catalog: ColumnarCatalog) -> np.ndarray:
+        """``int32[aperturas, n]`` con los intentos de cada objetivo por apertura."""
+        openers = self.opener_sample(catalog)
+        if not openers:
+            return np.zeros((0, catalog.size), dtype=np.int32)
+
+        if self.workers <= 1 or len(openers) == 1:
+            solver = GreedySolver(catalog, max_guesses=self.max_guesses)
+            rows = [solver.depths(opener) for opener in openers]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(openers)),
+                initializer=_init_worker,
+                initargs=(catalog, self.max_guesses),
+            ) as pool:
+                rows = list(pool.map(_worker_depths, openers))
+        return np.vstack(rows)
+
+    def score(self) -> int:
+        """Puntúa todos los ítems activos del juego.  Devuelve los ítems guardados."""
+        catalog = get_catalog(self.game)
+        depths = self.depth_matrix(catalog)
+        if depths.size == 0:
+            return 0
+
+        rows = [
+            ItemDifficulty(
+                item_id=int(catalog.item_ids[p]),
+                expected_guesses=round(float(depths[:, p].mean()), 3),
+                worst_guesses=int(depths[:, p].max()),
+                openers=depths.shape[0],
+                catalog_version=catalog.version,
+            )
+            for p in range(catalog.size)
+        ]
+        ItemDifficulty.objects.bulk_create(
+            rows,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["item"],
+            update_fields=["expected_guesses", "worst_guesses", "openers", "catalog_version", "computed_at"],
+        )
+        return len(rows)
+
+    def is_stale(self) -> bool:
+        """
+        True si algún ítem activo no tiene dificultad o se calculó con otra
+        versión del catálogo (sync, soft delete o cambio de configuración).
+        """
+        return (
+            GameItem.objects
+            .filter(game=self.game, deleted=False)
+            .exclude(difficulty__catalog_version=self.game.catalog_version)
+            .exists()
+        )
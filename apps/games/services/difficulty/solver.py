@@ -0,0 +1,115 @@
+# apps/games/services/difficulty/solver.py
+"""
+Solver voraz de máxima información sobre un ``ColumnarCatalog``.
+
+En cada turno el solver elige, entre los candidatos que siguen siendo
+compatibles, el intento cuyo feedback reparte mejor a los candidatos
+(máxima entropía del patrón de feedback).  Las reglas de feedback son las
+del catálogo columnar, es decir, las mismas que ``build_attempts``.
+
+En vez de jugar una partida por objetivo se recorre el árbol de decisión
+completo de una apertura: el feedback del intento parte a los candidatos
+en grupos (uno por patrón) y cada grupo es un subárbol.  Así una sola
+pasada da el número de intentos de todos los objetivos a la vez.
+
+Este módulo es NumPy puro (sin ORM) para poder ejecutarse en un pool de
+procesos: cada proceso recibe el catálogo una sola vez.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from apps.games.services.catalog.columnar import ColumnarCatalog
+
+__all__ = ["pattern_groups", "GreedySolver"]
+
+
+def pattern_groups(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Agrupa las filas de ``codes`` por patrón exacto.
+    Devuelve (id de grupo por fila, tamaño de cada grupo).
+    """
+    rows = np.ascontiguousarray(codes)
+    packed = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+    _, inverse, counts = np.unique(packed, return_inverse=True, return_counts=True)
+    return inverse.reshape(-1), counts
+
+
+class GreedySolver:
+    """
+    Simula el solver contra un catálogo fijo.  Las decisiones se memorizan
+    por conjunto de candidatos, así que aperturas distintas que llegan al
+    mismo conjunto reutilizan el trabajo.
+    """
+
+    def __init__(self, catalog: ColumnarCatalog, max_probe: int = 48, max_guesses: int = 30):
+        self.catalog = catalog
+        self.max_probe = max_probe
+        self.max_guesses = max_guesses
+        self._memo: Dict[Tuple[int, int], int] = {}
+
+    def best_guess(self, candidates: np.ndarray) -> int:
+        """Candidato con mayor entropía de feedback sobre ``candidates``."""
+        if candidates.size <= 2:
+            return int(candidates[0])
+
+        key = (int(candidates.size), hash(candidates.tobytes()))
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        # Con muchos candidatos se sondea una muestra equiespaciada y estable
+        if candidates.size > self.max_probe:
+            probes = candidates[np.linspace(0, candidates.size - 1, self.max_probe).astype(np.int64)]
+        else:
+            probes = candidates
+
+        best, best_score = int(probes[0]), -1.0
+        total = float(candidates.size)
+        for guess in probes:
+            _, counts = pattern_groups(self.catalog.feedback_codes(int(guess), candidates))
+            p = counts / total
+            score = float(-(p * np.log2(p)).sum())
+            if score > best_score:
+                best, best_score = int(guess), score
+
+        self._memo[key] = best
+        return best
+
+    def depths(self, opener: int, targets: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        Intentos necesarios para acertar cada ítem empezando por ``opener``.
+        Devuelve ``int32[n]`` indexado por índice denso; si se pasan
+        ``targets`` solo se exploran las ramas que los contienen (el resto
+        queda a 0).
+        """
+        n = self.catalog.size
+        out = np.zeros(n, dtype=np.int32)
+        wanted = None
+        if targets is not None:
+            wanted = np.zeros(n, dtype=bool)
+            wanted[np.fromiter(targets, dtype=np.int64)] = True
+
+        # Pila explícita de (candidatos, intento, nº de intento)
+        stack = [(np.arange(n, dtype=np.int64), int(opener), 1)]
+        while stack:
+            candidates, guess, depth = stack.pop()
+            if depth >= self.max_guesses:
+                out[candidates] = self.max_guesses
+                continue
+
+            out[guess] = depth
+            rest = candidates[candidates != guess]
+            if rest.size == 0:
+                continue
+
+            group_of, _ = pattern_groups(self.catalog.feedback_codes(guess, rest))
+            order = np.argsort(group_of, kind="stable")
+            bounds = np.flatnonzero(np.diff(group_of[order])) + 1
+            for group in np.split(rest[order], bounds):
+                if wanted is not None and not wanted[group].any():
+                    continue
+                stack.append((group, self.best_guess(group), depth + 1))
+        return out
@@ -2,7 +2,6 @@ from apps.games.services.gameplay.challenger_manager import ChallengeManager
 from apps.games.services.gameplay.result_updater import ResultUpdater
 from apps.games.services.gameplay.play_session_service import PlaySessionService
 from apps.accounts.services.score_service import ScoreService
-from apps.games.models import GameAttempt
 
 class ChallengeResolutionService:
     """
@@ -42,7 +41,7 @@ class ChallengeResolutionService:
             self.challenge.game,
             challenge=self.challenge
         )
-        loser_tries = GameAttempt.objects.filter(session=session_loser).count()
+        loser_tries = session_loser.attempt_count
         svc_loser = ScoreService(loser, self.challenge.game)
         svc_loser.add_points_for_attempts(loser_tries)
 
@@ -76,6 +76,8 @@ class ChallengeViewHelper:
 
         if not opponent_id or not game_id:
             return None, "Missing parameters"
+        if str(opponent_id) == str(request.user.pk):
+            return None, "Cannot challenge yourself"
 
         try:
             opponent = get_object_or_404(User, pk=opponent_id)
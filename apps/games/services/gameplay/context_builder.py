@@ -1,8 +1,10 @@
 # apps/games/services/gameplay/context_builder.py
 
 import json
-from apps.games.attempts import build_attempts
+from django.urls import reverse
+from apps.games.attempts import attempt_history
 from apps.games.models import GameAttempt
+from apps.games.services.catalog.names import catalog_token, get_name_catalog
 from .play_session_service import PlaySessionService
 from .target_service import TargetService
 
@@ -18,7 +20,7 @@ class ContextBuilder:
         self.challenge = challenge
         self.extra_play = extra_play
 
-    def build(self):
+    def _session_and_target(self):
         if self.extra_play:
             session = PlaySessionService.get_or_create(
                 self.request.user, self.game, extra_play=self.extra_play
@@ -34,18 +36,29 @@ class ContextBuilder:
                 self.request.user, self.game, challenge=self.challenge
             )
             target_item = self.challenge.target
+        return session, target_item
 
-        qs = GameAttempt.objects.filter(session=session).order_by("-attempted_at")
+    def build(self):
+        session, target_item = self._session_and_target()
 
-        attempts = build_attempts(self.game,[att.guess for att in qs],target_item)
+        qs = list(
+            GameAttempt.objects
+            .filter(session=session)
+            .select_related("guess")
+            .order_by("-attempted_at")
+        )
 
-        has_won = qs.filter(is_correct=True).exists()
+        # El feedback se guardó al escribir cada intento: aquí solo se lee
+        attempts = attempt_history(self.game, qs, target_item)
+
+        has_won = any(att.is_correct for att in qs)
         can_play = not has_won
 
-        guessed_ids = [att.guess_id for att in qs]
-        remaining_names = list(
-            self.game.items.filter(deleted=False).exclude(id__in=guessed_ids).values_list("name", flat=True)
-        )
+        # El cliente descarga el catálogo aparte (endpoint cacheable) y aquí
+        # solo recibe los índices densos ya usados; cada intento envía el
+        # índice nuevo (ver GuessOutcome.names_update)
+        catalog = get_name_catalog(self.game)
+        removed = catalog.positions(att.guess_id for att in qs)
         ctx = {
             "game": self.game,
             "target": target_item,
@@ -53,7 +66,10 @@ class ContextBuilder:
             "previous_guesses": [att.guess for att in qs],
             "won": has_won,
             "can_play": can_play,
-            "remaining_names_json": json.dumps(remaining_names),
+            "catalog_version": catalog.version,
+            "catalog_url": f"{reverse('game_catalog', args=[self.game.slug])}?v={catalog_token(self.game)}",
+            "removed_json": json.dumps(removed),
+            "guessed_json": json.dumps([att.guess.name for att in qs]),
         }
 
         if self.daily_target or self.extra_play:
@@ -69,5 +85,4 @@ class ContextBuilder:
         return ctx
 
     def _get_guess_url(self):
-        from django.urls import reverse
         return reverse("ajax_guess", args=[self.game.slug])
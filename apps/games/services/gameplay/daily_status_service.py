@@ -0,0 +1,90 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from django.utils import timezone
+
+from apps.games.models import DailyTarget, ExtraDailyPlay, Game, PlaySession, PlaySessionType
+
+
+@dataclass
+class DailyStatus:
+    """Estado del daily de hoy de un usuario en un juego."""
+    game: Game
+    target_id: Optional[int] = None        # DailyTarget de hoy (None: no hay)
+    session_id: Optional[int] = None       # PlaySession DAILY (None: no ha jugado)
+    attempt_count: int = 0
+    solved: bool = False
+    extra_id: Optional[int] = None         # ExtraDailyPlay de hoy sin terminar
+
+    def as_dict(self):
+        return {
+            "slug": self.game.slug,
+            "name": self.game.name,
+            "target_id": self.target_id,
+            "session_id": self.session_id,
+            "attempt_count": self.attempt_count,
+            "solved": self.solved,
+            "extra_id": self.extra_id,
+        }
+
+
+class DailyStatusService:
+    """
+    Estado del daily de hoy de un usuario en todos los juegos a la vez, en un
+    número fijo de consultas (cuatro con ``games=None``, sin contar el perfil):
+      1. juegos activos
+      2. DailyTarget de hoy de esos juegos
+      3. sesiones DAILY del usuario con esos objetivos (su resumen:
+         ``attempt_count`` y ``solved``)
+      4. ExtraDailyPlay de hoy sin terminar
+    Sustituye a llamar a ``TargetService.is_daily_resolved`` juego a juego
+    (tres consultas por juego).
+    """
+    def __init__(self, user, is_team=None):
+        self.user = user
+        if is_team is None:
+            is_team = getattr(getattr(user, "profile", None), "is_team_account", False)
+        self.is_team = is_team
+
+    def for_games(self, games=None) -> List[DailyStatus]:
+        """Un ``DailyStatus`` por juego, en el orden de ``games`` (por defecto, activos por nombre)."""
+        if games is None:
+            games = Game.objects.filter(active=True).order_by("name")
+        statuses = {game.pk: DailyStatus(game=game) for game in games}
+        if not statuses:
+            return []
+        today = timezone.localdate()
+
+        targets = dict(
+            DailyTarget.objects
+            .filter(game_id__in=statuses, date=today, is_team=self.is_team)
+            .values_list("id", "game_id")
+        )
+        for target_id, game_id in targets.items():
+            statuses[game_id].target_id = target_id
+
+        if targets:
+            sessions = (
+                PlaySession.objects
+                .filter(user=self.user, session_type=PlaySessionType.DAILY, reference_id__in=targets)
+                .values_list("game_id", "id", "attempt_count", "solved")
+            )
+            for game_id, session_id, attempt_count, solved in sessions:
+                status = statuses[game_id]
+                status.session_id = session_id
+                status.attempt_count = attempt_count
+                status.solved = solved
+
+        extras = (
+            ExtraDailyPlay.objects
+            .filter(user=self.user, game_id__in=statuses, completed=False, created_at__date=today)
+            .order_by("created_at")
+            .values_list("game_id", "id")
+        )
+        for game_id, extra_id in extras:
+            statuses[game_id].extra_id = extra_id   # la más reciente gana
+
+        return list(statuses.values())
+
+    def by_slug(self, games=None) -> Dict[str, DailyStatus]:
+        return {status.game.slug: status for status in self.for_games(games)}
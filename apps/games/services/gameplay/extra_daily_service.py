@@ -63,8 +63,7 @@ class ExtraDailyService:
             raise ValueError("No tienes suficientes puntos para esa apuesta.")
 
         # Restar puntos
-        score_service.score_obj.elo = current_points - bet_amount
-        score_service.score_obj.save(update_fields=["elo"])
+        score_service.deduct(bet_amount)
 
         # Elegir target aleatorio y crear partida extra
         target = TargetService(self.game, self.user).get_random_item()
@@ -0,0 +1,292 @@
+# apps/games/services/gameplay/guess_pipeline.py
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from apps.accounts.services.leaderboard import LeaderboardService
+from apps.accounts.services.player_stats import PlayerStatsService
+from apps.common.metrics import observe_guess
+from apps.games.attempts import build_attempt
+from apps.games.models import GameAttempt, GameItem, PlaySession, PlaySessionType
+from apps.games.services.catalog.name_index import aget_name_index, get_name_index
+from apps.games.services.catalog.names import NameCatalog
+from .result_updater import ResultUpdater
+
+
+@dataclass
+class GuessOutcome:
+    """Resultado de un intento: solo la fila nueva y el estado actualizado."""
+    status: str                                   # ok | invalid | duplicate | finished
+    correct: bool = False
+    attempt: Optional[Dict[str, Any]] = None
+    attempt_count: int = 0
+    catalog: Optional[NameCatalog] = None
+    guessed_ids: List[int] = field(default_factory=list)
+
+    @property
+    def valid(self):
+        return self.status == GuessPipeline.OK
+
+    @property
+    def remaining_names(self) -> List[str]:
+        return self.catalog.remaining(self.guessed_ids) if self.catalog else []
+
+    def names_update(self, client_version=None) -> Dict[str, Any]:
+        """
+        Cambios en la lista de nombres disponibles para el cliente:
+        - misma versión de catálogo → solo el índice denso del ítem intentado,
+        - otra versión → catálogo completo + todos los índices ya usados,
+        - cliente sin versión (JS antiguo) → ``remaining_names`` completo.
+        """
+        if client_version in (None, ""):
+            return {"remaining_names": self.remaining_names}
+
+        catalog = self.catalog
+        if str(client_version) == str(catalog.version):
+            return {
+                "catalog_version": catalog.version,
+                "removed": catalog.positions(self.guessed_ids[-1:]),
+            }
+        return {
+            "catalog_version": catalog.version,
+            "catalog": list(catalog.names),
+            "removed": catalog.positions(self.guessed_ids),
+        }
+
+
+class _AlreadyGuessed(Exception):
+    """Conflicto de la restricción única: sale del ``atomic`` para deshacerlo."""
+
+    def __init__(self, session_id):
+        super().__init__(session_id)
+        self.session_id = session_id
+
+
+class GuessPipeline:
+    """
+    Procesa un intento en una sola pasada y una sola transacción:
+    sesión, intentos previos y objetivo se cargan una vez; la validación,
+    la escritura y la puntuación van dentro del mismo ``atomic``.
+
+    Presupuesto de consultas por intento (sin contar BEGIN/COMMIT), con la
+    sesión ya creada (el primer intento añade su INSERT):
+      1. sesión (``SELECT ... FOR UPDATE``: serializa intentos simultáneos)
+      2. intentos previos de la sesión (solo ``guess_id`` / ``is_correct``)
+      3. ítem intentado, por pk (el nombre se resuelve en memoria con el
+         índice de nombres: sin mayúsculas ni acentos, solo ítems activos)
+      4. INSERT del intento
+      5. UPDATE del resumen de la sesión (``attempt_count``, ``solved``...)
+      6. UPDATE de la clasificación materializada (fila del juego + global;
+         el primer intento del usuario en el juego las crea)
+    Los nombres restantes salen del catálogo de nombres en memoria
+    (``get_name_catalog``): una consulta solo cuando cambia su versión.
+    Un intento acertado añade bloquear y reescribir las estadísticas del
+    jugador (``PlayerGameStats``) y las consultas de ``ResultUpdater``.
+    Un intento rechazado (finished / invalid / duplicate) se queda en 2.
+    ``apps/games/tests.py`` hace cumplir estos números.
+
+    Duplicados: la lista de intentos previos ya descarta los repetidos sin
+    consultas extra; si dos envíos simultáneos (doble clic, varias
+    pestañas) pasan ambos esa comprobación, la restricción única
+    ``(session, guess)`` hace fallar el segundo INSERT, se deshace su
+    transacción y el intento se devuelve como ``duplicate``.
+    """
+
+    OK = "ok"
+    INVALID = "invalid"
+    DUPLICATE = "duplicate"
+    FINISHED = "finished"
+
+    def __init__(self, game, user, *, daily_target=None, extra_play=None, challenge=None):
+        if sum(bool(x) for x in (daily_target, extra_play, challenge)) != 1:
+            raise ValueError("Debes indicar daily_target, challenge o extra_play.")
+
+        self.game = game
+        self.user = user
+        self.daily_target = daily_target
+        self.extra_play = extra_play
+        self.challenge = challenge
+
+        if daily_target:
+            self.session_type, self.reference_id = PlaySessionType.DAILY, daily_target.id
+            self.target = daily_target.target
+        elif extra_play:
+            self.session_type, self.reference_id = PlaySessionType.EXTRA, extra_play.id
+            self.target = extra_play.target
+        else:
+            self.session_type, self.reference_id = PlaySessionType.CHALLENGE, challenge.id
+            self.target = challenge.target
+
+    # ──────────────────────────── Main ───────────────────────────────
+    def run(self, guess_name: str) -> GuessOutcome:
+        """El intento ya guardado (o el motivo del rechazo) y el estado de la sesión."""
+        try:
+            outcome = self._run(guess_name)
+        except _AlreadyGuessed as conflict:
+            attempt_count = self._attempt_count(PlaySession.objects.filter(pk=conflict.session_id))
+            outcome = GuessOutcome(self.DUPLICATE, attempt_count=attempt_count)
+        observe_guess(self.game, self.session_type, outcome)
+        return outcome
+
+    @transaction.atomic
+    def _run(self, guess_name: str) -> GuessOutcome:
+        # -------------------- 1️⃣ Sesión e intentos previos ---- #
+        session, _ = PlaySession.objects.select_for_update().get_or_create(**self._session_key())
+        previous = list(self._previous(session))
+
+        # -------------------- 2️⃣ Validación -------------------- #
+        index = get_name_index(self.game)
+        rejected, item_id = self._check(previous, index, guess_name)
+        if rejected:
+            return rejected
+
+        item = GameItem.objects.filter(pk=item_id, deleted=False).first()
+        if not item:  # borrado justo después de cargar el catálogo
+            return GuessOutcome(self.INVALID, attempt_count=len(previous))
+
+        # -------------------- 3️⃣ Feedback y escritura ---------- #
+        is_correct = item.pk == self.target.pk
+        attempt_row, encoded_feedback = build_attempt(self.game, item, self.target)
+        try:
+            attempt = GameAttempt.objects.create(**self._attempt_fields(session, item, is_correct, encoded_feedback))
+        except IntegrityError:
+            # Otro envío guardó este ítem entre nuestra lectura y el INSERT
+            raise _AlreadyGuessed(session.pk)
+        PlaySession.objects.filter(pk=session.pk).update(**self._summary(previous, attempt))
+        self._leaderboard().record_attempt(first_in_session=not previous, solved=is_correct)
+
+        # -------------------- 4️⃣ Puntuación -------------------- #
+        if is_correct:
+            self._player_stats().record_solve(len(previous) + 1, self._daily_date())
+            self._score(session, len(previous) + 1)
+
+        return self._accepted(previous, index, item, is_correct, attempt_row)
+
+    async def arun(self, guess_name: str) -> GuessOutcome:
+        """
+        ``run`` para vistas async.  Los rechazos, que no escriben nada
+        (partida terminada, nombre inválido o repetido), se resuelven con el
+        ORM async.  Un intento aceptable pasa a ``run`` por
+        ``sync_to_async``: vuelve a comprobarlo todo con la sesión bloqueada
+        y escribe en el mismo ``atomic`` que el camino síncrono, así que un
+        intento concurrente con un acierto se rechaza igual que allí.
+        """
+        rejected = await self._arejected(guess_name)
+        if rejected:
+            observe_guess(self.game, self.session_type, rejected)
+            return rejected
+        return await sync_to_async(self.run)(guess_name)
+
+    async def _arejected(self, guess_name: str) -> Optional[GuessOutcome]:
+        session = await PlaySession.objects.filter(**self._session_key()).afirst()
+        previous = [row async for row in self._previous(session)] if session else []
+        rejected, _ = self._check(previous, await aget_name_index(self.game), guess_name)
+        return rejected
+
+    # ──────────────────────────── Estado ─────────────────────────────
+    def state(self) -> GuessOutcome:
+        """Estado de la sesión sin crearla: ``ok`` (en juego) o ``finished``."""
+        session = PlaySession.objects.filter(**self._session_key()).first()
+        previous = list(self._previous(session)) if session else []
+        return self._state(previous, get_name_index(self.game))
+
+    async def astate(self) -> GuessOutcome:
+        session = await PlaySession.objects.filter(**self._session_key()).afirst()
+        previous = [row async for row in self._previous(session)] if session else []
+        return self._state(previous, await aget_name_index(self.game))
+
+    # ──────────────────────────── Pasos comunes ──────────────────────
+    def _session_key(self) -> Dict[str, Any]:
+        return {
+            "user": self.user,
+            "game": self.game,
+            "session_type": self.session_type,
+            "reference_id": self.reference_id,
+        }
+
+    @staticmethod
+    def _previous(session):
+        return GameAttempt.objects.filter(session=session).values_list("guess_id", "is_correct")
+
+    def _check(self, previous, index, guess_name: str):
+        """(rechazo, None) o (None, pk del ítem intentado); sin consultas."""
+        if any(is_correct for _, is_correct in previous):
+            return GuessOutcome(self.FINISHED, attempt_count=len(previous)), None
+
+        position = index.resolve(guess_name)
+        if position is None:
+            return GuessOutcome(self.INVALID, attempt_count=len(previous)), None
+
+        item_id = index.catalog.item_ids[position]
+        if any(guess_id == item_id for guess_id, _ in previous):
+            return GuessOutcome(self.DUPLICATE, attempt_count=len(previous)), None
+        return None, item_id
+
+    def _attempt_fields(self, session, item, is_correct: bool, feedback: str) -> Dict[str, Any]:
+        return {
+            "user": self.user,
+            "game": self.game,
+            "session": session,
+            "guess": item,
+            "is_correct": is_correct,
+            "feedback": feedback,
+        }
+
+    @staticmethod
+    def _summary(previous, attempt) -> Dict[str, Any]:
+        """
+        Cambios del resumen de la sesión por un intento aceptado (con la
+        sesión bloqueada por ``_run``).
+        """
+        changes = {"attempt_count": F("attempt_count") + 1}
+        if not previous:
+            changes["first_guess_id"] = attempt.guess_id
+        if attempt.is_correct:
+            changes.update(solved=True, solved_at=attempt.attempted_at)
+        return changes
+
+    @staticmethod
+    def _attempt_count(sessions) -> int:
+        return sessions.values_list("attempt_count", flat=True).first() or 0
+
+    def _leaderboard(self):
+        return LeaderboardService(self.user, self.game)
+
+    def _player_stats(self):
+        return PlayerStatsService(self.user, self.game)
+
+    def _daily_date(self):
+        return self.daily_target.date if self.daily_target else None
+
+    def _score(self, session, attempt_count: int):
+        ResultUpdater(self.game, self.user).update_for_game(
+            daily_target=self.daily_target,
+            extra_play=self.extra_play,
+            challenge=self.challenge,
+            session=session,
+            attempts_count=attempt_count,
+        )
+
+    def _accepted(self, previous, index, item, is_correct: bool, attempt_row) -> GuessOutcome:
+        return GuessOutcome(
+            self.OK,
+            correct=is_correct,
+            attempt=attempt_row,
+            attempt_count=len(previous) + 1,
+            catalog=index.catalog,
+            guessed_ids=[guess_id for guess_id, _ in previous] + [item.pk],
+        )
+
+    def _state(self, previous, index) -> GuessOutcome:
+        won = any(is_correct for _, is_correct in previous)
+        return GuessOutcome(
+            self.FINISHED if won else self.OK,
+            correct=won,
+            attempt_count=len(previous),
+            catalog=index.catalog,
+            guessed_ids=[guess_id for guess_id, _ in previous],
+        )
@@ -0,0 +1,49 @@
+# apps/games/services/gameplay/hint_service.py
+
+from apps.games.comparison import get_plan
+from apps.games.models import GameAttempt
+from apps.games.services.catalog.hints import get_hint_index
+
+
+class HintService:
+    """
+    Candidatos que siguen siendo compatibles con el feedback de una sesión.
+    Las pistas se leen del feedback guardado en cada GameAttempt; sin
+    sesión (``session=None``) no hay pistas y vale todo el catálogo.
+    """
+
+    MAX_CANDIDATES = 200
+
+    def __init__(self, game):
+        self.game = game
+
+    def candidates(self, session, target_item, limit=25):
+        index = get_hint_index(self.game)
+        catalog = index.catalog
+        plan = get_plan(self.game)
+
+        attempts = ()
+        if session is not None:
+            attempts = GameAttempt.objects.filter(session=session).values_list("guess_id", "feedback")
+
+        clues, guessed = [], []
+        target_pos = catalog.position(target_item.pk)
+        for guess_id, feedback in attempts:
+            guess_pos = catalog.position(guess_id)
+            if guess_pos is None:
+                continue  # ítem eliminado del catálogo: su pista no se puede indexar
+            guessed.append(guess_pos)
+
+            codes = plan.decode_flags(feedback)
+            if codes is None and target_pos is not None:
+                codes = catalog.feedback_pair(guess_pos, target_pos)
+            if codes is not None:
+                clues.append((guess_pos, codes))
+
+        positions = index.candidates(clues, exclude=guessed)
+        limit = max(0, min(limit, self.MAX_CANDIDATES))
+        return {
+            "remaining": int(positions.size),
+            "candidates": [catalog.names[p] for p in positions[:limit]],
+            "truncated": int(positions.size) > limit,
+        }
@@ -1,24 +1,27 @@
-from apps.games.models import PlaySession, PlaySessionType
+from django.db import transaction
+
+from apps.games.models import GameAttempt, PlaySession, PlaySessionType
 
 class PlaySessionService:
     """Orquesta la vida de una sesión de juego (SRP)."""
 
+    SUMMARY_FIELDS = ["attempt_count", "solved", "solved_at", "first_guess"]
+
     @staticmethod
-    def get_or_create(user, game, *, daily_target=None,
-                      extra_play=None, challenge=None):
+    def _context(daily_target, extra_play, challenge):
         if sum(bool(x) for x in (daily_target, extra_play, challenge)) != 1:
             raise ValueError("Debes indicar exactamente un contexto.")
 
         if daily_target:
-            session_type = PlaySessionType.DAILY
-            ref_id = daily_target.id
-        elif extra_play:
-            session_type = PlaySessionType.EXTRA
-            ref_id = extra_play.id
-        else:
-            session_type = PlaySessionType.CHALLENGE
-            ref_id = challenge.id
+            return PlaySessionType.DAILY, daily_target.id
+        if extra_play:
+            return PlaySessionType.EXTRA, extra_play.id
+        return PlaySessionType.CHALLENGE, challenge.id
 
+    @classmethod
+    def get_or_create(cls, user, game, *, daily_target=None,
+                      extra_play=None, challenge=None):
+        session_type, ref_id = cls._context(daily_target, extra_play, challenge)
         session, _ = PlaySession.objects.get_or_create(
             user=user,
             game=game,
@@ -26,3 +29,61 @@ class PlaySessionService:
             reference_id=ref_id,
         )
         return session
+
+    @classmethod
+    def find(cls, user, game, *, daily_target=None,
+             extra_play=None, challenge=None):
+        """Como ``get_or_create`` pero sin crearla: None si aún no ha jugado."""
+        session_type, ref_id = cls._context(daily_target, extra_play, challenge)
+        return PlaySession.objects.filter(
+            user=user,
+            game=game,
+            session_type=session_type,
+            reference_id=ref_id,
+        ).first()
+
+    @classmethod
+    def backfill_summaries(cls, game_ids=None, chunk_size=1000) -> int:
+        """
+        Recalcula el resumen de las sesiones (``attempt_count``, ``solved``,
+        ``solved_at``, ``first_guess``) desde GameAttempt, por tramos de
+        ``chunk_size`` sesiones en orden de pk.  Cada tramo va en su
+        transacción y bloquea sus sesiones, como ``GuessPipeline``, para no
+        pisar intentos que lleguen mientras tanto.  Devuelve nº de sesiones.
+        """
+        sessions = PlaySession.objects.order_by("pk")
+        if game_ids is not None:
+            sessions = sessions.filter(game_id__in=game_ids)
+
+        last_pk, total = 0, 0
+        while True:
+            pks = list(sessions.filter(pk__gt=last_pk).values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                return total
+            with transaction.atomic():
+                chunk = list(PlaySession.objects.select_for_update().filter(pk__in=pks).only("pk"))
+                cls._summarize(chunk)
+                PlaySession.objects.bulk_update(chunk, cls.SUMMARY_FIELDS, batch_size=chunk_size)
+            last_pk, total = pks[-1], total + len(pks)
+
+    @staticmethod
+    def _summarize(sessions):
+        by_pk = {}
+        for session in sessions:
+            session.attempt_count, session.solved = 0, False
+            session.solved_at = session.first_guess_id = None
+            by_pk[session.pk] = session
+
+        attempts = (
+            GameAttempt.objects
+            .filter(session_id__in=by_pk)
+            .order_by("session_id", "attempted_at", "id")
+            .values_list("session_id", "guess_id", "is_correct", "attempted_at")
+        )
+        for session_id, guess_id, is_correct, attempted_at in attempts:
+            session = by_pk[session_id]
+            if not session.attempt_count:
+                session.first_guess_id = guess_id
+            session.attempt_count += 1
+            if is_correct and not session.solved:
+                session.solved, session.solved_at = True, attempted_at
@@ -1,7 +1,6 @@
 # apps/games/services/gameplay/result_updater.py
 
-from django.db.models import Count
-from apps.games.models import ExtraDailyPlay, GameAttempt
+from apps.games.models import ExtraDailyPlay
 from apps.games.services.gameplay.challenger_manager import ChallengeManager
 from apps.games.services.gameplay.play_session_service import PlaySessionService
 from apps.accounts.services.score_service import ScoreService
@@ -12,22 +11,25 @@ class ResultUpdater:
         self.game = game
         self.user = user
 
-    def update_for_game(self, *, daily_target=None, extra_play=None, challenge=None):
+    def update_for_game(self, *, daily_target=None, extra_play=None, challenge=None,
+                        session=None, attempts_count=None):
         contexts = [daily_target, extra_play, challenge]
         if sum(bool(x) for x in contexts) != 1:
             raise ValueError("Debes indicar exactamente un contexto (daily, extra o challenge).")
 
-        # Creamos o recuperamos la PlaySession
-        session = PlaySessionService.get_or_create(
-            self.user,
-            self.game,
-            daily_target=daily_target,
-            extra_play=extra_play,
-            challenge=challenge,
-        )
+        # Creamos o recuperamos la PlaySession (GuessPipeline ya la trae cargada)
+        if session is None:
+            session = PlaySessionService.get_or_create(
+                self.user,
+                self.game,
+                daily_target=daily_target,
+                extra_play=extra_play,
+                challenge=challenge,
+            )
 
-        # Contamos cuántos intentos hubo en esa sesión
-        attempts_count = GameAttempt.objects.filter(session=session).count()
+        # Intentos de esa sesión (su resumen, mantenido por GuessPipeline)
+        if attempts_count is None:
+            attempts_count = session.attempt_count
 
         # 1️⃣ CONTEXTO DAILY
         if daily_target:
@@ -49,8 +51,7 @@ class ResultUpdater:
 
             bonus_pts = bet_amount * 1.5 if result_flag else 0
             if bonus_pts:
-                score_service.score_obj.elo += bonus_pts
-                score_service.score_obj.save(update_fields=("elo",))
+                score_service.add_bonus(bonus_pts)
             return bonus_pts
 
         # 3️⃣ CONTEXTO CHALLENGE
@@ -66,7 +67,7 @@ class ResultUpdater:
                 total_points = 0
                 for user in tied_users:
                     session = PlaySessionService.get_or_create(user, self.game, challenge=challenge)
-                    attempts = GameAttempt.objects.filter(session=session).count()
+                    attempts = session.attempt_count
                     score_service = ScoreService(user, self.game)
                     base_pts = score_service.add_points_for_attempts(attempts)
                     total_points += base_pts  # Solo por si quieres devolver el total
@@ -83,11 +84,10 @@ class ResultUpdater:
                 self.game,
                 challenge=challenge
             )
-            attempts_winner = GameAttempt.objects.filter(session=session_winner).count()
+            attempts_winner = session_winner.attempt_count
             score_service = ScoreService(ganador, self.game)
             base_pts = score_service.add_points_for_attempts(attempts_winner)
-            score_service.score_obj.elo += 100
-            score_service.score_obj.save(update_fields=("elo",))
+            score_service.add_bonus(100)
             challenge.points_assigned = True
             challenge.save(update_fields=["points_assigned"])
             return base_pts + 100
@@ -1,23 +1,32 @@
 from datetime import timedelta
 from django.utils import timezone
-from apps.games.models import DailyTarget, PlaySession, PlaySessionType, GameAttempt, GameItem
+from apps.games.models import DailyTarget, PlaySession, PlaySessionType, GameItem
 import secrets
 
 
 class TargetService:
-    def __init__(self, game, user):
+    def __init__(self, game, user, is_team=None):
         self.game = game
         self.user = user
-        self.is_team = getattr(getattr(user, "profile", None), "is_team_account", False)
+        # Las vistas async pasan is_team ya leído: user.profile es una consulta síncrona
+        if is_team is None:
+            is_team = getattr(getattr(user, "profile", None), "is_team_account", False)
+        self.is_team = is_team
 
-    def get_target_for_today(self):
+    def _today_target(self):
         today = timezone.localdate()
         return DailyTarget.objects.filter(
             game=self.game,
             date=today,
             is_team=self.is_team,
             target__deleted=False
-        ).select_related("target").first()
+        ).select_related("target")
+
+    def get_target_for_today(self):
+        return self._today_target().first()
+
+    async def aget_target_for_today(self):
+        return await self._today_target().afirst()
 
     def get_yesterday_target(self, today_date=None):
         today_date = today_date or timezone.localdate()
@@ -41,8 +50,8 @@ class TargetService:
         """
         Comprueba si el daily de hoy ya se ha resuelto:
         - Busca DailyTarget de hoy
-        - Obtiene la PlaySession DAILY de hoy para este usuario
-        - Comprueba si existe al menos un GameAttempt con is_correct=True en esa sesión
+        - Comprueba si la PlaySession DAILY de hoy del usuario está resuelta
+          (``solved``, mantenido por GuessPipeline)
         """
         today = timezone.localdate()
         daily = DailyTarget.objects.filter(
@@ -54,14 +63,10 @@ class TargetService:
         if not daily:
             return False
 
-        session = PlaySession.objects.filter(
+        return PlaySession.objects.filter(
             user=self.user,
             game=self.game,
             session_type=PlaySessionType.DAILY,
-            reference_id=daily.id
-        ).first()
-
-        if not session:
-            return False
-
-        return GameAttempt.objects.filter(session=session, is_correct=True).exists()
+            reference_id=daily.id,
+            solved=True,
+        ).exists()
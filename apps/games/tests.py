@@ -1,3 +1,871 @@
-from django.test import TestCase
+import gzip
+import json
+import random
+import shutil
+import tempfile
+from collections import Counter
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.conf import settings
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.common import metrics
+from apps.games import comparison
+from apps.games.admin import GameAdmin, GameItemAdmin
+from apps.games.attempts import attempt_history, build_attempt, build_attempts
+from apps.games.bench import golden
+from apps.games.comparison import get_plan
+from apps.games.models import (
+    DailyTarget, ExtraDailyPlay, Game, GameAttempt, GameItem, ItemDifficulty, PlaySession, PlaySessionType,
+)
+from apps.games.services.catalog import columnar, hints, images, names
+from apps.games.services.catalog.columnar import ColumnarCatalog
+from apps.games.services.catalog.name_index import NameIndex, fold
+from apps.games.services.difficulty.sampler import DifficultySampler, difficulty_distribution
+from apps.games.services.difficulty.scorer import DifficultyScorer
+from apps.games.services.difficulty.solver import GreedySolver
+from apps.games.services.gameplay import guess_pipeline
+from apps.games.services.gameplay.daily_status_service import DailyStatusService
+from apps.games.services.gameplay.guess_pipeline import GuessPipeline
+from apps.games.utils import numeric_feedback, parse_to_float, to_list
+
+
+class GuessFixture:
+    """Juego de tres ítems con el daily de hoy (Charmander) y una usuaria."""
+
+    def setUp(self):
+        self.game = Game.objects.create(
+            name="Poke", slug="poke",
+            attributes=["tipo", "peso"], numeric_fields=["peso"],
+            data_source_url="http://example.com",
+        )
+        self.items = {
+            name: GameItem.objects.create(game=self.game, name=name, data=data)
+            for name, data in [
+                ("Pikachu", {"id": 25, "tipo": "eléctrico", "peso": "6,0"}),
+                ("Charmander", {"id": 4, "tipo": "fuego", "peso": "8,5"}),
+                ("Bulbasaur", {"id": 1, "tipo": "planta, veneno", "peso": "6.9"}),
+            ]
+        }
+        self.daily = DailyTarget.objects.create(
+            game=self.game, target=self.items["Charmander"], date=timezone.localdate()
+        )
+        self.user = User.objects.create_user("ana", password="pw")
+
+        # Los pks se reutilizan entre tests: el catálogo en memoria se recarga aquí
+        names._CATALOGS.clear()
+        names.get_name_catalog(self.game)
+
+    def pipeline(self):
+        return GuessPipeline(self.game, self.user, daily_target=self.daily)
+
+
+class GuessPipelineTests(GuessFixture, TestCase):
+    """
+    Presupuesto de consultas de GuessPipeline (ver su docstring).
+    Dentro de un TestCase el ``atomic`` del pipeline es un savepoint:
+    SAVEPOINT + RELEASE suman 2 consultas a cada presupuesto.
+    """
+
+    TX = 2
+
+    def test_first_guess_creates_session(self):
+        # get_or_create: SELECT + SAVEPOINT/INSERT/RELEASE de la sesión;
+        # clasificación, la primera vez: UPDATE + SELECT + 2 × SAVEPOINT/INSERT/RELEASE
+        with self.assertNumQueries(5 + 3 + 8 + self.TX):
+            outcome = self.pipeline().run("pikachu")
+
+        self.assertEqual(outcome.status, GuessPipeline.OK)
+        self.assertFalse(outcome.correct)
+        self.assertEqual(outcome.attempt["name"], "Pikachu")
+        self.assertEqual(outcome.attempt_count, 1)
+        self.assertCountEqual(outcome.remaining_names, ["Charmander", "Bulbasaur"])
+        self.assertEqual(PlaySession.objects.count(), 1)
+
+    def test_wrong_guess_budget(self):
+        self.pipeline().run("pikachu")
+        # + los UPDATE del resumen de la sesión y de la clasificación
+        with self.assertNumQueries(6 + self.TX):
+            outcome = self.pipeline().run("Bulbasaur")
+
+        self.assertEqual(outcome.attempt_count, 2)
+        self.assertEqual(outcome.remaining_names, ["Charmander"])
+        self.assertTrue(GameAttempt.objects.get(guess=self.items["Bulbasaur"]).feedback)
+
+    def test_rejected_guesses_budget(self):
+        self.pipeline().run("pikachu")
+
+        with self.assertNumQueries(2 + self.TX):
+            self.assertEqual(self.pipeline().run("PIKACHU").status, GuessPipeline.DUPLICATE)
+        with self.assertNumQueries(2 + self.TX):
+            self.assertEqual(self.pipeline().run("nadie").status, GuessPipeline.INVALID)
+
+        self.pipeline().run("charmander")
+        with self.assertNumQueries(2 + self.TX):
+            self.assertEqual(self.pipeline().run("bulbasaur").status, GuessPipeline.FINISHED)
+        self.assertEqual(GameAttempt.objects.count(), 2)
+
+    def test_concurrent_duplicate_hits_unique_constraint(self):
+        self.pipeline().run("pikachu")
+        session = PlaySession.objects.get()
+        real_build = guess_pipeline.build_attempt
+
+        def racing_build(game, item, target):
+            # Otra pestaña guarda el mismo ítem después de leer los intentos
+            GameAttempt.objects.create(user=self.user, game=game, session=session,
+                                       guess=item, is_correct=False)
+            return real_build(game, item, target)
+
+        with mock.patch.object(guess_pipeline, "build_attempt", racing_build):
+            outcome = self.pipeline().run("bulbasaur")
+
+        self.assertEqual(outcome.status, GuessPipeline.DUPLICATE)
+        # El atomic se deshace entero, incluida la fila de la "otra pestaña"
+        self.assertEqual(outcome.attempt_count, 1)
+        self.assertEqual(GameAttempt.objects.count(), 1)
+
+    def test_guess_resolution_folds_case_and_accents(self):
+        GameItem.objects.create(game=self.game, name="Pokémon X", data={"tipo": "x"})
+        self.game.bump_catalog_version()
+        self.assertEqual(self.pipeline().run("  pokemon   x ").attempt["name"], "Pokémon X")
+
+    def test_correct_guess_scores_once(self):
+        self.pipeline().run("pikachu")
+        outcome = self.pipeline().run("charmander")
+
+        self.assertTrue(outcome.correct)
+        self.assertEqual(outcome.attempt_count, 2)
+        elo = self.user.gameelo_set.get(game=self.game)
+        self.assertEqual(elo.partidas, 1)
+
+    def test_session_summary_matches_backfill(self):
+        self.pipeline().run("pikachu")
+        self.pipeline().run("charmander")
+        self.pipeline().run("bulbasaur")   # ya resuelta: no cuenta
+
+        session = PlaySession.objects.get()
+        self.assertEqual(session.attempt_count, 2)
+        self.assertTrue(session.solved)
+        self.assertIsNotNone(session.solved_at)
+        self.assertEqual(session.first_guess, self.items["Pikachu"])
+
+        PlaySession.objects.update(attempt_count=0, solved=False, solved_at=None, first_guess=None)
+        call_command("backfill_play_sessions", chunk_size=1, stdout=StringIO())
+        backfilled = PlaySession.objects.get()
+        self.assertEqual(
+            (backfilled.attempt_count, backfilled.solved, backfilled.solved_at, backfilled.first_guess_id),
+            (session.attempt_count, session.solved, session.solved_at, session.first_guess_id),
+        )
+
+    def test_ajax_guess_returns_only_new_attempt(self):
+        self.client.login(username="ana", password="pw")
+        url = reverse("ajax_guess", args=[self.game.slug])
+
+        data = self.client.post(url, {"guess": "pikachu"}).json()
+        self.assertEqual(set(data), {"won", "attempt", "attempt_count", "remaining_names"})
+        self.assertEqual(data["attempt_count"], 1)
+        self.assertCountEqual(data["remaining_names"], ["Charmander", "Bulbasaur"])
+
+        self.assertEqual(self.client.post(url, {"guess": "pikachu"}).status_code, 400)
+        self.assertTrue(self.client.post(url, {"guess": "charmander"}).json()["won"])
+        self.assertEqual(self.client.post(url, {"guess": "bulbasaur"}).status_code, 403)
+
+    async def test_async_pipeline_matches_sync(self):
+        outcome = await self.pipeline().arun("Pikachu")
+        self.assertEqual(outcome.status, GuessPipeline.OK)
+        self.assertEqual(outcome.attempt["name"], "Pikachu")
+        self.assertEqual((await self.pipeline().arun("pikachu")).status, GuessPipeline.DUPLICATE)
+
+        outcome = await self.pipeline().arun("charmander")
+        self.assertTrue(outcome.correct)
+        self.assertEqual(outcome.attempt_count, 2)
+        self.assertEqual((await self.pipeline().arun("bulbasaur")).status, GuessPipeline.FINISHED)
+
+        state = await self.pipeline().astate()
+        self.assertEqual((state.status, state.attempt_count), (GuessPipeline.FINISHED, 2))
+        self.assertEqual(await self.user.gameelo_set.filter(game=self.game).acount(), 1)
+
+    def test_state_endpoint(self):
+        self.client.login(username="ana", password="pw")
+        self.pipeline().run("bulbasaur")
+
+        data = self.client.get(reverse("ajax_state", args=[self.game.slug])).json()
+        self.assertEqual(data, {
+            "won": False, "attempt_count": 1,
+            "catalog_version": self.game.catalog_version, "removed": [2],
+        })
+
+    def test_names_delta_against_client_catalog(self):
+        self.client.login(username="ana", password="pw")
+        url = reverse("ajax_guess", args=[self.game.slug])
+        version = self.game.catalog_version
+
+        # Misma versión: solo el índice denso del ítem intentado (orden por pk)
+        data = self.client.post(url, {"guess": "bulbasaur", "catalog_version": version}).json()
+        self.assertEqual(data["removed"], [2])
+        self.assertEqual(data["catalog_version"], version)
+        self.assertNotIn("catalog", data)
+
+        # Versión distinta: catálogo completo y todos los índices usados
+        self.game.bump_catalog_version()
+        data = self.client.post(url, {"guess": "pikachu", "catalog_version": version}).json()
+        self.assertEqual(data["catalog"], ["Pikachu", "Charmander", "Bulbasaur"])
+        self.assertEqual(data["removed"], [0, 2])
+        self.assertEqual(data["catalog_version"], version + 1)
+
+
+class ItemProjectionTests(GuessFixture, TestCase):
+    """``GameItem.normalized`` nunca se queda detrás de ``data`` ni de la configuración del juego."""
+
+    def feedback(self, guess):
+        return [cell["correct"] for cell in build_attempt(self.game, self.items[guess], self.items["Charmander"])[0]["feedback"]]
+
+    def test_editing_item_data_recomputes_projection(self):
+        self.assertEqual(self.feedback("Pikachu"), [False, False])
+        pikachu = self.items["Pikachu"]
+        pikachu.data = {**pikachu.data, "tipo": "Fuego"}
+        pikachu.save(update_fields=["data"])
+        pikachu.refresh_from_db()
+        self.assertEqual(pikachu.normalized["keys"][0], ["fuego"])
+        self.assertEqual(self.feedback("Pikachu"), [True, False])
+
+    def test_admin_config_change_regenerates_projections(self):
+        request = RequestFactory().post("/")
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        self.game.numeric_fields = []
+        GameAdmin(Game, admin.site).save_model(request, self.game, mock.Mock(cleaned_data={}), change=True)
+
+        fingerprint = get_plan(self.game).fingerprint
+        self.assertEqual({item.normalized["fp"] for item in GameItem.objects.all()}, {fingerprint})
+        self.assertEqual(Game.objects.get().catalog_version, 1)
+
+
+class AttemptHistoryTests(GuessFixture, TestCase):
+    """``attempt_history`` lee el feedback guardado y solo recalcula lo desfasado."""
+
+    def setUp(self):
+        super().setUp()
+        for guess in ("pikachu", "bulbasaur"):
+            self.pipeline().run(guess)
+        self.target = self.items["Charmander"]
+
+    def history(self):
+        attempts = list(GameAttempt.objects.select_related("guess").order_by("pk"))
+        return attempts, attempt_history(self.game, attempts, self.target)
+
+    def expected(self):
+        guesses = [self.items["Pikachu"], self.items["Bulbasaur"]]
+        fresh = [GameItem.objects.get(pk=g.pk) for g in guesses]   # datos tal como están en BD
+        return build_attempts(self.game, fresh, GameItem.objects.get(pk=self.target.pk))
+
+    def test_stored_feedback_is_decoded_without_comparing(self):
+        expected = self.expected()
+        attempts = list(GameAttempt.objects.select_related("guess").order_by("pk"))
+        with mock.patch.object(comparison.ComparisonPlan, "compare", side_effect=AssertionError("compare")), \
+                self.assertNumQueries(0):
+            rows = attempt_history(self.game, attempts, self.target)
+        self.assertEqual(rows, expected)
+
+    def test_config_change_reencodes_only_stale_rows(self):
+        stale, fresh = GameAttempt.objects.order_by("pk")
+        GameAttempt.objects.filter(pk=stale.pk).update(feedback="0123456789abcdef:xx")
+
+        with mock.patch.object(GameAttempt.objects, "bulk_update", wraps=GameAttempt.objects.bulk_update) as update:
+            _, rows = self.history()
+        self.assertEqual([att.pk for att in update.call_args.args[0]], [stale.pk])
+        self.assertEqual(rows, self.expected())
+
+        plan = get_plan(self.game)
+        self.assertEqual(GameAttempt.objects.get(pk=stale.pk).feedback.partition(":")[0], plan.fingerprint)
+        self.assertEqual(GameAttempt.objects.get(pk=fresh.pk).feedback, fresh.feedback)
+
+    def test_item_edit_forgets_stored_feedback(self):
+        pikachu = self.items["Pikachu"]
+        pikachu.data = {**pikachu.data, "tipo": "fuego"}
+        GameItemAdmin(GameItem, admin.site).save_model(
+            RequestFactory().post("/"), pikachu, mock.Mock(changed_data=["data"]), change=True,
+        )
+        self.assertFalse(GameAttempt.objects.exclude(feedback="").exists())
+
+        _, rows = self.history()
+        self.assertTrue(rows[0]["feedback"][0]["correct"])   # tipo nuevo, acierto nuevo
+        self.assertEqual(rows, self.expected())
+
+
+class MetricsTests(GuessFixture, TestCase):
+    def sample(self, name, **labels):
+        return metrics.REGISTRY.get_sample_value(name, labels) or 0
+
+    @override_settings(MIDDLEWARE=["apps.common.metrics.MetricsMiddleware", *settings.MIDDLEWARE])
+    def test_guesses_latency_and_queries_are_exported(self):
+        labels = {"game": "poke", "session_type": "DAILY"}
+        before = {
+            outcome: self.sample("guessdle_guesses_total", outcome=outcome, **labels)
+            for outcome in ("ok", "duplicate")
+        }
+        wins = self.sample("guessdle_wins_total", **labels)
+        requests = self.sample("guessdle_request_latency_seconds_count", view="ajax_guess")
+        queries = self.sample("guessdle_request_db_queries_sum", view="ajax_guess")
+
+        self.client.login(username="ana", password="pw")
+        url = reverse("ajax_guess", args=[self.game.slug])
+        for guess in ("pikachu", "pikachu", "charmander"):
+            self.client.post(url, {"guess": guess})
+
+        self.assertEqual(self.sample("guessdle_guesses_total", outcome="ok", **labels) - before["ok"], 2)
+        self.assertEqual(self.sample("guessdle_guesses_total", outcome="duplicate", **labels) - before["duplicate"], 1)
+        self.assertEqual(self.sample("guessdle_wins_total", **labels) - wins, 1)
+        self.assertEqual(self.sample("guessdle_request_latency_seconds_count", view="ajax_guess") - requests, 3)
+        self.assertGreater(self.sample("guessdle_request_db_queries_sum", view="ajax_guess") - queries, 10)
+
+        request = RequestFactory().get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        with self.settings(METRICS_TOKEN="s3cret"):
+            body = metrics.metrics_view(request).content.decode()
+        self.assertIn('guessdle_cache_requests_total{layer="name_index",result="hit"}', body)
+
+    def test_endpoint_fails_closed(self):
+        request = RequestFactory().get("/metrics")
+        with self.settings(METRICS_TOKEN="s3cret"):
+            self.assertEqual(metrics.metrics_view(request).status_code, 403)
+
+        # Sin token configurado: ni público fuera de DEBUG ni para usuarios normales
+        request.user = self.user
+        with self.settings(METRICS_TOKEN="", DEBUG=False):
+            self.assertEqual(metrics.metrics_view(request).status_code, 403)
+            self.user.is_staff = True
+            self.assertEqual(metrics.metrics_view(request).status_code, 200)
+
+
+class DailyStatusTests(GuessFixture, TestCase):
+    def test_all_games_in_constant_queries(self):
+        self.pipeline().run("pikachu")
+        self.pipeline().run("charmander")
+        extra = ExtraDailyPlay.objects.create(user=self.user, game=self.game, target=self.items["Pikachu"])
+        for i in range(3):
+            Game.objects.create(name=f"g{i}", slug=f"g{i}", attributes=["tipo"], data_source_url="http://example.com")
+
+        with self.assertNumQueries(4):
+            statuses = DailyStatusService(self.user, is_team=False).for_games()
+
+        status = next(s for s in statuses if s.game == self.game)
+        self.assertEqual(
+            (status.target_id, status.attempt_count, status.solved, status.extra_id),
+            (self.daily.id, 2, True, extra.id),
+        )
+        self.assertEqual([s.target_id for s in statuses if s.game != self.game], [None] * 3)
+
+    def test_endpoint(self):
+        self.client.force_login(self.user)
+        self.pipeline().run("pikachu")
+        games = self.client.get(reverse("ajax_daily_status")).json()["games"]
+        self.assertEqual(games[0]["slug"], "poke")
+        self.assertEqual((games[0]["attempt_count"], games[0]["solved"]), (1, False))
+
+
+class GameCatalogEndpointTests(TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(
+            name="Poke", slug="poke", attributes=["tipo"], data_source_url="http://example.com",
+        )
+        for name in ("Pikachu", "Charmander"):
+            GameItem.objects.create(game=self.game, name=name, data={"tipo": "x"})
+        names._CATALOGS.clear()
+        names._PAYLOADS.clear()
+        self.url = f"{reverse('game_catalog', args=[self.game.slug])}?v={names.catalog_token(self.game)}"
+
+    def test_gzip_etag_and_not_modified(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("max-age=86400", response["Cache-Control"])
+        self.assertIn("public", response["Cache-Control"])
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(data["names"], ["Pikachu", "Charmander"])
+        self.assertEqual(data["version"], 0)
+
+        etag = response["ETag"]
+        with self.assertNumQueries(1):   # solo el Game: el payload sale de memoria
+            cached = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        plain = self.client.get(self.url)
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertNotEqual(plain["ETag"], etag)
+
+    def test_version_bump_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.game.bump_catalog_version()
+        url = f"{reverse('game_catalog', args=[self.game.slug])}?v={names.catalog_token(self.game)}"
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_stale_token_redirects_without_caching(self):
+        self.game.bump_catalog_version()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response["Location"].endswith(f"?v={names.catalog_token(self.game)}"))
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        data = self.client.get(response["Location"]).json()
+        self.assertEqual(data["version"], 1)
+
+    def test_without_token_always_revalidates(self):
+        response = self.client.get(reverse("game_catalog", args=[self.game.slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertNotIn("max-age=86400", response["Cache-Control"])
+
+
+class NameIndexTests(TestCase):
+    def setUp(self):
+        catalog = names.NameCatalog(0, [
+            (1, "Pikachu", None), (2, "Raichu", None), (3, "Pokémon X", None),
+            (4, "Pichu", None), (5, "Charmander", None),
+        ])
+        self.index = NameIndex(catalog)
+
+    def test_fold(self):
+        self.assertEqual(fold("  Pokémon   X "), "pokemon x")
+
+    def test_resolve_and_typos(self):
+        self.assertEqual(self.index.resolve("POKEMON x"), 2)
+        self.assertIsNone(self.index.resolve("pika"))
+        self.assertEqual(self.index.best_match("pikachuu"), 0)
+        self.assertEqual(self.index.best_match("charmandr"), 4)
+        self.assertIsNone(self.index.best_match("zzz"))
+
+    def test_suggest_prefix_first(self):
+        self.assertEqual(self.index.suggest("pi", 2), [3, 0])   # orden alfabético: pichu, pikachu
+        self.assertIn(1, self.index.suggest("aichu"))
+
+
+class NamesEndpointTests(GuessFixture, TestCase):
+    def test_requires_login(self):
+        url = reverse("ajax_names", args=[self.game.slug])
+        self.assertEqual(self.client.get(url, {"q": "pika"}).status_code, 302)
+
+        self.client.force_login(self.user)
+        data = self.client.get(url, {"q": "pikachuu"}).json()
+        self.assertEqual((data["match"], data["exact"]), ("Pikachu", False))
+
+
+class ComparisonPlanTests(TestCase):
+    """
+    El plan compilado da el mismo feedback que la comparación atributo a
+    atributo que sustituyó (``reference``), con y sin proyección guardada,
+    y el motor columnar los mismos códigos que el plan.
+    """
+    ITEMS = [
+        {"tipo_1": "Fuego", "tipo_2": "Volador", "rol": "ataque, defensa", "altura": "1,7", "peso": "90.5"},
+        {"tipo_1": "volador", "tipo_2": None, "rol": "Ataque", "altura": "1.7", "peso": "n/a"},
+        {"tipo_1": "Agua", "altura": 2, "peso": "1.200,5"},                 # rol y tipo_2 ausentes
+        {"tipo_1": "", "tipo_2": "fuego", "rol": ["defensa", "Ataque"], "altura": "0,4"},
+    ]
+
+    def setUp(self):
+        self.game = Game.objects.create(
+            name="Poke", slug="poke", data_source_url="http://example.com",
+            attributes=["tipo_1", "tipo_2", "rol", "altura", "peso"],
+            numeric_fields=["altura", "peso"],
+            grouped_attributes=["tipo_1", "tipo_2"],
+            defaults={"rol": "ninguno"},
+        )
+        self.items = [GameItem(game=self.game, name=f"i{n}", data=data) for n, data in enumerate(self.ITEMS)]
+
+    @staticmethod
+    def reference(game, guess, target):
+        lower = lambda value: {str(v).lower() for v in to_list(value)}
+        cells = []
+        for attr in game.attributes:
+            g_val = guess.get(attr) or game.defaults.get(attr)
+            t_val = target.get(attr) or game.defaults.get(attr)
+            partial, fb = False, {"hint": "", "arrow": ""}
+            if attr in game.numeric_fields:
+                match = parse_to_float(g_val) == parse_to_float(t_val)
+                if not match:
+                    fb = numeric_feedback(parse_to_float(g_val), parse_to_float(t_val))
+            else:
+                g_set, t_set = lower(g_val), lower(t_val)
+                if g_set and t_set:
+                    match = g_set == t_set
+                    partial = not match and bool(g_set & t_set)
+                else:
+                    match = g_val == t_val
+                if not match and not partial and attr in game.grouped_attributes:
+                    group = {v for a in game.grouped_attributes for v in lower(target.get(a) or game.defaults.get(a))}
+                    partial = bool(g_set & group)
+            cells.append({"attribute": attr, "value": g_val, "correct": match, "partial": partial, **fb})
+        return cells
+
+    def test_matches_per_attribute_comparison(self):
+        plan = get_plan(self.game)
+        projected = [GameItem(game=self.game, name=i.name, data=i.data, normalized=plan.project(i.data))
+                     for i in self.items]
+        for guess, guess_projected in zip(self.items, projected):
+            for target in self.items:
+                expected = self.reference(self.game, guess.data, target.data)
+                for side in (plan.side(guess), plan.side(guess_projected)):
+                    cells = plan.compare(side, plan.side(target))
+                    self.assertEqual([cell.as_dict() for cell in cells], expected)
+
+    def test_encode_decode_round_trip(self):
+        plan = get_plan(self.game)
+        for guess in self.items:
+            side = plan.side(guess)
+            for target in self.items:
+                cells = plan.compare(side, plan.side(target))
+                self.assertEqual(plan.decode(plan.encode(cells), side), cells)
+
+        encoded = plan.encode(plan.compare(plan.side(self.items[0]), plan.side(self.items[1])))
+        self.game.numeric_fields = ["altura"]
+        self.game.save()
+        self.assertIsNone(get_plan(self.game).decode(encoded, plan.side(self.items[0])))
+
+    def test_cached_plan_uses_stored_fingerprint(self):
+        plan = get_plan(self.game)
+        with mock.patch.object(comparison, "plan_fingerprint", side_effect=AssertionError("hash")):
+            self.assertIs(get_plan(self.game), plan)
+        self.game.defaults = {}
+        self.game.save()
+        self.assertIsNot(get_plan(self.game), plan)
+
+    def test_columnar_engine_matches_plan(self):
+        plan = get_plan(self.game)
+        # Más de 64 valores en un atributo: bitsets de varias palabras
+        extra = [{"tipo_1": "Agua", "rol": [f"r{i}", f"r{i + 1}"], "peso": i} for i in range(0, 70, 2)]
+        items = self.items + [GameItem(game=self.game, name=f"x{n}", data=data) for n, data in enumerate(extra)]
+        sides = [plan.side(item) for item in items]
+        catalog = ColumnarCatalog(plan, range(len(items)), [i.name for i in items], sides)
+
+        for g, guess_side in enumerate(sides):
+            codes = catalog.feedback_codes(g)
+            for t, target_side in enumerate(sides):
+                cells = plan.compare(guess_side, target_side)
+                self.assertEqual(list(codes[t]), [cell.flags for cell in cells])
+                self.assertEqual(plan.decode(catalog.encode_pair(g, t), guess_side), cells)
+
+
+class HintTests(TestCase):
+    """
+    Los bitmaps del índice de pistas dejan exactamente los ítems que, con
+    cada intento, habrían dado el mismo feedback que el objetivo
+    (``build_attempts``), y la consulta de pistas no abre partida.
+    """
+    ITEMS = ComparisonPlanTests.ITEMS + [
+        {"tipo_1": "Fuego", "tipo_2": None, "rol": "defensa", "altura": "1,7", "peso": "12"},
+        {"tipo_1": "Planta", "tipo_2": "Veneno", "rol": "apoyo", "altura": "0.7", "peso": "6,9"},
+        {"tipo_1": "Veneno", "tipo_2": "Planta", "rol": "ataque", "altura": "2", "peso": "90.5"},
+    ]
+
+    def setUp(self):
+        self.game = Game.objects.create(
+            name="Poke", slug="poke", data_source_url="http://example.com",
+            attributes=["tipo_1", "tipo_2", "rol", "altura", "peso"],
+            numeric_fields=["altura", "peso"],
+            grouped_attributes=["tipo_1", "tipo_2"],
+            defaults={"rol": "ninguno"},
+        )
+        self.items = [
+            GameItem.objects.create(game=self.game, name=f"i{n}", data={"id": n, **data})
+            for n, data in enumerate(self.ITEMS)
+        ]
+        self.user = User.objects.create_user("ana", password="pw")
+        # Los pks se reutilizan entre tests: catálogos e índices en memoria se recargan
+        columnar._CATALOGS.clear()
+        hints._INDEXES.clear()
+
+    def feedback(self, guess, target):
+        return [
+            (cell["correct"], cell["partial"], cell.get("arrow"))
+            for cell in build_attempts(self.game, [guess], target)[0]["feedback"]
+        ]
+
+    def expected(self, guesses, target):
+        return [
+            item.name for item in self.items
+            if item not in guesses
+            and all(self.feedback(g, item) == self.feedback(g, target) for g in guesses)
+        ]
+
+    def test_bitmaps_match_build_attempts(self):
+        index = hints.get_hint_index(self.game)
+        catalog = index.catalog
+        for target in self.items:
+            t = catalog.position(target.pk)
+            for guesses in ([self.items[0]], [self.items[4], self.items[1]], self.items[2:5]):
+                clues = [(catalog.position(g.pk), catalog.feedback_pair(catalog.position(g.pk), t))
+                         for g in guesses]
+                exclude = [catalog.position(g.pk) for g in guesses]
+                positions = index.candidates(clues, exclude=exclude)
+                self.assertEqual([catalog.names[p] for p in positions], self.expected(guesses, target))
+
+    def test_hint_endpoint_reads_session_without_creating_it(self):
+        target = self.items[5]
+        daily = DailyTarget.objects.create(game=self.game, target=target, date=timezone.localdate())
+        self.client.force_login(self.user)
+        url = reverse("ajax_hint", args=[self.game.slug])
+
+        data = self.client.get(url).json()
+        self.assertFalse(PlaySession.objects.exists())
+        self.assertEqual(data["remaining"], len(self.items))
+
+        guess = self.items[0]
+        session = PlaySession.objects.create(
+            user=self.user, game=self.game, session_type=PlaySessionType.DAILY, reference_id=daily.pk,
+        )
+        GameAttempt.objects.create(
+            user=self.user, game=self.game, session=session, guess=guess, is_correct=False,
+            feedback=build_attempt(self.game, guess, target)[1],
+        )
+        data = self.client.get(url).json()
+        self.assertEqual(data["candidates"], self.expected([guess], target))
+
+
+class DifficultyTests(TestCase):
+    """
+    Solver y puntuación de dificultad: deterministas, con valores conocidos
+    en un catálogo pequeño, y siempre sobre el catálogo entero.
+    """
+
+    def setUp(self):
+        self.game = Game.objects.create(
+            name="Letras", slug="letras", data_source_url="http://example.com",
+            attributes=["tipo"], field_mapping={"tipo": "tipo"},
+        )
+        self.items = [
+            GameItem.objects.create(game=self.game, name=name, data={"tipo": name.lower()})
+            for name in ("A", "B", "C")
+        ]
+        columnar._CATALOGS.clear()
+
+    def scores(self):
+        return {
+            d.item.name: (d.expected_guesses, d.worst_guesses)
+            for d in ItemDifficulty.objects.select_related("item")
+        }
+
+    def test_known_expected_guesses(self):
+        # Ningún intento da pistas: el solver prueba por orden desde cada apertura
+        self.assertEqual(DifficultyScorer(self.game).score(), 3)
+        self.assertEqual(self.scores(), {"A": (1.667, 2), "B": (2.0, 3), "C": (2.333, 3)})
+        self.assertFalse(DifficultyScorer(self.game).is_stale())
+
+    def test_solver_is_deterministic(self):
+        game = Game.objects.create(
+            name="Poke", slug="poke", data_source_url="http://example.com",
+            attributes=["tipo_1", "tipo_2", "rol", "altura", "peso"],
+            numeric_fields=["altura", "peso"], grouped_attributes=["tipo_1", "tipo_2"],
+        )
+        for n, data in enumerate(HintTests.ITEMS):
+            GameItem.objects.create(game=game, name=f"i{n}", data=data)
+        catalog = columnar.get_catalog(game)
+
+        runs = [[GreedySolver(catalog).depths(o) for o in range(catalog.size)] for _ in range(2)]
+        for first, second in zip(*runs):
+            self.assertEqual(list(first), list(second))
+
+        DifficultyScorer(game).score()
+        before = self.scores()
+        DifficultyScorer(game).score()
+        self.assertEqual(self.scores(), before)
+
+    def test_targets_explore_same_tree_as_full_run(self):
+        for name in ("D", "E", "F"):
+            GameItem.objects.create(game=self.game, name=name, data={"tipo": "a, b" if name == "F" else name.lower()})
+        solver = GreedySolver(columnar.get_catalog(self.game))
+        for opener in range(6):
+            full = solver.depths(opener)
+            for targets in ([0], [2, 5], [1, 3, 4]):
+                self.assertEqual(list(solver.depths(opener, targets)[targets]), list(full[targets]))
+
+    def test_new_items_change_existing_difficulty(self):
+        DifficultyScorer(self.game).score()
+        request = RequestFactory().post("/")
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        GameAdmin(Game, admin.site)._process_items(request, self.game, [{"name": "D", "tipo": "d"}])
+
+        # El sync no puntúa: solo deja la dificultad desfasada
+        scorer = DifficultyScorer(self.game)
+        self.assertTrue(scorer.is_stale())
+        self.assertEqual(ItemDifficulty.objects.count(), 3)
+
+        self.assertEqual(scorer.score(), 4)
+        self.assertFalse(scorer.is_stale())
+        self.assertEqual(self.scores()["A"], (1.75, 2))
+
+
+DISTRIBUTION = {
+    "default": {
+        "normal": {"easy": 0.5, "medium": 0.3, "hard": 0.2},
+        "team":   {"easy": 0.2, "medium": 0.4, "hard": 0.4},
+    },
+    "letras": {"team": {"medium": 0}},
+}
+
+
+@override_settings(DAILY_TARGET_DIFFICULTY=DISTRIBUTION)
+class DifficultySamplerTests(TestCase):
+    """Sorteo de objetivos por tramos de dificultad con un generador con semilla."""
+
+    def setUp(self):
+        self.game = Game.objects.create(
+            name="Letras", slug="letras", data_source_url="http://example.com", attributes=["tipo"],
+        )
+        self.items = [
+            GameItem.objects.create(game=self.game, name=f"i{n:02}", data={"tipo": str(n)})
+            for n in range(30)
+        ]
+
+    def score_all(self):
+        for n, item in enumerate(self.items):
+            ItemDifficulty.objects.create(item=item, expected_guesses=n + 1, worst_guesses=n + 1)
+
+    def draws(self, sampler, count=6000):
+        return [sampler.draw() for _ in range(count)]
+
+    def test_distribution_from_settings_with_slug_override(self):
+        self.assertEqual(difficulty_distribution(self.game, False), {"easy": 0.5, "medium": 0.3, "hard": 0.2})
+        self.assertEqual(difficulty_distribution(self.game, True), {"easy": 0.2, "medium": 0.0, "hard": 0.4})
+
+    def test_seeded_draws_follow_bucket_shares(self):
+        self.score_all()
+        sampler = DifficultySampler(self.game, rng=random.Random(7))
+        self.assertEqual({b: len(m) for b, m in sampler.buckets.items()}, {"easy": 10, "medium": 10, "hard": 10})
+
+        draws = self.draws(sampler)
+        self.assertEqual(draws, self.draws(DifficultySampler(self.game, rng=random.Random(7))))
+        bucket_of = {item.pk: bucket for bucket, members in sampler.buckets.items() for item in members}
+        for bucket, share in DISTRIBUTION["default"]["normal"].items():
+            observed = sum(bucket_of[item.pk] == bucket for item in draws) / len(draws)
+            self.assertAlmostEqual(observed, share, delta=0.03)
+
+    def test_empty_buckets_give_their_share_to_the_rest(self):
+        # Sin dificultad calculada todo es «medio»: fácil y difícil quedan vacíos
+        sampler = DifficultySampler(self.game, rng=random.Random(7))
+        draws = self.draws(sampler)
+        self.assertEqual({item.pk for item in draws}, {item.pk for item in self.items})
+
+    def test_falls_back_to_uniform_without_weighted_buckets(self):
+        # Pista de equipo: el único tramo con ítems («medio») tiene peso 0
+        sampler = DifficultySampler(self.game, is_team=True, rng=random.Random(7))
+        self.assertEqual(sampler.items, self.items)
+        counts = Counter(item.pk for item in self.draws(sampler))
+        self.assertEqual(len(counts), len(self.items))
+        self.assertLess(max(counts.values()) / min(counts.values()), 2)
+
+
+class ImageManifestTests(TestCase):
+    """Manifiesto de imágenes sobre el storage: hashes, URLs con ``?v=`` e invalidación."""
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        storage = override_settings(
+            MEDIA_ROOT=media,
+            STORAGES={**settings.STORAGES, "default": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": media, "base_url": "/media/"},
+            }},
+        )
+        storage.enable()
+        self.addCleanup(storage.disable)
+
+        self.game = Game.objects.create(
+            name="Poke", slug="poke", data_source_url="http://example.com", attributes=["tipo"],
+        )
+        self.item = GameItem.objects.create(game=self.game, name="Pikachu", data={"id": 25, "tipo": "eléctrico"})
+        images._MANIFESTS.clear()
+
+    def test_build_manifest_hashes_png_files(self):
+        h25 = images.save_image(self.game, "25.png", b"pika")
+        h4 = images.save_image(self.game, "4.png", b"char")
+        images.save_image(self.game, "notas.txt", b"no es una imagen")
+        self.assertEqual(images.build_manifest(self.game), {"25": h25, "4": h4})
+        self.assertEqual(h25, images.content_hash(b"pika"))
+
+    def test_urls_carry_content_hash(self):
+        digest = images.save_image(self.game, "25.png", b"pika")
+        manifest_hash, count = images.refresh_manifest(self.game)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(Game.objects.get().image_manifest_hash, manifest_hash)
+        self.assertEqual(images.image_url(self.game, 25), f"/media/game_item_images/poke/25.png?v={digest}")
+        self.assertIsNone(images.image_url(self.game, 4))
+        self.assertIsNone(images.image_url(self.game, None))
+
+    def test_merge_keeps_existing_entries(self):
+        old = images.save_image(self.game, "25.png", b"pika")
+        images.refresh_manifest(self.game)
+        new = images.save_image(self.game, "4.png", b"char")
+        images.merge_manifest(self.game, [("4", new)])
+
+        self.assertIn(f"?v={old}", images.image_url(self.game, 25))
+        self.assertIn(f"?v={new}", images.image_url(self.game, 4))
+
+    def test_listing_fallback_without_manifest(self):
+        images.save_image(self.game, "25.png", b"pika")
+        self.assertEqual(self.game.image_manifest_hash, "")
+        self.assertEqual(images.image_url(self.game, 25), "/media/game_item_images/poke/25.png")
+
+    def test_manifest_hash_invalidates_memory_cache(self):
+        images.save_image(self.game, "25.png", b"pika")
+        images.refresh_manifest(self.game)
+        stale = Game.objects.get()
+        first = images.image_url(stale, 25)
+
+        digest = images.save_image(self.game, "25.png", b"raichu")
+        images.merge_manifest(self.game, [("25", digest)])
+        self.assertEqual(images.image_url(stale, 25), first)   # su hash aún es el viejo
+
+        stale.refresh_from_db()
+        self.assertTrue(images.image_url(stale, 25).endswith(f"?v={digest}"))
+
+    def test_item_image_url_with_game_needs_no_query(self):
+        images.save_image(self.game, "25.png", b"pika")
+        images.refresh_manifest(self.game)
+        item = GameItem.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(item.get_image_url(self.game), images.image_url(self.game, 25))
+
+
+class GoldenCorpusTests(SimpleTestCase):
+    """
+    El motor de feedback reproduce exactamente el corpus dorado
+    (``apps/games/bench/golden_corpus.json``), generado con la
+    implementación original de ``build_attempts``.
+    """
+
+    def runs(self):
+        corpus = golden.load_corpus()
+        self.assertTrue(corpus["cases"])
+        for n, case in enumerate(corpus["cases"]):
+            game, items = golden._build(case)
+            for run in case["runs"]:
+                yield n, game, items, run
+
+    def test_build_attempts_matches_corpus(self):
+        for n, game, items, run in self.runs():
+            with self.subTest(case=n, target=run["target"]):
+                self.assertEqual(golden._run(game, items, run), run["expected"])
+
+    def test_plan_compare_matches_corpus(self):
+        for n, game, items, run in self.runs():
+            plan = get_plan(game)
+            target = plan.side(items[run["target"]])
+            for i, expected in zip(run["guesses"], run["expected"]):
+                guess = items[i]
+                projected = GameItem(game=game, name=guess.name, data=guess.data, normalized=plan.project(guess.data))
+                with self.subTest(case=n, target=run["target"], guess=i):
+                    for side in (plan.side(guess), plan.side(projected)):
+                        cells = plan.compare(side, target)
+                        self.assertEqual([cell.as_dict() for cell in cells], expected["feedback"])
+                        self.assertEqual(plan.decode(plan.encode(cells), side), cells)
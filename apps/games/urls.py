@@ -1,16 +1,24 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
-from .views import play_view, start_extra_daily, play_extra_daily, ajax_guess_extra
+from . import async_views, views
+from .views import play_view, start_extra_daily, play_extra_daily
 from django.contrib.auth import views as auth_views
 
+# Endpoints de intento/estado: async bajo ASGI (GUESSDLE_ASYNC_VIEWS) o síncronos
+guess_views = async_views if settings.GUESSDLE_ASYNC_VIEWS else views
 
 urlpatterns = [
     path('play/<slug:slug>/', play_view, name='play'),
-    path("<slug:slug>/guess/", views.ajax_guess, name="ajax_guess"),
+    path("daily-status/", views.ajax_daily_status, name="ajax_daily_status"),
+    path("<slug:slug>/guess/", guess_views.ajax_guess, name="ajax_guess"),
+    path("<slug:slug>/state/", guess_views.ajax_state, name="ajax_state"),
+    path("<slug:slug>/hint/", views.ajax_hint, name="ajax_hint"),
+    path("<slug:slug>/catalog/", views.game_catalog, name="game_catalog"),
+    path("<slug:slug>/names/", views.ajax_names, name="ajax_names"),
     path("start-extra/<slug:slug>/", start_extra_daily, name="start_extra_daily"),
     path("play-extra/<int:extra_id>/", play_extra_daily, name="play_extra_daily"),
-    path("ajax/guess-extra/<int:extra_id>/", ajax_guess_extra, name="ajax_guess_extra"),
+    path("ajax/guess-extra/<int:extra_id>/", guess_views.ajax_guess_extra, name="ajax_guess_extra"),
 
 
 ]
@@ -1,32 +1,79 @@
 from __future__ import annotations
 
-import json
 from datetime import date
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.timezone import now, localtime
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_protect
-from django.views.decorators.http import require_POST
+from django.utils.cache import add_never_cache_headers, patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET, require_POST
 
 from apps.accounts.models import Challenge
 from apps.games.models import Game, ExtraDailyPlay, GameAttempt
+from apps.games.services.catalog.name_index import get_name_index
+from apps.games.services.catalog.names import get_catalog_payload
 from apps.games.services.gameplay.challenge_view_helper import ChallengeViewHelper
 from apps.games.services.gameplay.extra_daily_service import ExtraDailyService
 from apps.games.services.gameplay.play_session_service import PlaySessionService
 from apps.games.services.gameplay.challenger_manager import ChallengeManager
 from apps.games.services.gameplay.context_builder import ContextBuilder
+from apps.games.services.gameplay.daily_status_service import DailyStatusService
+from apps.games.services.gameplay.guess_pipeline import GuessPipeline
 from apps.games.services.gameplay.guess_processor import GuessProcessor
+from apps.games.services.gameplay.hint_service import HintService
 from apps.games.services.gameplay.result_updater import ResultUpdater
 from apps.games.services.gameplay.target_service import TargetService
 
 # Nuevo: ChallengeResolutionService
 from apps.games.services.gameplay.challenge_resolution_service import ChallengeResolutionService
 
+_GUESS_ERRORS = {
+    GuessPipeline.FINISHED:  ("No puedes jugar más.", 403),
+    GuessPipeline.INVALID:   ("Intento inválido", 400),
+    GuessPipeline.DUPLICATE: ("Intento inválido", 400),
+}
+
+
+def _guess_response(request, outcome):
+    """
+    Respuesta AJAX común: solo la fila nueva y el estado, no el historial
+    completo.  Los nombres van como delta sobre el catálogo del cliente.
+    """
+    if not outcome.valid:
+        error, status = _GUESS_ERRORS[outcome.status]
+        return JsonResponse({"error": error}, status=status)
+
+    attempt_row = outcome.attempt
+    return JsonResponse({
+        "won": outcome.correct,
+        "attempt": {
+            "name":     attempt_row["name"],
+            "icon":     attempt_row.get("icon"),
+            "feedback": attempt_row["feedback"],
+            "guess_image_url": attempt_row.get("guess_image_url"),
+        },
+        "attempt_count": outcome.attempt_count,
+        **outcome.names_update(request.POST.get("catalog_version")),
+    })
+
+
+def _state_response(outcome):
+    """Estado de la partida para el cliente: contador, victoria e índices usados."""
+    catalog = outcome.catalog
+    return JsonResponse({
+        "won": outcome.correct,
+        "attempt_count": outcome.attempt_count,
+        "catalog_version": catalog.version,
+        "removed": catalog.positions(outcome.guessed_ids),
+    })
+
+
 # ------------------------------------------------------------------ #
 # 1) AJAX – partida diaria
 # ------------------------------------------------------------------ #
@@ -44,26 +91,126 @@ def ajax_guess(request, slug: str):
     if not daily_target:
         return JsonResponse({"error": "No hay objetivo diario."}, status=400)
 
-    ctx = ContextBuilder(request, game, daily_target=daily_target).build()
-    if not ctx["can_play"]:
-        return JsonResponse({"error": "No puedes jugar más."}, status=403)
+    pipeline = GuessPipeline(game, user, daily_target=daily_target)
+    return _guess_response(request, pipeline.run(request.POST.get("guess", "")))
 
-    valid, correct = GuessProcessor(game, user).process(request, daily_target=daily_target)
-    if not valid:
-        return JsonResponse({"error": "Intento inválido"}, status=400)
 
-    ctx = ContextBuilder(request, game, daily_target=daily_target).build()
-    last_attempt = ctx["attempts"][0]
+@login_required
+@never_cache
+def ajax_state(request, slug: str):
+    game = get_object_or_404(Game, slug=slug)
+    daily_target = TargetService(game, request.user).get_target_for_today()
+    if not daily_target:
+        return JsonResponse({"error": "No hay objetivo diario."}, status=400)
+
+    return _state_response(GuessPipeline(game, request.user, daily_target=daily_target).state())
+
+
+# ------------------------------------------------------------------ #
+# 1a) AJAX – estado del daily de hoy en todos los juegos
+# ------------------------------------------------------------------ #
+@login_required
+@never_cache
+def ajax_daily_status(request):
+    """Estado del daily de hoy en todos los juegos activos (DailyStatusService)."""
+    statuses = DailyStatusService(request.user).for_games()
+    return JsonResponse({"games": [status.as_dict() for status in statuses]})
+
+
+# ------------------------------------------------------------------ #
+# 1b) AJAX – pista: candidatos compatibles con el feedback de hoy
+# ------------------------------------------------------------------ #
+@login_required
+@never_cache
+def ajax_hint(request, slug: str):
+    game = get_object_or_404(Game, slug=slug)
+    daily_target = TargetService(game, request.user).get_target_for_today()
+    if not daily_target:
+        return JsonResponse({"error": "No hay objetivo diario."}, status=400)
+
+    try:
+        limit = int(request.GET.get("limit", 25))
+    except ValueError:
+        limit = 25
 
+    # Una consulta de pistas no abre partida: sin sesión, todo el catálogo
+    session = PlaySessionService.find(request.user, game, daily_target=daily_target)
+    return JsonResponse(HintService(game).candidates(session, daily_target.target, limit=limit))
+
+
+# ------------------------------------------------------------------ #
+# 1c) Catálogo de ítems (nombres + imágenes), cacheable todo el día
+# ------------------------------------------------------------------ #
+CATALOG_MAX_AGE = 60 * 60 * 24
+
+
+@require_GET
+def game_catalog(request, slug: str):
+    """
+    JSON precomprimido del catálogo del juego.  La URL lleva ``?v=<token>``
+    y el ETag fuerte cambia con la versión del catálogo, así que navegador y
+    proxy pueden guardarlo un día entero sin servir datos viejos.  Un ``v``
+    viejo redirige (sin cachear) a la URL vigente, para que nunca quede el
+    catálogo nuevo guardado bajo la URL vieja; sin ``v`` se revalida siempre.
+    """
+    game = get_object_or_404(Game, slug=slug)
+    payload = get_catalog_payload(game)
+
+    token = request.GET.get("v")
+    if token is not None and token != payload.token:
+        response = redirect(f"{request.path}?v={payload.token}")
+        add_never_cache_headers(response)
+        return response
+
+    gzipped = "gzip" in request.headers.get("Accept-Encoding", "")
+    etag = payload.etag(gzipped)
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(
+            payload.gzip_body if gzipped else payload.body,
+            content_type="application/json",
+        )
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+
+    response["ETag"] = etag
+    if token is None:
+        patch_cache_control(response, public=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=CATALOG_MAX_AGE)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+# ------------------------------------------------------------------ #
+# 1d) Autocompletado y corrección de erratas de nombres
+# ------------------------------------------------------------------ #
+@require_GET
+@login_required
+def ajax_names(request, slug: str):
+    """
+    Sugerencias para ``?q=`` (prefijo + trigramas) y, si la hay, la
+    resolución del texto: exacta (sin mayúsculas/acentos) o corregida.
+    """
+    game = get_object_or_404(Game, slug=slug)
+    index = get_name_index(game)
+    query = request.GET.get("q", "")[:100]
+
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), 50))
+    except ValueError:
+        limit = 10
+
+    names = index.catalog.names
+    exact = index.resolve(query)
+    match = exact if exact is not None else index.best_match(query)
     return JsonResponse({
-        "won": correct,
-        "attempt": {
-            "name":     last_attempt["name"],
-            "icon":     last_attempt.get("icon"),
-            "feedback": last_attempt["feedback"],
-            "guess_image_url": last_attempt.get("guess_image_url"),
-        },
-        "remaining_names": json.loads(ctx["remaining_names_json"]),
+        "query": query,
+        "match": names[match] if match is not None else None,
+        "exact": exact is not None,
+        "suggestions": [names[pos] for pos in index.suggest(query, limit)],
     })
 
 
@@ -86,37 +233,25 @@ def play_view(request, slug: str):
     is_ajax = request.headers.get("x-requested-with") == "XMLHttpRequest"
 
     if request.method == "POST":
+        if is_ajax:
+            pipeline = GuessPipeline(game, user, daily_target=daily_target)
+            return _guess_response(request, pipeline.run(request.POST.get("guess", "")))
+
         ctx = ContextBuilder(request, game, daily_target=daily_target).build()
         if not ctx["can_play"]:
-            if is_ajax:
-                return JsonResponse({"error": "No puedes jugar más."}, status=403)
             messages.error(request, "No puedes jugar más.")
             return render(request, "games/play.html", ctx)
 
-        valid, correct = GuessProcessor(game, user).process(request, daily_target=daily_target)
+        processor = GuessProcessor(game, user)
+        valid, correct = processor.process(request, daily_target=daily_target)
         if not valid:
-            if is_ajax:
-                return JsonResponse({"error": "Intento inválido"}, status=400)
             messages.error(request, "Intento inválido o repetido.")
             return render(request, "games/play.html", ctx)
 
         ctx = ContextBuilder(request, game, daily_target=daily_target).build()
-        last_attempt = ctx["attempts"][0]
         if correct:
             ctx["won"] = True
             ctx["target"] = daily_target
-
-        if is_ajax:
-            return JsonResponse({
-                "won": correct,
-                "attempt": {
-                    "name":     last_attempt["name"],
-                    "icon":     last_attempt.get("icon"),
-                    "feedback": last_attempt["feedback"],
-                    "guess_image_url": last_attempt.get("guess_image_url"),
-                },
-                "remaining_names": json.loads(ctx["remaining_names_json"]),
-            })
         return render(request, "games/play.html", ctx)
 
     ctx = ContextBuilder(request, game, daily_target=daily_target).build()
@@ -179,32 +314,14 @@ def play_challenge(request, challenge_id: int):
 @never_cache
 @csrf_protect
 def ajax_guess_challenge(request, challenge_id: int):
-    challenge = get_object_or_404(Challenge, pk=challenge_id)
-    if request.user not in (challenge.challenger, challenge.opponent):
+    challenge = get_object_or_404(Challenge.objects.select_related("game", "target"), pk=challenge_id)
+    if request.user.id not in (challenge.challenger_id, challenge.opponent_id):
         return JsonResponse({"error": "No autorizado."}, status=403)
+    if not challenge.target:
+        return JsonResponse({"error": "El reto aún no tiene objetivo."}, status=400)
 
-    game = challenge.game
-    ctx = ContextBuilder(request, game, challenge=challenge).build()
-    if not ctx["can_play"]:
-        return JsonResponse({"error": "No puedes jugar más."}, status=403)
-
-    valid, correct = GuessProcessor(game, request.user).process(request, challenge=challenge)
-    if not valid:
-        return JsonResponse({"error": "Intento inválido"}, status=400)
-
-    ctx = ContextBuilder(request, game, challenge=challenge).build()
-    last_attempt = ctx["attempts"][0]
-
-    return JsonResponse({
-        "won": correct,
-        "attempt": {
-            "name":     last_attempt["name"],
-            "icon":     last_attempt.get("icon"),
-            "feedback": last_attempt["feedback"],
-            "guess_image_url": last_attempt.get("guess_image_url"),
-        },
-        "remaining_names": json.loads(ctx["remaining_names_json"]),
-    })
+    pipeline = GuessPipeline(challenge.game, request.user, challenge=challenge)
+    return _guess_response(request, pipeline.run(request.POST.get("guess", "")))
 
 
 # ------------------------------------------------------------------ #
@@ -278,27 +395,9 @@ def play_extra_daily(request, extra_id: int):
 @never_cache
 @csrf_protect
 def ajax_guess_extra(request, extra_id: int):
-    extra = get_object_or_404(ExtraDailyPlay, pk=extra_id, user=request.user)
-    game = extra.game
+    extra = get_object_or_404(
+        ExtraDailyPlay.objects.select_related("game", "target"), pk=extra_id, user=request.user
+    )
 
-    ctx = ContextBuilder(request, game, extra_play=extra).build()
-    if not ctx["can_play"]:
-        return JsonResponse({"error": "No puedes jugar más."}, status=403)
-
-    valid, correct = GuessProcessor(game, request.user).process(request, extra_play=extra)
-    if not valid:
-        return JsonResponse({"error": "Intento inválido"}, status=400)
-
-    ctx = ContextBuilder(request, game, extra_play=extra).build()
-    last_attempt = ctx["attempts"][0]
-
-    return JsonResponse({
-        "won": correct,
-        "attempt": {
-            "name":     last_attempt["name"],
-            "icon":     last_attempt.get("icon"),
-            "feedback": last_attempt["feedback"],
-            "guess_image_url": last_attempt.get("guess_image_url"),
-        },
-        "remaining_names": json.loads(ctx["remaining_names_json"]),
-    })
+    pipeline = GuessPipeline(extra.game, request.user, extra_play=extra)
+    return _guess_response(request, pipeline.run(request.POST.get("guess", "")))
@@ -1,6 +1,5 @@
 import os
 import sys
-from django.db.models import Sum
 import django
 import discord
 from discord.ext import commands
@@ -22,9 +21,10 @@ django.setup()
 # Importar modelos
 from django.contrib.auth.models import User
 from apps.games.models import Game
-from apps.accounts.models import GameElo
+from apps.accounts.services.leaderboard import LeaderboardService
+from apps.games.services.gameplay.daily_status_service import DailyStatusService
 
-from django.db.models import Avg
+RANKING_SIZE = 10  # Filas que se piden a la clasificación materializada
 
 # Crear bot
 intents = discord.Intents.default()
@@ -53,15 +53,12 @@ MAX_USER_W = 25  # Máximo ancho para contenido de nombre de usuario
 MIN_USER_W = max(len(USER_HEADER_TEXT), 10) # Mínimo ancho para contenido de nombre de usuario
 
 
-def _generar_tabla_ranking(ranking_data, is_global_ranking=False):
+def _generar_tabla_ranking(ranking_data):
     if not ranking_data:
         # Esto normalmente lo maneja formatear_ranking, pero por si acaso.
         return "No hay datos de ranking para mostrar."
 
-    usernames = [
-        item['user__username'] if is_global_ranking else item.user.username
-        for item in ranking_data
-    ]
+    usernames = [item['username'] for item in ranking_data]
     
     max_data_username_len = 0
     if usernames:
@@ -92,13 +89,12 @@ def _generar_tabla_ranking(ranking_data, is_global_ranking=False):
     bottom_border = f"╚{n_bar_str}╩{user_bar_str}╩{elo_bar_str}╝"
 
     table_rows_strings = []
-    for idx, item in enumerate(ranking_data, start=1):
-        idx_str = str(idx).center(n_content_w)
+    for item in ranking_data:
+        idx_str = str(item['rank']).center(n_content_w)
         
-        elo_original = item['total_elo'] if is_global_ranking else item.elo
-        elo_str = str(int(elo_original)).rjust(elo_content_w)
+        elo_str = str(int(item['points'])).rjust(elo_content_w)
 
-        username_original = item['user__username'] if is_global_ranking else item.user.username
+        username_original = item['username']
         display_username = username_original
         if len(username_original) > user_col_content_w:
             display_username = username_original[:user_col_content_w-3] + "..."
@@ -143,7 +139,7 @@ def formatear_ranking(game_slug=None):
                 embed_color
             )
 
-        game_elos = GameElo.objects.filter(game=juego).order_by("-elo")[:10]
+        game_elos, _ = LeaderboardService.page(juego, limit=RANKING_SIZE)
         titulo_embed = f"🏆 Ranking de {juego.name}"
         
         thumbnail_url_final = None
@@ -177,12 +173,7 @@ def formatear_ranking(game_slug=None):
         )
     else:  # Ranking global
         global_embed_color = discord.Color.blue()
-        game_elos = (
-            GameElo.objects
-            .values("user__username")
-            .annotate(total_elo=Sum("elo"))
-            .order_by("-total_elo")[:10]
-        )
+        game_elos, _ = LeaderboardService.page(limit=RANKING_SIZE)
         titulo_embed = "🌍 Ranking Global (ELO Total)"
 
         if not game_elos:
@@ -192,7 +183,7 @@ def formatear_ranking(game_slug=None):
                 global_embed_color
             )
 
-        description_content = _generar_tabla_ranking(game_elos, is_global_ranking=True)
+        description_content = _generar_tabla_ranking(game_elos)
         return _crear_embed_ranking(
             titulo_embed,
             f"```{description_content}```",
@@ -207,6 +198,39 @@ async def ranking_global_slash(interaction: discord.Interaction):
     await interaction.response.send_message(embed=embed_mensaje)
 
 
+def formatear_estado_diario(username):
+    user = User.objects.select_related("profile").filter(username=username).first()
+    if user is None:
+        return _crear_embed_ranking("Error", f"❗ No se encontró el usuario '{username}'", discord.Color.red())
+
+    lineas = []
+    for estado in DailyStatusService(user).for_games():
+        if estado.target_id is None:
+            icono, detalle = "➖", "sin daily hoy"
+        elif estado.solved:
+            icono, detalle = "✅", f"resuelto en {estado.attempt_count} intentos"
+        elif estado.attempt_count:
+            icono, detalle = "⏳", f"{estado.attempt_count} intentos, sin resolver"
+        else:
+            icono, detalle = "🎯", "pendiente"
+        if estado.extra_id:
+            detalle += " · extra en juego"
+        lineas.append(f"{icono} **{estado.game.name}**: {detalle}")
+
+    return _crear_embed_ranking(
+        f"📅 Daily de hoy de {user.username}",
+        "\n".join(lineas) or "❗ No hay juegos activos.",
+        discord.Color.green(),
+    )
+
+
+@bot.tree.command(name="estado", description="Muestra el daily de hoy de un jugador en todos los juegos.")
+@app_commands.describe(usuario="Nombre de usuario en GuessDle")
+async def estado_diario_slash(interaction: discord.Interaction, usuario: str):
+    embed_mensaje = await sync_to_async(formatear_estado_diario)(usuario)
+    await interaction.response.send_message(embed=embed_mensaje)
+
+
 # Obtener slugs de juegos activos desde la base de datos
 try:
     JUEGOS_SLUGS_Y_NOMBRES = list(Game.objects.filter(active=True).values_list('slug', 'name'))
@@ -13,4 +13,17 @@ python manage.py migrate --noinput
 python manage.py collectstatic --noinput
 
 # Lanza el servidor Django
+#   GUESSDLE_SERVER=asgi → uvicorn con las vistas async de intento/estado
+#   (por defecto, runserver como hasta ahora)
+if [ "$GUESSDLE_SERVER" = "asgi" ]; then
+    export GUESSDLE_ASYNC_VIEWS="${GUESSDLE_ASYNC_VIEWS:-True}"
+    # Métricas compartidas entre workers: un directorio limpio por arranque
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/guessdle-metrics}"
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+    exec uvicorn GuessDle.asgi:application \
+        --host 0.0.0.0 --port 8000 \
+        --workers "${UVICORN_WORKERS:-1}" \
+        --proxy-headers
+fi
+
 python manage.py runserver 0.0.0.0:8000
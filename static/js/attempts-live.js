@@ -46,10 +46,13 @@ document.addEventListener("DOMContentLoaded", () => {
   /* ───────── 3· envío normal ───────── */
   form?.addEventListener("submit", async e => {
     e.preventDefault();
+    const body = new FormData(form);
+    if (window.guessCatalog) body.append("catalog_version", window.guessCatalog.version);
+
     const res = await fetch(form.action, {
       method: "POST",
       headers: { "X-CSRFToken": csrf, "X-Requested-With": "XMLHttpRequest" },
-      body: new FormData(form)
+      body
     });
 
     const data = await res.json();
@@ -58,11 +61,8 @@ document.addEventListener("DOMContentLoaded", () => {
     form.reset();
     const row = renderAttempt(data.attempt, true);
 
-    // 🔁 actualizar lista de sugerencias
-    const guessInput = document.getElementById("guess");
-    if (guessInput && data.remaining_names) {
-      guessInput.dataset.names = JSON.stringify(data.remaining_names);
-    }
+    // 🔁 actualizar lista de sugerencias (delta sobre el catálogo del cliente)
+    window.guessCatalog?.apply(data);
 
 
     if (data.won) {
@@ -0,0 +1,25 @@
+/* dashboard-panels.js – rellena los paneles del dashboard desde sus
+   endpoints (data-panel-url → {html}).  Los data-panel-eager se piden al
+   cargar; el resto, cuando otro script llama a loadPanel (p. ej. al abrir
+   una pestaña). */
+window.loadPanel = async function loadPanel(el, { force = false } = {}) {
+  if (!el?.dataset.panelUrl) return;
+  if (el.dataset.panelState === 'loading') return;
+  if (el.dataset.panelState === 'loaded' && !force) return;
+
+  el.dataset.panelState = 'loading';
+  try {
+    const res  = await fetch(el.dataset.panelUrl, { credentials: 'same-origin' });
+    const data = await res.json();
+    if (data.status !== 'ok') throw new Error(data.message || res.status);
+    el.innerHTML = data.html;
+    el.dataset.panelState = 'loaded';
+  } catch (err) {
+    el.dataset.panelState = '';
+    console.error(err);
+  }
+};
+
+document.addEventListener('DOMContentLoaded', () => {
+  document.querySelectorAll('[data-panel-eager]').forEach(el => window.loadPanel(el));
+});
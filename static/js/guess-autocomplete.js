@@ -1,13 +1,72 @@
-/* guess-autocomplete.js — lee nombres desde data-names */
+/* guess-autocomplete.js — catálogo de nombres versionado
+ *
+ * El catálogo completo (nombres + imágenes) se descarga de data-catalog-url,
+ * que el navegador cachea todo el día; data-removed trae los índices densos ya
+ * usados. Las respuestas de cada intento solo traen los índices nuevos
+ * (window.guessCatalog.apply). Si la versión cambia entre el render y la
+ * descarga, los índices se recalculan con los nombres ya probados.
+ */
 document.addEventListener('DOMContentLoaded', () => {
   const input = document.getElementById('guess');
   if (!input) return;
 
-  let names = [];
-  try {
-    names = JSON.parse(input.dataset.names || '[]');
-  } catch (err) {
-    console.error('autocomplete: JSON inválido en data-names', err);
+  const parse = (raw, fallback) => {
+    try { return JSON.parse(raw || fallback); }
+    catch (err) { console.error('autocomplete: JSON inválido', err); return JSON.parse(fallback); }
+  };
+
+  const catalog = {
+    version: input.dataset.catalogVersion || '',
+    names:   parse(input.dataset.names, '[]'),
+    images:  [],
+    removed: new Set(parse(input.dataset.removed, '[]')),
+    guessed: new Set(parse(input.dataset.guessed, '[]')),
+
+    available() {
+      return this.names.filter((_, i) => !this.removed.has(i));
+    },
+
+    /* Índices de los nombres ya probados en el catálogo actual */
+    reindex() {
+      this.removed = new Set();
+      this.names.forEach((n, i) => { if (this.guessed.has(n)) this.removed.add(i); });
+    },
+
+    /* Aplica la parte de nombres de una respuesta de intento */
+    apply(data) {
+      if (data.attempt?.name) this.guessed.add(data.attempt.name);
+      if (Array.isArray(data.remaining_names)) {        // respuesta sin versión
+        this.names = data.remaining_names;
+        this.removed = new Set();
+        return;
+      }
+      if (Array.isArray(data.catalog)) {                // versión distinta: catálogo nuevo
+        this.names = data.catalog;
+        this.images = [];
+        this.removed = new Set();
+      }
+      if (data.catalog_version !== undefined) this.version = String(data.catalog_version);
+      (data.removed || []).forEach(i => this.removed.add(i));
+    },
+  };
+  window.guessCatalog = catalog;
+
+  if (input.dataset.catalogUrl) {
+    const pageVersion = catalog.version;
+    fetch(input.dataset.catalogUrl, { credentials: 'same-origin' })
+      .then(res => res.ok ? res.json() : Promise.reject(res.status))
+      .then(data => {
+        // Si un intento ya trajo un catálogo más nuevo, no se pisa
+        if (catalog.version !== pageVersion) return;
+        catalog.names = data.names || [];
+        catalog.images = data.images || [];
+        // Catálogo más nuevo que la página: data-removed apunta a la versión vieja
+        if (String(data.version) !== pageVersion) {
+          catalog.version = String(data.version);
+          catalog.reindex();
+        }
+      })
+      .catch(err => console.error('autocomplete: no se pudo cargar el catálogo', err));
   }
 
   const box = document.getElementById('suggestions');
@@ -19,9 +78,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
   const paint = q => {
     box.innerHTML = ''; hl = -1;
-    let fresh = [];
-    try { fresh = JSON.parse(input.dataset.names || '[]'); } catch {}
-    const res = q ? fresh.filter(n => n.toLowerCase().includes(q)).slice(0, 15) : [];
+    const res = q ? catalog.available().filter(n => n.toLowerCase().includes(q)).slice(0, 15) : [];
 
     if (!res.length) { close(); return; }
 
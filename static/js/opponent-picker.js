@@ -0,0 +1,68 @@
+/* opponent-picker.js – buscador de rival para "Crear reto"
+ *
+ * Pide a data-url los usuarios cuyo nombre empieza por lo escrito (sin
+ * acentos ni mayúsculas); con el campo vacío, los últimos rivales retados.
+ * El id elegido va en el <input type="hidden" name="opponent">.
+ */
+document.addEventListener('DOMContentLoaded', () => {
+  const input   = document.getElementById('opponent-search');
+  const hidden  = document.getElementById('opponent');
+  const list    = document.getElementById('opponent-results');
+  if (!input || !hidden || !list) return;
+
+  const DEBOUNCE = 200;
+  let timer = null;
+  let seq   = 0;          // descarta respuestas de búsquedas ya superadas
+
+  function close() {
+    list.classList.add('hidden');
+  }
+
+  function render(results, query) {
+    list.innerHTML = '';
+    if (!results.length) {
+      const li = document.createElement('li');
+      li.className = 'px-4 py-2 text-gray-500';
+      li.textContent = query ? 'Sin resultados' : 'Aún no has retado a nadie';
+      list.appendChild(li);
+    }
+    results.forEach(user => {
+      const li = document.createElement('li');
+      li.className = 'px-4 py-2 cursor-pointer hover:bg-yellow-100';
+      li.textContent = user.username;
+      li.addEventListener('mousedown', e => {
+        e.preventDefault();            // que el blur no cierre antes del click
+        hidden.value = user.id;
+        input.value  = user.username;
+        close();
+      });
+      list.appendChild(li);
+    });
+    list.classList.remove('hidden');
+  }
+
+  async function search() {
+    const query = input.value.trim();
+    const mine  = ++seq;
+    const res = await fetch(`${input.dataset.url}?${new URLSearchParams({ q: query })}`,
+                            { credentials: 'same-origin' });
+    if (!res.ok) throw new Error(res.status);
+    const data = await res.json();
+    if (mine === seq) render(data.results, query);
+  }
+
+  input.addEventListener('input', () => {
+    hidden.value = '';                 // el texto ya no corresponde al elegido
+    clearTimeout(timer);
+    timer = setTimeout(() => search().catch(console.error), DEBOUNCE);
+  });
+  input.addEventListener('focus', () => search().catch(console.error));
+  input.addEventListener('blur', close);
+
+  // Sin rival elegido de la lista, pending-tabs.js no envía el reto
+  input.form?.addEventListener('submit', () => {
+    if (!hidden.value) input.focus();
+  });
+  // form.reset() no vacía los hidden
+  input.form?.addEventListener('reset', () => { hidden.value = ''; });
+});
@@ -21,27 +21,32 @@ document.addEventListener('DOMContentLoaded', () => {
       btn.classList.remove('bg-yellow-700', 'text-white');
       btn.classList.add('bg-yellow-500', 'text-gray-900');
 
-      /* 3️⃣ Panels */
+      /* 3️⃣ Panels (se piden al servidor la primera vez que se abren) */
       const target = 'view-' + btn.dataset.view;
       panels.forEach(p => p.classList.add('hidden'));
-      document.getElementById(target)?.classList.remove('hidden');
+      const panel = document.getElementById(target);
+      panel?.classList.remove('hidden');
+      window.loadPanel(panel);
     });
   });
 
-
-  
   if (form) {
     form.addEventListener('submit', async (ev) => {
       ev.preventDefault();
+      if (!form.elements.opponent?.value) return;   // rival sin elegir (opponent-picker.js)
 
       const body = new URLSearchParams(new FormData(form));
       const res  = await fetch(form.action, { method: 'POST', headers, body });
       const data = await res.json();
 
       if (data.status === 'ok') {
-        // nueva tarjeta en “Enviados” sin refrescar
-        document.querySelector('#view-enviados')
-                .insertAdjacentHTML('afterbegin', data.card);
+        // nueva tarjeta en “Enviados” sin refrescar (si aún no se ha
+        // abierto, la traerá el panel al pedirse)
+        const sent = document.querySelector('#view-sent');
+        if (sent?.dataset.panelState === 'loaded') {
+          sent.querySelector('p')?.remove();   // "No sent challenges yet."
+          sent.insertAdjacentHTML('afterbegin', data.card);
+        }
         form.reset();
       }
     });
@@ -1,7 +1,105 @@
-/* ranking-tabs.js – cambia entre paneles de ranking */
+/* ranking-tabs.js – cambia entre paneles de ranking y pide a la API
+   (window.LEADERBOARD_URL) solo la porción que se muestra */
 document.addEventListener('DOMContentLoaded', () => {
   const tabs    = document.querySelectorAll('#ranking-tabs .rank-tab');
   const panels  = document.querySelectorAll('.rank-panel');
+  const PAGE    = 25;
+
+  /* ---------- filas (mismo marcado que partials/ranking_row.html) ---------- */
+  const MEDALS = { 1: '🥇', 2: '🥈', 3: '🥉' };
+  const BADGE  = {
+    1: 'bg-yellow-400 text-gray-900 font-bold',
+    2: 'bg-gray-300 text-gray-900 font-bold',
+    3: 'bg-amber-700 text-white font-bold',
+  };
+  const CELL = 'text-center align-middle bg-black/60 text-gray-100 px-4 py-2 border-yellow-600';
+
+  function cell(text, extra) {
+    const td = document.createElement('td');
+    td.className = `${CELL} ${extra}`;
+    td.textContent = text;
+    return td;
+  }
+
+  function buildRow(row) {
+    const tr = document.createElement('tr');
+    tr.className = 'hover:brightness-110 transition duration-150';
+    if (row.me) tr.classList.add('ring-4', 'ring-yellow-400', 'rounded-xl');
+
+    const pos   = document.createElement('td');
+    const badge = document.createElement('div');
+    pos.className   = 'px-0';
+    badge.className = 'w-9 h-9 flex items-center justify-center rounded-full mx-auto '
+                    + (BADGE[row.rank] || 'bg-gray-700 text-white text-xs');
+    badge.textContent = MEDALS[row.rank] || row.rank;
+    pos.appendChild(badge);
+
+    const avg = row.average_attempts == null ? '–' : row.average_attempts.toFixed(2);
+    tr.append(
+      pos,
+      cell(row.username, 'border-2 rounded-l-xl'),
+      cell(Math.round(row.points), 'border-y-2 font-semibold'),
+      cell(avg, 'border-y-2'),
+      cell(row.games_finished, 'border-2 rounded-r-xl'),
+    );
+    return tr;
+  }
+
+  function render(panel, rows, { append }) {
+    const body = panel.querySelector('[data-ranking-body]');
+    if (!append) body.innerHTML = '';
+    body.querySelector('[data-ranking-empty]')?.remove();
+
+    if (!rows.length && !body.children.length) {
+      body.innerHTML = '<tr data-ranking-empty><td colspan="5" class="py-4 text-center text-black">Sin datos 😢</td></tr>';
+      return;
+    }
+    rows.forEach(row => body.appendChild(buildRow(row)));
+  }
+
+  /* ---------- API ---------- */
+  async function fetchRows(panel, params) {
+    const query = new URLSearchParams(params);
+    if (panel.dataset.game) query.set('game', panel.dataset.game);
+    const res = await fetch(`${window.LEADERBOARD_URL}?${query}`, { credentials: 'same-origin' });
+    if (!res.ok) throw new Error(res.status);
+    return res.json();
+  }
+
+  function setNext(panel, next) {
+    panel.dataset.next = next || '';
+    panel.querySelector('.rank-more')?.classList.toggle('hidden', !next);
+  }
+
+  async function loadPage(panel, { append }) {
+    const params = { limit: PAGE };
+    if (append && panel.dataset.next) params.after = panel.dataset.next;
+    const data = await fetchRows(panel, params);
+    render(panel, data.rows, { append });
+    setNext(panel, data.next);
+    panel.dataset.loaded = '1';
+  }
+
+  async function loadAround(panel) {
+    const data = await fetchRows(panel, { around: 'me', span: 5 });
+    if (!data.rows.length) return;   // sin clasificar en este ranking
+    render(panel, data.rows, { append: false });
+    setNext(panel, null);
+    panel.dataset.loaded = '';        // al volver a la pestaña, primera página
+  }
+
+  panels.forEach(panel => {
+    setNext(panel, null);
+    panel.querySelector('[data-rank-action="more"]')
+      ?.addEventListener('click', () => loadPage(panel, { append: true }).catch(console.error));
+    panel.querySelector('[data-rank-action="around"]')
+      ?.addEventListener('click', () => loadAround(panel).catch(console.error));
+  });
+
+  // La pestaña visible al cargar (global)
+  panels.forEach(p => {
+    if (!p.classList.contains('hidden')) loadPage(p, { append: false }).catch(console.error);
+  });
 
   tabs.forEach(btn => {
     btn.addEventListener('click', () => {
@@ -17,7 +115,11 @@ document.addEventListener('DOMContentLoaded', () => {
       });
 
       // paneles
-      panels.forEach(p => p.classList.toggle('hidden', p.id !== target));
+      panels.forEach(p => {
+        const show = p.id === target;
+        p.classList.toggle('hidden', !show);
+        if (show && !p.dataset.loaded) loadPage(p, { append: false }).catch(console.error);
+      });
     });
   });
 });